@@ -0,0 +1,1010 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+营养计算器性能基准
+
+用法:
+    python benchmark_recipe_nutrition.py [基准名称 ...] [--data-dir fixed_data]
+
+不指定基准名称时运行全部基准。
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import re
+import tempfile
+import time
+
+from fndds_snapshot import load_fndds_tables
+from food_match_index import MatchQuery
+from measurement_parser import (
+    DEFAULT_MEASUREMENT,
+    DESCRIPTIVE_PHRASES,
+    QUANTITY_WORDS,
+    UNIT_ALIASES,
+    MeasurementParser,
+)
+from recipe_nutrition_calculator import (
+    COMMON_TEST_INGREDIENTS,
+    COMPLEX_TEST_INGREDIENTS,
+    HOT_PATH_COLUMNS,
+    NUTRIENT_STORES,
+    PROBLEMATIC_TEST_INGREDIENTS,
+    RecipeNutritionCalculator,
+    _annotate_recipe_in_worker,
+    _init_recipe_worker,
+    get_calculator,
+    process_recipes,
+)
+from shared_fndds import SharedFnddsData
+
+# 项目中的食材匹配测试集
+TEST_INGREDIENT_SETS = {
+    'common': COMMON_TEST_INGREDIENTS,
+    'problematic': PROBLEMATIC_TEST_INGREDIENTS,
+    'complex': COMPLEX_TEST_INGREDIENTS,
+}
+
+# 常见拼写错误的食材
+MISSPELLED_INGREDIENTS = ['parmesean cheese', 'tumeric', 'cinamon', 'brocoli', 'zuchini', 'mozarella', 'cilantroo']
+
+# 基准测试期间关闭匹配日志，避免输出影响计时
+logging.getLogger('recipe_calculator').setLevel(logging.WARNING)
+
+
+def time_per_call(func, items, repeat=3):
+    """
+    测量对每个输入调用一次 func 的平均耗时（取多轮中最快的一轮）
+
+    返回:
+        float: 每次调用的秒数
+    """
+    items = list(items)
+    best = float('inf')
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for item in items:
+                func(item)
+            elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+    return best / max(len(items), 1)
+
+
+def print_comparison(title, before, after, unit='us'):
+    """打印优化前后的单次耗时对比"""
+    scale = {'us': 1e6, 'ms': 1e3}[unit]
+    speedup = before / after if after > 0 else float('inf')
+    print(f"{title}")
+    print(f"  优化前: {before * scale:10.2f} {unit}/次")
+    print(f"  优化后: {after * scale:10.2f} {unit}/次")
+    print(f"  提速:   {speedup:10.1f}x")
+
+
+def legacy_get_nutrient_values(calculator, food_description, weight_in_grams):
+    """原实现: 每次查找都对整列做小写比较，再逐列读取营养值"""
+    df = calculator.nutrient_values_df
+    food_match = df[df['Main food description'].str.lower() == food_description.lower()]
+    if food_match.empty:
+        return {}
+    nutrient_row = food_match.iloc[0]
+    return {
+        calculator.clean_columns[col]: (nutrient_row[col] / 100) * weight_in_grams
+        for col in calculator.clean_columns
+    }
+
+
+def bench_nutrient_lookup(calculator, args):
+    """get_nutrient_values: DataFrame 全列扫描 vs 描述索引 + 营养矩阵"""
+    step = max(len(calculator.food_descriptions) // args.samples, 1)
+    descriptions = calculator.food_descriptions[::step][:args.samples]
+
+    before = time_per_call(lambda d: legacy_get_nutrient_values(calculator, d, 150.0), descriptions, repeat=1)
+    after = time_per_call(lambda d: calculator.get_nutrient_values(d, 150.0), descriptions)
+    print_comparison(f"营养值查找 ({len(descriptions)} 个食品描述)", before, after)
+
+
+def legacy_find_portion_weight(calculator, food_description, portion_description):
+    """原实现: 每次都按描述过滤整张份量表，并对每个单位执行一次 str.contains"""
+    df = calculator.portions_weights_df
+    food_portions = df[df['Main food description'].str.lower() == food_description.lower()]
+    if food_portions.empty:
+        return None
+    portions = food_portions['Portion description'].str.lower()
+    for unit in calculator.unit_conversion.values():
+        if unit in portion_description.lower():
+            matches = food_portions[portions.str.contains(unit, na=False)]
+            if not matches.empty:
+                return matches.iloc[0]['Portion weight\n(g)']
+    for fallback in ('cup', 'medium'):
+        matches = food_portions[portions.str.contains(fallback, na=False)]
+        if not matches.empty:
+            return matches.iloc[0]['Portion weight\n(g)']
+    return food_portions.iloc[0]['Portion weight\n(g)']
+
+
+def bench_portion_lookup(calculator, args):
+    """find_portion_weight: 逐次过滤份量表 vs 预分组的份量索引"""
+    step = max(len(calculator.food_descriptions) // args.samples, 1)
+    queries = [
+        (description, portion)
+        for description in calculator.food_descriptions[::step][:args.samples // 4]
+        for portion in ('1 cup', '1 tablespoon', '1 slice', '1 piece')
+    ]
+
+    before = time_per_call(lambda q: legacy_find_portion_weight(calculator, *q), queries, repeat=1)
+    after = time_per_call(lambda q: calculator.find_portion_weight(*q), queries)
+    print_comparison(f"份量重量查找 ({len(queries)} 次查询)", before, after)
+
+
+def bench_match(calculator, args):
+    """find_closest_food_match: 各测试集的单个食材匹配耗时"""
+    for name, ingredients in TEST_INGREDIENT_SETS.items():
+        calculator.cache_clear()
+        per_call = time_per_call(calculator.find_closest_food_match, ingredients, repeat=1)
+        print(f"  {name:<12} {len(ingredients):3d} 个食材: {per_call * 1e3:8.2f} ms/个")
+
+
+def bench_match_index(calculator, args):
+    """find_closest_food_match: 全量评分 vs 候选索引 + 描述特征表（每个食材的耗时和评分的描述数）"""
+    ingredients = [ingredient for items in TEST_INGREDIENT_SETS.values() for ingredient in items]
+    index = calculator._match_index
+    if index is None:
+        print("  计算器未启用候选索引")
+        return
+
+    calculator._match_index = None
+    try:
+        calculator.cache_clear()
+        before = time_per_call(calculator.find_closest_food_match, ingredients, repeat=1)
+    finally:
+        calculator._match_index = index
+
+    # 预热索引后再计时（清空匹配缓存，计时的是索引评分而不是缓存命中）
+    with contextlib.redirect_stdout(io.StringIO()):
+        for ingredient in ingredients:
+            calculator.find_closest_food_match(ingredient)
+    calculator.cache_clear()
+    index.queries = index.candidates_scored = 0
+    after = time_per_call(calculator.find_closest_food_match, ingredients, repeat=1)
+
+    print_comparison(f"食材模糊匹配 ({len(ingredients)} 个食材)", before, after, unit='ms')
+    if index.queries:
+        print(f"  平均评分描述数: {index.candidates_scored / index.queries:.0f} / {len(calculator.food_descriptions)} "
+              f"({index.queries} 次模糊评分)")
+
+
+def legacy_detect_category(rules, text):
+    """原实现: 逐个类别、逐个关键词检查子串"""
+    main_category = None
+    sub_category = None
+    keywords = []
+    for category, subcategories in rules.ingredient_categories.items():
+        for keyword in rules.category_keywords[category]:
+            if keyword in text:
+                main_category = category
+                keywords.append(keyword)
+                break
+        if main_category:
+            for subcat, subcat_keywords in subcategories.items():
+                for keyword in subcat_keywords:
+                    if keyword in text:
+                        sub_category = subcat
+                        if keyword not in keywords:
+                            keywords.append(keyword)
+                        break
+                if sub_category:
+                    break
+            break
+    return main_category, sub_category, keywords
+
+
+def legacy_find_replacement(rules, text):
+    """原实现: 按顺序逐个检查替换键"""
+    for key, value in rules.replacement_items:
+        if key in text:
+            return key, value
+    return None
+
+
+def bench_keywords(calculator, args):
+    """类别识别和部分替换: 嵌套循环 vs Aho–Corasick 自动机（完整关键词表）"""
+    rules = calculator.match_rules
+    texts = [ingredient.lower() for items in TEST_INGREDIENT_SETS.values() for ingredient in items]
+    # 额外加入每个关键词和替换键本身，覆盖所有模式
+    texts += list(rules.keyword_categories) + [key for key, _ in rules.replacement_items]
+
+    mismatches = sum(
+        legacy_detect_category(rules, text) != rules.detect_category(text)
+        or legacy_find_replacement(rules, text) != rules.find_replacement(text)
+        for text in texts
+    )
+    print(f"  模式数: {len(rules.keyword_automaton)} 个关键词, {len(rules.replacement_automaton)} 个替换键; "
+          f"结果不一致: {mismatches} / {len(texts)}")
+
+    before = time_per_call(lambda text: legacy_detect_category(rules, text), texts)
+    after = time_per_call(rules.detect_category, texts)
+    print_comparison(f"类别识别 ({len(texts)} 个名称)", before, after)
+
+    before = time_per_call(lambda text: legacy_find_replacement(rules, text), texts)
+    after = time_per_call(rules.find_replacement, texts)
+    print_comparison(f"部分替换查找 ({len(texts)} 个名称)", before, after)
+
+
+def bench_engines(calculator, args):
+    """模糊评分引擎: python（候选索引逐个评分） vs numpy（全部描述向量化评分）"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        numpy_calculator = RecipeNutritionCalculator(args.data_dir, engine="numpy")
+    rules = calculator.match_rules
+
+    # 直接比较两个引擎的评分阶段（跳过替换表和精确匹配）
+    queries = []
+    for items in TEST_INGREDIENT_SETS.values():
+        for ingredient in items:
+            name = ingredient.lower()
+            category, subcategory, keywords = rules.detect_category(name)
+            queries.append((name, category, subcategory, keywords))
+
+    for engine_calculator in (calculator, numpy_calculator):
+        engine_calculator.score_food_matches(*queries[0])  # 预热索引和特征表
+
+    disagreements = sum(
+        calculator.score_food_matches(*query) != numpy_calculator.score_food_matches(*query)
+        for query in queries
+    )
+    before = time_per_call(lambda query: calculator.score_food_matches(*query), queries)
+    after = time_per_call(lambda query: numpy_calculator.score_food_matches(*query), queries)
+    print_comparison(f"单个食材评分 ({len(queries)} 个食材, python -> numpy)", before, after, unit='ms')
+    print(f"  前3名不一致: {disagreements} / {len(queries)}")
+
+    # 批量: 每个查询一次向量化评分 + argmax
+    engine = numpy_calculator._numpy_engine
+    match_queries = [MatchQuery(*query, rules) for query in queries] * max(args.samples // len(queries), 1)
+    start = time.perf_counter()
+    engine.best_matches(match_queries)
+    elapsed = time.perf_counter() - start
+    print(f"  批量评分: {len(match_queries)} 个查询 {elapsed * 1e3:.1f} ms "
+          f"({elapsed / len(match_queries) * 1e3:.2f} ms/个, {len(engine.descriptions)} 个描述)")
+    numpy_calculator.close()
+
+
+def bench_tfidf(calculator, args):
+    """匹配后端: 启发式规则 vs 字符 n-gram TF-IDF（耗时和结果一致率）"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        tfidf_calculator = RecipeNutritionCalculator(args.data_dir, matcher="tfidf", persistent_match_cache=False)
+    ingredients = [ingredient for items in TEST_INGREDIENT_SETS.values() for ingredient in items]
+
+    start = time.perf_counter()
+    tfidf_calculator.tfidf_food_matches('warm up')
+    print(f"  TF-IDF 矩阵构建: {(time.perf_counter() - start) * 1e3:.1f} ms "
+          f"({len(tfidf_calculator._tfidf_matcher.vocabulary)} 个 n-gram, {tfidf_calculator._tfidf_matcher.nnz} 个非零元素)")
+
+    # 两个计算器都从空的匹配缓存开始计时
+    calculator.cache_clear()
+    tfidf_calculator.cache_clear()
+    before = time_per_call(calculator.find_closest_food_match, ingredients, repeat=1)
+    after = time_per_call(tfidf_calculator.find_closest_food_match, ingredients, repeat=1)
+    print_comparison(f"find_closest_food_match ({len(ingredients)} 个食材, heuristic -> tfidf)", before, after, unit='ms')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agreement = sum(
+            calculator.find_closest_food_match(ingredient) == tfidf_calculator.find_closest_food_match(ingredient)
+            for ingredient in ingredients
+        )
+    print(f"  结果一致: {agreement} / {len(ingredients)} ({agreement / len(ingredients):.0%})")
+
+    # 评分阶段: 逐个查询（矩阵-向量） vs 一次批量查询（矩阵-矩阵）
+    matcher = tfidf_calculator._tfidf_matcher
+    texts = [ingredient.lower() for ingredient in ingredients] * max(args.samples // len(ingredients), 1)
+    per_query = time_per_call(matcher.match, texts)
+    start = time.perf_counter()
+    matcher.batch_match(texts)
+    batch = (time.perf_counter() - start) / len(texts)
+    print(f"  TF-IDF 评分: 逐个 {per_query * 1e3:.3f} ms/个, 批量 {batch * 1e3:.3f} ms/个 ({len(texts)} 个查询)")
+
+    print("  拼写错误的食材:")
+    for ingredient in MISSPELLED_INGREDIENTS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            heuristic = calculator.find_closest_food_match(ingredient)
+            tfidf = tfidf_calculator.find_closest_food_match(ingredient)
+        print(f"    {ingredient:<18} heuristic: {str(heuristic):<32} tfidf: {tfidf}")
+    tfidf_calculator.close()
+
+
+def bench_typo(calculator, args):
+    """拼写容错层: 对称删除索引的查找耗时，以及批量匹配中由该层代替全量评分解析的食材数"""
+    start = time.perf_counter()
+    calculator._build_typo_index()
+    print(f"  索引构建: {(time.perf_counter() - start) * 1e3:.1f} ms ({len(calculator._typo_index)} 个字典键)")
+
+    after = time_per_call(calculator.find_typo_match, MISSPELLED_INGREDIENTS)
+    print(f"  查找耗时: {after * 1e3:.3f} ms/次")
+    for ingredient in MISSPELLED_INGREDIENTS:
+        print(f"    {ingredient:<18} -> {calculator.find_typo_match(ingredient)}")
+
+    ingredients = [ingredient for items in TEST_INGREDIENT_SETS.values() for ingredient in items]
+    ingredients += MISSPELLED_INGREDIENTS
+    # 清空匹配缓存，每个食材都重新走一遍匹配层级
+    calculator.cache_clear()
+    calculator.match_tier_counts.clear()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for ingredient in ingredients:
+            calculator.find_closest_food_match(ingredient)
+    counts = calculator.match_tier_counts
+    print(f"  批量匹配 {len(ingredients)} 个食材: 拼写容错层解析 {counts.get('typo', 0)} 个, "
+          f"全量评分 {counts.get('scan', 0)} 个")
+    print(f"  各层级: {dict(sorted(counts.items()))}")
+
+
+def sample_recipe_ingredients(recipes, per_recipe=10, seed=0):
+    """
+    生成模拟食谱语料的食材序列: 测试集中的食材按 Zipf 分布重复出现
+    （像 salt、olive oil 这样的常用食材出现在大部分食谱中）
+    """
+    ingredients = [ingredient for items in TEST_INGREDIENT_SETS.values() for ingredient in items]
+    weights = [1 / rank for rank in range(1, len(ingredients) + 1)]
+    rng = random.Random(seed)
+    return rng.choices(ingredients, weights=weights, k=recipes * per_recipe)
+
+
+def bench_match_cache(calculator, args):
+    """匹配缓存: 模拟食谱语料中重复食材的命中率和每次查找耗时"""
+    corpus = sample_recipe_ingredients(args.samples)
+    calculator.cache_clear()
+    calculator.match_cache.maxsize, maxsize = 0, calculator.match_cache.maxsize
+    try:
+        before = time_per_call(calculator.find_closest_food_match, corpus, repeat=1)
+    finally:
+        calculator.match_cache.maxsize = maxsize
+
+    calculator.cache_clear()
+    after = time_per_call(calculator.find_closest_food_match, corpus, repeat=1)
+    stats = calculator.match_cache.stats()
+    print_comparison(f"模拟语料 ({args.samples} 个食谱, {len(corpus)} 次食材查找)", before, after)
+    print(f"  命中 {stats['hits']}, 未命中 {stats['misses']}, 淘汰 {stats['evictions']}, 命中率 {stats['hit_rate']:.1%}")
+
+
+def bench_persistent_cache(calculator, args):
+    """持久化匹配缓存: 冷启动 vs 热启动的新计算器实例（内存缓存为空，磁盘缓存已写入）"""
+    corpus = sample_recipe_ingredients(args.samples)
+    timings = []
+    for run in ('cold', 'warm'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_calculator = RecipeNutritionCalculator(args.data_dir)
+        if run_calculator.persistent_match_cache is None:
+            print("  持久化匹配缓存不可用")
+            return
+        if run == 'cold':
+            run_calculator.cache_clear(persistent=True)
+        timings.append(time_per_call(run_calculator.find_closest_food_match, corpus, repeat=1))
+        stored = run_calculator.persistent_match_cache.stats()
+        print(f"  {run}: 磁盘缓存命中 {stored['hits']}, 未命中 {stored['misses']}, "
+              f"模糊评分 {run_calculator.match_tier_counts.get('scan', 0)} 次")
+        run_calculator.close()
+    print_comparison(f"新进程的食材查找 ({len(corpus)} 次)", *timings)
+
+
+# 找不到匹配的典型食材名称: 中文名称、表情符号、数量和厨具等
+UNMATCHABLE_INGREDIENTS = [
+    "番茄", "西红柿炒鸡蛋", "葱姜蒜适量", "🍅🍅🍅 fresh", "!!!", "---", "12345",
+    "xyzzy", "parchment paper", "toothpicks", "kitchen twine", "water for boiling",
+]
+
+
+def bench_negative_cache(calculator, args):
+    """未匹配名称缓存: 重复出现的无法匹配名称（heuristic 和 tfidf 匹配后端）"""
+    rng = random.Random(0)
+    corpus = rng.choices(UNMATCHABLE_INGREDIENTS, k=args.samples * 5)
+    for matcher in ('heuristic', 'tfidf'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_calculator = RecipeNutritionCalculator(args.data_dir, matcher=matcher,
+                                                       persistent_match_cache=False)
+            # 预先构建索引，避免首次查询的构建时间计入对比
+            run_calculator.find_food_matches("salt")
+
+        timings = []
+        for negative_cache_size in (0, calculator.negative_match_cache.maxsize):
+            run_calculator.cache_clear()
+            run_calculator.negative_match_cache.maxsize = negative_cache_size
+            timings.append(time_per_call(run_calculator.find_closest_food_match, corpus, repeat=1))
+        print_comparison(f"{matcher}: {len(corpus)} 次查找", *timings)
+
+        stats = run_calculator.negative_match_cache.stats()
+        print(f"  未匹配名称 {stats['size']} 个, 命中 {stats['hits']} 次, 节省 {stats['saved_seconds'] * 1e3:.1f} ms")
+        for name, hits, cost, saved in run_calculator.negative_match_cache.top_offenders(5):
+            print(f"    {name[0]:<18} 命中 {hits:>4} 次, 每次 {cost * 1e3:.3f} ms, 共节省 {saved * 1e3:.1f} ms")
+        run_calculator.close()
+
+
+def legacy_parse_measurement(measurement_str):
+    """原实现: 每次调用都重建单位映射字典，依次尝试多个正则并逐个扫描短语（省略警告日志）"""
+    if not measurement_str or not isinstance(measurement_str, str) or measurement_str.strip() == '':
+        return 1.0, 'piece'  # 如果没有计量，默认为1件
+
+    # 清理字符串
+    measurement_str = measurement_str.strip().lower()
+
+    # 常见计量单位映射到标准单位
+    unit_conversions = dict(UNIT_ALIASES)
+
+    # 处理复合计量单位，如 "1 (400g) tin"
+    # 尝试提取括号中的重量
+    weight_in_brackets = re.search(r'\((\d+)\s*([a-z]+)\)', measurement_str)
+    if weight_in_brackets:
+        amount = float(weight_in_brackets.group(1))
+        unit = weight_in_brackets.group(2)
+
+        # 检查单位是否有效
+        if unit in unit_conversions:
+            unit = unit_conversions[unit]
+            return amount, unit
+
+    # 处理直接连接的数字和单位，如 "500g", "250ml"
+    direct_unit_match = re.match(r'^(\d+)\s*([a-z]+)$', measurement_str)
+    if direct_unit_match:
+        amount = float(direct_unit_match.group(1))
+        unit = direct_unit_match.group(2)
+
+        # 检查单位是否有效
+        if unit in unit_conversions:
+            unit = unit_conversions[unit]
+            return amount, unit
+
+    # 处理有空格的数字和单位，如 "2 cups" 或 "2 1/2 cups"
+    spaced_unit_match = re.match(r'^([\d\s.\/]+)\s+(.+)$', measurement_str)
+    if spaced_unit_match:
+        amount_str = spaced_unit_match.group(1).strip()
+        unit = spaced_unit_match.group(2).strip()
+
+        # 处理分数，如 "1/2"
+        if '/' in amount_str:
+            if ' ' in amount_str:  # 混合数字，如 "2 1/2"
+                whole, fraction = amount_str.split(' ', 1)
+                num, denom = fraction.split('/')
+                amount = float(whole) + float(num) / float(denom)
+            else:  # 简单分数，如 "1/2"
+                num, denom = amount_str.split('/')
+                amount = float(num) / float(denom)
+        else:
+            amount = float(amount_str)
+
+        # 检查单位是否有效
+        if unit in unit_conversions:
+            unit = unit_conversions[unit]
+            return amount, unit
+
+    # 处理特殊情况，如"pinch"或"dash"或描述性短语
+    if measurement_str in unit_conversions:
+        return 1.0, unit_conversions[measurement_str]
+
+    # 检查是否包含特殊表达方式
+    for special_phrase, standard_unit in unit_conversions.items():
+        if ' ' in special_phrase and special_phrase in measurement_str:
+            return 1.0, standard_unit
+
+    # 处理数字开头的特殊表达方式，如"2 to taste"
+    number_with_special_phrase = re.match(r'^(\d+)\s+(.+)$', measurement_str)
+    if number_with_special_phrase:
+        amount = float(number_with_special_phrase.group(1))
+        phrase = number_with_special_phrase.group(2)
+
+        if phrase in unit_conversions:
+            return amount, unit_conversions[phrase]
+
+        # 检查是否包含特殊表达方式
+        for special_phrase, standard_unit in unit_conversions.items():
+            if ' ' in special_phrase and special_phrase in phrase:
+                return amount, standard_unit
+
+    # 处理常见的描述性短语
+    descriptive_phrases = dict(DESCRIPTIVE_PHRASES)
+
+    # 大小写不敏感地检查描述性短语
+    lower_measurement = measurement_str.lower()
+    for phrase, unit in descriptive_phrases.items():
+        if phrase.lower() in lower_measurement:
+            return 1.0, unit
+
+    # 处理数量词
+    quantity_words = dict(QUANTITY_WORDS)
+
+    for word, amount in quantity_words.items():
+        if measurement_str.startswith(word):
+            # 提取单位（如果有）
+            unit_part = measurement_str[len(word):].strip()
+            if unit_part:
+                for unit_name, standard_unit in unit_conversions.items():
+                    if unit_part.startswith(unit_name):
+                        return amount, standard_unit
+            return amount, 'piece'  # 默认单位
+
+    # 如果只有数字，假设为克
+    if measurement_str.isdigit():
+        return float(measurement_str), 'g'
+
+    # 如果无法解析，默认为1件
+    return 1.0, 'piece'
+
+
+# TheMealDB 食谱中常见的 strMeasure 值
+STRMEASURE_SAMPLES = [
+    "500g", "1 (400g) tin", "pinch", "2 cups", "2 1/2 cups", "1/2 tsp", "1 tbsp", "to taste",
+    "3 cloves", "1 large", "2-3", "1 1/2 lb", "250ml", "1 cup (250ml)", "Juice of 1", "zest of one",
+    "a few", "two", "Dash", "12", "1kg", "100 g", "½ cup", "¼ tsp", "2 tablespoons", "1 tin",
+    "3 slices", "1 bunch", "few sprigs", "6 leaves", "1.5 kg", "1 can", "4 oz", "8 fl oz", "1 pint",
+    "2 pods", "knob", "1 handful", "garnish", "for garnish", "one ear", "  1 Cup  ", "10 g",
+    "3/4 cup", "1 litre", "1lb", "2lbs", "1/2 can", "3 medium", "Topping", "1 Packet", "175g/6oz",
+    "2 x 400g tins", "1 tsp ", "2 tbs", "1 teaspoon", "1/4 teaspoon", "Sprinkling", "1 sliced",
+    "2 chopped", "1 small", "3 tbs", "1½ tsp", "2 to 3 cups", "1-2 tbsp", "400g can", "Top",
+    "drizzle", "To serve", "50g/2oz", "1 (14 ounce) can", "8", "2 medium", "To Glaze", "Handful",
+    "1 1/4 cup", "1/3 cup", "Grated", "Cubed", "3 Lbs", "1 pound", "200ml", "as required",
+]
+
+
+# B 站食谱中的中文用量
+BILIBILI_MEASURE_SAMPLES = [
+    "200克", "2勺", "半个", "一小把", "500毫升", "适量", "少许", "1斤", "两瓣", "一个半",
+    "3片", "1小勺", "2大勺", "十二个", "2-3根", "1.5升", "一小撮", "半杯",
+]
+
+
+def bench_measurement(calculator, args):
+    """计量解析: 原实现 vs 预编译解析器（不带缓存和带缓存），以及两者结果的差异"""
+    rng = random.Random(0)
+    samples = STRMEASURE_SAMPLES + BILIBILI_MEASURE_SAMPLES
+    corpus = rng.choices(samples, k=args.samples * 10)
+
+    before = time_per_call(legacy_parse_measurement, corpus)
+    logger = logging.getLogger('recipe_calculator')
+    logger.disabled = True
+    try:
+        compiled = time_per_call(MeasurementParser(cache_size=0).parse, corpus)
+        after = time_per_call(MeasurementParser().parse, corpus)
+    finally:
+        logger.disabled = False
+    print_comparison(f"预编译解析器, 无缓存 ({len(corpus)} 次解析)", before, compiled)
+    print_comparison(f"预编译解析器, 按字符串缓存 ({len(corpus)} 次解析)", before, after)
+
+    parser = MeasurementParser(cache_size=0)
+    changed, extended = [], []
+    logger.disabled = True
+    try:
+        for measurement in samples:
+            old, new = legacy_parse_measurement(measurement), parser.parse(measurement)
+            if old == new:
+                continue
+            (extended if old == DEFAULT_MEASUREMENT else changed).append((measurement, old, new))
+    finally:
+        logger.disabled = False
+    print(f"  与原实现结果不同: {len(changed)} 个")
+    for measurement, old, new in changed:
+        print(f"    {measurement!r}: {old} -> {new}")
+    print(f"  原实现退回默认值、新解析器可识别: {len(extended)} 个")
+    for measurement, _, new in extended:
+        print(f"    {measurement!r} -> {new}")
+
+
+# B 站食谱中的中文食材名称（包括对照表中没有的名称）
+BILIBILI_INGREDIENT_SAMPLES = [
+    "鸡胸肉", "去皮鸡胸肉", "生抽", "老抽", "大蒜", "蒜末", "姜片", "小葱", "鸡蛋", "西红柿",
+    "土豆", "五花肉", "猪里脊", "牛腩", "虾仁", "豆腐", "嫩豆腐", "青椒", "干辣椒", "花椒",
+    "八角", "料酒", "蚝油", "白糖", "冰糖", "盐", "食用油", "香油", "淀粉", "清水",
+    "郫县豆瓣酱", "香菇", "金针菇", "西兰花", "胡萝卜", "面粉", "米饭", "牛奶", "黄油", "淡奶油",
+    "新鲜鸡翅中", "肥牛卷", "鱼露", "腐乳", "酒酿", "陈皮", "山楂", "十三香",
+]
+
+
+def bench_chinese_names(calculator, args):
+    """中文食材名称: 中英对照表命中率，以及与原先的英文模糊评分的耗时对比"""
+    names = BILIBILI_INGREDIENT_SAMPLES
+
+    def legacy_match(name):
+        # 原流程: 少于 3 个字符的名称直接放弃，其余做一次英文模糊评分
+        if len(name) < 3:
+            return []
+        return calculator._fuzzy_food_matches(name, None, None, [], 1)
+
+    before = time_per_call(legacy_match, names, repeat=1)
+    after = time_per_call(lambda name: calculator.find_food_matches(name, k=1), names)
+    print_comparison(f"中文食材名称匹配 ({len(names)} 个)", before, after)
+
+    rules = calculator.match_rules
+    lookup = time_per_call(rules.find_chinese_name, names)
+    print(f"  对照表最长匹配: {lookup * 1e6:.2f} us/次 ({len(rules.chinese_ingredient_names)} 个中文名称)")
+
+    hits = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = [(name, rules.find_chinese_name(name), calculator.find_food_matches(name, k=1)) for name in names]
+    for name, hit, matches in results:
+        if hit is not None:
+            hits += 1
+        resolved = matches[0][0] if matches else None
+        via = f"{hit[0]} -> {hit[1]}" if hit else "-"
+        print(f"    {name:<8} {via:<28} {resolved}")
+    print(f"  对照表命中率: {hits}/{len(names)} ({hits / len(names):.1%})")
+
+
+def legacy_preprocess_ingredient_name(calculator, ingredient_name, ingredient_categories):
+    """原实现: 每次调用都重建约 130 个修饰词模式，并对每个单词逐个执行 re.fullmatch"""
+    # 如果已经是简单名称，直接返回
+    if len(ingredient_name.split()) <= 2:
+        return ingredient_name, [ingredient_name]
+
+    # 要移除的常见修饰词和计量单位
+    modifiers_to_remove = [
+        # 数量和计量单位
+        r'\d+', r'\(\d+[a-z]*\)', r'\d+[a-z]+', r'cup', r'cups', r'tablespoon', r'tablespoons',
+        r'teaspoon', r'teaspoons', r'tbsp', r'tsp', r'oz', r'ounce', r'ounces', r'pound', r'pounds',
+        r'gram', r'grams', r'g', r'kg', r'ml', r'liter', r'liters', r'l', r'pinch', r'dash',
+        # 容器和包装
+        r'tin', r'can', r'jar', r'packet', r'pack', r'package', r'container', r'box', r'bottle',
+        # 状态修饰词
+        r'fresh', r'frozen', r'canned', r'dried', r'dry', r'raw', r'cooked', r'boiled', r'steamed',
+        r'roasted', r'baked', r'fried', r'grilled', r'smoked', r'cured', r'pickled', r'preserved',
+        # 大小和形状
+        r'large', r'medium', r'small', r'tiny', r'big', r'huge', r'whole', r'half', r'quarter',
+        r'sliced', r'diced', r'chopped', r'minced', r'grated', r'shredded', r'ground', r'mashed',
+        r'cubed', r'julienned', r'crushed', r'crumbled', r'torn', r'broken', r'split', r'halved',
+        # 其他修饰词
+        r'optional', r'to taste', r'as needed', r'approximately', r'about', r'roughly', r'or so',
+        r'extra', r'virgin', r'pure', r'natural', r'organic', r'free-range', r'grass-fed', r'wild',
+        r'farm-raised', r'homemade', r'store-bought', r'commercial', r'premium', r'quality',
+        r'skinless', r'boneless', r'skin-on', r'bone-in', r'lean', r'fatty', r'fat-free', r'low-fat',
+        r'full-fat', r'reduced-fat', r'unsalted', r'salted', r'sweetened', r'unsweetened',
+        r'finely', r'coarsely', r'thinly', r'thickly', r'freshly', r'lightly', r'heavily'
+    ]
+
+    # 常见的连接词和介词
+    connectors = [r',', r'and', r'or', r'with', r'without', r'plus', r'of', r'for', r'from', r'in', r'on', r'as']
+
+    # 复制原始名称以便处理
+    processed_name = ingredient_name
+
+    # 移除括号内的内容，如 "1 (400g) tin"
+    processed_name = re.sub(r'\([^)]*\)', '', processed_name)
+
+    # 将逗号替换为空格，以便处理
+    processed_name = processed_name.replace(',', ' ')
+
+    # 分词并过滤掉修饰词和连接词
+    words = processed_name.split()
+    filtered_words = []
+    for word in words:
+        # 检查是否是要移除的修饰词
+        should_remove = False
+        for modifier in modifiers_to_remove + connectors:
+            if re.fullmatch(modifier, word):
+                should_remove = True
+                break
+        if not should_remove:
+            filtered_words.append(word)
+
+    # 如果没有剩余单词，返回原始名称
+    if not filtered_words:
+        return ingredient_name, [ingredient_name]
+
+    # 使用食材分类字典来识别核心食材
+    core_ingredients = []
+    if ingredient_categories is calculator.match_rules.ingredient_categories:
+        # 计算器自身的规则: 用关键词自动机一次扫描判断单词是否包含任一关键词
+        rules = calculator.match_rules
+        first_category = next(iter(ingredient_categories), None)
+        for word in filtered_words:
+            if not rules.keyword_automaton.contains_any(word):
+                continue
+            # 与逐类别检查一致: 重复的单词只有在第一个类别中命中时才会再次加入
+            if word in core_ingredients and rules.detect_category(word)[0] != first_category:
+                continue
+            core_ingredients.append(word)
+    else:
+        for word in filtered_words:
+            # 检查是否是核心食材
+            for category, subcategories in ingredient_categories.items():
+                for subcat, keywords in subcategories.items():
+                    if any(keyword == word or keyword in word for keyword in keywords):
+                        core_ingredients.append(word)
+                        break
+                if word in core_ingredients:
+                    break
+
+    # 特殊食材处理
+    # 如果是盐，直接返回“salt”
+    if 'salt' in ingredient_name.lower():
+        return 'salt', ['salt']
+
+    # 如果是黑胡椒，直接返回“pepper”
+    if 'pepper' in ingredient_name.lower() and ('black' in ingredient_name.lower() or 'ground' in ingredient_name.lower()):
+        return 'pepper', ['pepper']
+
+    # 如果是黄油，直接返回“butter”
+    if 'butter' in ingredient_name.lower():
+        return 'butter', ['butter']
+
+    # 如果没有识别到核心食材，使用所有过滤后的单词
+    if not core_ingredients:
+        core_ingredients = filtered_words
+
+    # 组合核心食材为简化名称
+    simplified_name = ' '.join(core_ingredients)
+
+    return simplified_name, core_ingredients
+
+
+def bench_preprocess(calculator, args):
+    """食材名称预处理: 原实现 vs 集合查找加预编译正则，并核对两者输出一致"""
+    names = [ingredient.lower() for items in TEST_INGREDIENT_SETS.values() for ingredient in items]
+    complex_names = [ingredient.lower() for ingredient in COMPLEX_TEST_INGREDIENTS]
+    # 计算器自身的规则（自动机路径）和普通字典（逐类别检查路径）
+    categories_sets = {
+        'match_rules': calculator.match_rules.ingredient_categories,
+        'dict': {category: dict(subcategories) for category, subcategories in calculator.match_rules.ingredient_categories.items()},
+    }
+    for label, categories in categories_sets.items():
+        before = time_per_call(lambda name: legacy_preprocess_ingredient_name(calculator, name, categories), complex_names)
+        after = time_per_call(lambda name: calculator.preprocess_ingredient_name(name, categories), complex_names)
+        print_comparison(f"{label}: 复杂食材名称 ({len(complex_names)} 个)", before, after)
+        mismatches = [
+            name for name in names
+            if legacy_preprocess_ingredient_name(calculator, name, categories) != calculator.preprocess_ingredient_name(name, categories)
+        ]
+        print(f"  与原实现输出不同: {len(mismatches)}/{len(names)} {mismatches[:5]}")
+
+
+def sample_recipes(count, seed=0):
+    """生成模拟食谱（TheMealDB 格式），每五个食谱中有一个使用 B 站的中文食材和用量"""
+    rng = random.Random(seed)
+    ingredients = [ingredient for items in TEST_INGREDIENT_SETS.values() for ingredient in items]
+    recipes = []
+    for number in range(count):
+        chinese = number % 5 == 0
+        recipe = {'strMeal': f"Recipe {number}", 'strCategory': 'Beef'}
+        for i in range(1, rng.randint(4, 16)):
+            recipe[f'strIngredient{i}'] = rng.choice(BILIBILI_INGREDIENT_SAMPLES if chinese else ingredients)
+            recipe[f'strMeasure{i}'] = rng.choice(BILIBILI_MEASURE_SAMPLES if chinese else STRMEASURE_SAMPLES)
+        recipes.append(recipe)
+    return recipes
+
+
+def bench_workers(calculator, args):
+    """process_recipes 并行模式: 1..N 个工作进程的吞吐量（包括工作进程启动），并核对输出与串行一致"""
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'recipes.json')
+        with open(input_path, 'w', encoding='utf-8') as f:
+            json.dump({'meals': sample_recipes(args.samples)}, f, ensure_ascii=False)
+
+        serial_output = None
+        for workers in range(1, args.workers + 1):
+            output_path = os.path.join(tmp, f'output_{workers}.json')
+            calculator.cache_clear(persistent=True)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                process_recipes(workers=workers, data_dir=args.data_dir,
+                                input_file_path=input_path, output_file_path=output_path)
+            elapsed = time.perf_counter() - start
+            with open(output_path, 'rb') as f:
+                output = f.read()
+            if serial_output is None:
+                serial_output = output
+            same = "一致" if output == serial_output else "不一致"
+            print(f"  {workers} 个进程: {args.samples / elapsed:8.1f} 个食谱/秒 ({elapsed:.2f}s, 输出与串行{same})")
+    print(f"  CPU 核数: {os.cpu_count()}")
+
+
+def process_memory_kb(pid):
+    """
+    读取进程的内存统计（KB，来自 /proc/<pid>/smaps_rollup）
+
+    共享内存页和映射文件页会计入每个进程的 RSS；PSS 按共享进程数平摊，更接近实际占用；
+    Anonymous 是进程私有的匿名内存（不含映射文件的页缓存）。
+
+    返回:
+        dict: Rss, Pss, Anonymous
+    """
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss', 'Anonymous'):
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def _bench_worker_init(ready, data_dir, shared_handle):
+    """shared_memory 基准的 initializer: 初始化工作进程的计算器后报告进程号"""
+    logging.getLogger('recipe_calculator').setLevel(logging.ERROR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        _init_recipe_worker(data_dir, shared_handle)
+    ready.put(os.getpid())
+
+
+def measure_worker_pool(calculator, data_dir, workers, recipes, shared_memory):
+    """
+    启动 workers 个工作进程，测量启动时间，处理一批食谱后读取各进程的内存
+
+    返回:
+        dict: startup_seconds, share_seconds, worker_rss_kb, worker_pss_kb, parent_rss_kb
+    """
+    context = multiprocessing.get_context('spawn')
+    ready = context.Queue()
+    start = time.perf_counter()
+    shared = SharedFnddsData.from_calculator(calculator) if shared_memory else None
+    share_seconds = time.perf_counter() - start
+    pool = context.Pool(workers, initializer=_bench_worker_init,
+                        initargs=(ready, data_dir, shared.handle if shared is not None else None))
+    try:
+        pids = [ready.get() for _ in range(workers)]
+        startup_seconds = time.perf_counter() - start
+        with contextlib.redirect_stdout(io.StringIO()):
+            pool.map(_annotate_recipe_in_worker, recipes, chunksize=1)
+        memory = [process_memory_kb(pid) for pid in pids]
+        parent_rss_kb = process_memory_kb(os.getpid())['Rss']
+    finally:
+        pool.terminate()
+        pool.join()
+        if shared is not None:
+            shared.close()
+            shared.unlink()
+    return {
+        'startup_seconds': startup_seconds,
+        'share_seconds': share_seconds,
+        'worker_rss_kb': sum(values['Rss'] for values in memory),
+        'worker_pss_kb': sum(values['Pss'] for values in memory),
+        'parent_rss_kb': parent_rss_kb,
+    }
+
+
+def bench_shared_memory(calculator, args):
+    """--workers 个工作进程: 各自加载 FNDDS 数据 vs 附加父进程放入共享内存的数据（启动时间和内存）"""
+    recipes = sample_recipes(args.samples)
+    for title, shared_memory in (("各自加载", False), ("共享内存", True)):
+        calculator.cache_clear(persistent=True)
+        result = measure_worker_pool(calculator, args.data_dir, args.workers, recipes, shared_memory)
+        print(f"  {title}: {args.workers} 个进程启动 {result['startup_seconds']:.2f}s"
+              f" (其中放入共享内存 {result['share_seconds'] * 1000:.1f}ms)")
+        print(f"    工作进程 RSS 合计 {result['worker_rss_kb'] / 1024:8.1f} MB,"
+              f" PSS 合计 {result['worker_pss_kb'] / 1024:8.1f} MB,"
+              f" 父进程 RSS {result['parent_rss_kb'] / 1024:.1f} MB")
+    print(f"  CPU 核数: {os.cpu_count()}")
+
+
+def _measure_calculator_memory(data_dir, nutrient_store, nutrient_dtype, recipes):
+    """在新进程中加载计算器并计算一批食谱，返回加载耗时、前后内存和营养矩阵字节数"""
+    logging.getLogger('recipe_calculator').setLevel(logging.ERROR)
+    before = process_memory_kb(os.getpid())
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        calculator = RecipeNutritionCalculator(data_dir, persistent_match_cache=False,
+                                               nutrient_store=nutrient_store, nutrient_dtype=nutrient_dtype)
+        load_seconds = time.perf_counter() - start
+        for recipe in recipes:
+            calculator.calculate_recipe_nutrition(recipe, verbose=False)
+    after = process_memory_kb(os.getpid())
+    # SQLite 存储不在内存中保存营养矩阵
+    return load_seconds, before, after, getattr(calculator.nutrient_matrix, 'nbytes', 0)
+
+
+def bench_nutrient_store(calculator, args):
+    """各种营养数据存储方式（DataFrame、内存映射、SQLite）和 float64/float32: 已加载计算器的常驻内存"""
+    recipes = sample_recipes(args.samples)
+    context = multiprocessing.get_context('spawn')
+    # 先生成列式存储和 SQLite 数据库，避免把生成耗时算进加载时间
+    with contextlib.redirect_stdout(io.StringIO()):
+        for nutrient_store in NUTRIENT_STORES:
+            RecipeNutritionCalculator(args.data_dir, persistent_match_cache=False, nutrient_store=nutrient_store).close()
+    print(f"  {'模式':16s} {'加载':>8s} {'RSS 增量':>10s} {'私有内存增量':>10s} {'营养矩阵':>10s}")
+    for nutrient_store in NUTRIENT_STORES:
+        for nutrient_dtype in ("float64", "float32"):
+            # 每种模式在新进程中测量，互不影响
+            with context.Pool(1) as pool:
+                load_seconds, before, after, matrix_bytes = pool.apply(
+                    _measure_calculator_memory, (args.data_dir, nutrient_store, nutrient_dtype, recipes)
+                )
+            print(f"  {nutrient_store + '/' + nutrient_dtype:16s} {load_seconds * 1000:6.0f}ms"
+                  f" {(after['Rss'] - before['Rss']) / 1024:8.1f}MB"
+                  f" {(after['Anonymous'] - before['Anonymous']) / 1024:10.1f}MB"
+                  f" {matrix_bytes / 1024:8.0f}KB")
+
+
+def bench_sqlite(calculator, args):
+    """SQLite 存储的带索引查询 vs 内存中的营养矩阵和份量索引"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        sqlite_calculator = RecipeNutritionCalculator(args.data_dir, persistent_match_cache=False,
+                                                      nutrient_store="sqlite")
+    step = max(len(calculator.food_descriptions) // args.samples, 1)
+    descriptions = calculator.food_descriptions[::step][:args.samples]
+    portions = [(description, portion) for description in descriptions for portion in ('1 cup', '1 medium', '1 slice')]
+    recipes = sample_recipes(args.samples)
+    for recipe in recipes:
+        # 预热匹配缓存，只比较营养和份量查询
+        calculator.calculate_recipe_nutrition(recipe, verbose=False)
+        sqlite_calculator.calculate_recipe_nutrition(recipe, verbose=False)
+
+    print_comparison(
+        f"营养值查找 ({len(descriptions)} 个食品描述，优化前=内存，优化后=SQLite)",
+        time_per_call(lambda d: calculator.get_nutrient_values(d, 150.0), descriptions),
+        time_per_call(lambda d: sqlite_calculator.get_nutrient_values(d, 150.0), descriptions),
+    )
+    print_comparison(
+        f"份量重量查找 ({len(portions)} 次，优化前=内存，优化后=SQLite)",
+        time_per_call(lambda q: calculator.find_portion_weight(*q), portions),
+        time_per_call(lambda q: sqlite_calculator.find_portion_weight(*q), portions),
+    )
+    print_comparison(
+        f"食谱营养计算 ({len(recipes)} 个食谱，匹配已缓存，优化前=内存，优化后=SQLite)",
+        time_per_call(lambda r: calculator.calculate_recipe_nutrition(r, verbose=False), recipes),
+        time_per_call(lambda r: sqlite_calculator.calculate_recipe_nutrition(r, verbose=False), recipes),
+        unit='ms',
+    )
+    sqlite_calculator.close()
+
+
+def bench_startup(calculator, args):
+    """启动加载: 全部表和列 vs 只加载热路径用到的列并压缩数据类型（每张表的耗时和内存）"""
+    eager_report, lazy_report = {}, {}
+    load_fndds_tables(args.data_dir, report=eager_report)
+    load_fndds_tables(args.data_dir, names=('nutrient_values', 'portions_weights'), usecols=HOT_PATH_COLUMNS,
+                      compact=True, report=lazy_report)
+    print(f"  {'数据表':20s} {'优化前':>18s} {'优化后':>18s}")
+    for name, before in eager_report.items():
+        after = lazy_report.get(name)
+        after_text = '延迟加载' if after is None else f"{after['seconds'] * 1000:6.1f}ms {after['bytes'] / 1e6:6.2f}MB"
+        print(f"  {name:22s} {before['seconds'] * 1000:6.1f}ms {before['bytes'] / 1e6:6.2f}MB {after_text:>18s}")
+    print(f"  {'合计':20s} {sum(r['seconds'] for r in eager_report.values()) * 1000:6.1f}ms"
+          f" {sum(r['bytes'] for r in eager_report.values()) / 1e6:6.2f}MB"
+          f" {sum(r['seconds'] for r in lazy_report.values()) * 1000:6.1f}ms"
+          f" {sum(r['bytes'] for r in lazy_report.values()) / 1e6:6.2f}MB")
+
+
+BENCHMARKS = {
+    'nutrient_lookup': bench_nutrient_lookup,
+    'portion_lookup': bench_portion_lookup,
+    'match': bench_match,
+    'match_index': bench_match_index,
+    'keywords': bench_keywords,
+    'engines': bench_engines,
+    'tfidf': bench_tfidf,
+    'typo': bench_typo,
+    'match_cache': bench_match_cache,
+    'persistent_cache': bench_persistent_cache,
+    'negative_cache': bench_negative_cache,
+    'measurement': bench_measurement,
+    'chinese_names': bench_chinese_names,
+    'preprocess': bench_preprocess,
+    'workers': bench_workers,
+    'shared_memory': bench_shared_memory,
+    'nutrient_store': bench_nutrient_store,
+    'sqlite': bench_sqlite,
+    'startup': bench_startup,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="营养计算器性能基准")
+    parser.add_argument('benchmarks', nargs='*', help=f"要运行的基准: {', '.join(BENCHMARKS)}")
+    parser.add_argument('--data-dir', default='fixed_data', help="FNDDS 数据目录")
+    parser.add_argument('--samples', type=int, default=200, help="每个基准的样本数量")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="workers 基准的最大进程数、shared_memory 基准的进程数")
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"未知的基准: {', '.join(unknown)}")
+
+    # 不使用持久化匹配缓存，避免上一次运行写入磁盘的匹配结果影响计时；
+    # 各基准在计时前自行清空进程内的匹配缓存
+    with contextlib.redirect_stdout(io.StringIO()):
+        calculator = get_calculator(args.data_dir, persistent_match_cache=False)
+
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"\n===== {name} =====")
+        BENCHMARKS[name](calculator, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,8 +17,8 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger('recipe_converter')
 
-# 导入营养计算器类
-from recipe_nutrition_calculator import RecipeNutritionCalculator
+# 导入共享营养计算器
+from recipe_nutrition_calculator import get_calculator
 from recipe_nutrition_industry_standard import add_units_to_nutrition_values, calculate_industry_standard_servings
 
 def convert_bilibili_to_recipe(bilibili_data):
@@ -112,9 +112,9 @@ def add_precise_nutrition_info(recipe_data, data_dir="fixed_data"):
     Returns:
         dict: 添加了精确营养信息的食谱JSON对象
     """
-    # 创建营养计算器实例
+    # 获取进程级共享的营养计算器（同一数据目录只加载一次）
     try:
-        calculator = RecipeNutritionCalculator(data_dir=data_dir)
+        calculator = get_calculator(data_dir)
         
         # 计算营养成分
         print(f"正在为 {recipe_data.get('strMeal')} 计算精确营养信息...")
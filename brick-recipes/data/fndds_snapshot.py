@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+FNDDS 数据快照缓存
+
+RecipeNutritionCalculator 每次初始化都要用 openpyxl 解析三个 FNDDS "At A Glance"
+Excel 工作簿，耗时数秒。本模块在首次加载时把工作簿转换为 NumPy .npz 二进制快照
+（数值列直接存为数组，文本列存为字符串表 + 缺失值掩码），之后的冷启动只需读取快照。
+
+快照以源文件的大小、修改时间和内容哈希为键，源文件变化时自动重建。加载时可以只读取
+部分表和列，并在不改变任何值的前提下压缩数据类型（compact_table）。
+
+用法:
+    python fndds_snapshot.py [data_dir] [--rebuild]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 设置日志记录
+logger = logging.getLogger('recipe_calculator')
+
+# FNDDS 数据表名 -> Excel 文件名
+FNDDS_FILES = {
+    'ingredient_nutrients': "2021-2023 FNDDS At A Glance - Ingredient Nutrient Values.xlsx",
+    'portions_weights': "2021-2023 FNDDS At A Glance - Portions and Weights.xlsx",
+    'nutrient_values': "2021-2023 FNDDS At A Glance - FNDDS Nutrient Values.xlsx",
+}
+
+# 快照目录（位于数据目录内）和格式版本，格式变化时递增版本号使旧快照失效
+SNAPSHOT_DIR_NAME = '.fndds_snapshot'
+SNAPSHOT_FORMAT_VERSION = 2
+MANIFEST_NAME = 'manifest.json'
+
+
+def fndds_source_paths(data_dir):
+    """
+    返回三个 FNDDS Excel 文件的完整路径
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+
+    返回:
+        dict: 表名 -> 文件路径
+    """
+    return {name: os.path.join(data_dir, filename) for name, filename in FNDDS_FILES.items()}
+
+
+def snapshot_dir_for(data_dir):
+    """返回数据目录对应的快照目录"""
+    return os.path.join(data_dir, SNAPSHOT_DIR_NAME)
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """计算文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """
+    计算源文件指纹（大小、修改时间、内容哈希）
+
+    参数:
+        path (str): 文件路径
+
+    返回:
+        dict: {'size', 'mtime_ns', 'sha256'}
+    """
+    stat = os.stat(path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hash_file(path),
+    }
+
+
+def combine_data_version(fingerprints):
+    """根据各源文件的内容哈希生成整体数据版本号"""
+    digest = hashlib.sha256()
+    for name in sorted(fingerprints):
+        digest.update(f"{name}:{fingerprints[name]['sha256']}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def read_fndds_excel(data_dir, names=None, usecols=None):
+    """
+    直接从 Excel 工作簿读取 FNDDS 数据表（跳过第一行标题）
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+        names (iterable): 要读取的表名，默认全部三张表
+        usecols (dict): 表名 -> 要保留的列（列名列表或 列名 -> bool 的函数），默认全部列
+
+    返回:
+        dict: 表名 -> DataFrame
+    """
+    paths = fndds_source_paths(data_dir)
+    usecols = usecols or {}
+    return {
+        name: pd.read_excel(paths[name], skiprows=1, usecols=usecols.get(name))
+        for name in (FNDDS_FILES if names is None else names)
+    }
+
+
+def select_columns(columns, usecols):
+    """
+    按 usecols 选择列（保持表中的顺序）
+
+    参数:
+        columns (list): 表的全部列名
+        usecols: 列名列表、列名 -> bool 的函数，或 None（全部列）
+
+    返回:
+        list: 保留的列名
+    """
+    if usecols is None:
+        return list(columns)
+    if callable(usecols):
+        return [col for col in columns if usecols(col)]
+    wanted = set(usecols)
+    return [col for col in columns if col in wanted]
+
+
+def _column_kind(series):
+    """判断列的存储方式: 数值列 'num'、重复较多的文本列 'cat'、其余纯文本列 'str'，其余 'json'"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return 'num'
+    non_null = series.dropna()
+    if all(isinstance(value, str) for value in non_null):
+        # 不同值不超过行数的一半时按类别保存（类别表 + 编码）
+        if len(series) and non_null.nunique() <= len(series) // 2:
+            return 'cat'
+        return 'str'
+    return 'json'
+
+
+def compact_numeric_dtype(values):
+    """
+    返回能无损保存全部值的更小数值类型
+
+    整数降为能容纳全部值的最小有符号整数类型；浮点数只有在每个值都能用 float32 精确表示时
+    才降为 float32。
+
+    参数:
+        values (numpy.ndarray): 数值数组
+
+    返回:
+        str: 更小的数据类型名称，不能压缩时返回 None
+    """
+    if len(values) == 0:
+        return None
+    if np.issubdtype(values.dtype, np.integer):
+        low, high = values.min(), values.max()
+        for dtype in (np.int8, np.int16, np.int32):
+            if np.dtype(dtype).itemsize < values.dtype.itemsize and np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                return np.dtype(dtype).name
+        return None
+    if values.dtype == np.float64:
+        if np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+            return 'float32'
+    return None
+
+
+def compact_table(df):
+    """
+    在不改变任何值的前提下压缩数据表的内存占用
+
+    数值列按 compact_numeric_dtype 降位；重复较多的文本列（不同值不超过行数的一半）转为 category。
+
+    参数:
+        df (DataFrame): 数据表
+
+    返回:
+        DataFrame: 压缩后的数据表
+    """
+    compacted = {}
+    for col in df.columns:
+        series = df[col]
+        kind = _column_kind(series)
+        if kind == 'num':
+            dtype = compact_numeric_dtype(series.to_numpy())
+            if dtype is not None:
+                series = series.astype(dtype)
+        elif kind == 'cat':
+            series = series.astype('category')
+        compacted[col] = series
+    return pd.DataFrame(compacted, columns=df.columns)
+
+
+def _save_table(df, path):
+    """
+    将 DataFrame 按列保存为 .npz，返回列描述列表
+
+    数值列直接保存，并记录无损压缩后的数据类型；文本列保存为定长 Unicode 数组（字符串表）
+    加缺失值掩码，重复较多的文本列保存为类别表加编码（-1 表示缺失）；其余混合类型列
+    序列化为 JSON 字符串。
+    """
+    arrays = {}
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        kind = _column_kind(series)
+        key = f'c{i}'
+        column = {'name': str(col), 'kind': kind}
+        if kind == 'num':
+            arrays[key] = series.to_numpy()
+            column['compact_dtype'] = compact_numeric_dtype(arrays[key])
+        elif kind == 'cat':
+            codes, categories = pd.factorize(series, use_na_sentinel=True)
+            arrays[key] = np.array(list(categories), dtype=str)
+            arrays[key + '_codes'] = codes.astype(np.int32)
+        elif kind == 'str':
+            mask = series.isna().to_numpy()
+            arrays[key] = np.array(series.where(~mask, '').tolist(), dtype=str)
+            arrays[key + '_mask'] = mask
+        else:
+            values = [None if pd.isna(value) else value for value in series.tolist()]
+            arrays[key] = np.array(json.dumps(values, ensure_ascii=False, default=str))
+        columns.append(column)
+
+    tmp_path = path + f'.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+    return columns
+
+
+def _load_table(path, columns, usecols=None, compact=False):
+    """
+    从 .npz 快照恢复 DataFrame
+
+    参数:
+        path (str): .npz 文件路径
+        columns (list): 快照清单中的列描述
+        usecols: 要读取的列（见 select_columns），默认全部列
+        compact (bool): 是否使用保存时记录的无损压缩类型，类别列恢复为 category
+    """
+    data = {}
+    selected = set(select_columns([column['name'] for column in columns], usecols))
+    with np.load(path, allow_pickle=False) as npz:
+        for i, column in enumerate(columns):
+            if column['name'] not in selected:
+                continue
+            key = f'c{i}'
+            if column['kind'] == 'num':
+                values = npz[key]
+                if compact and column.get('compact_dtype'):
+                    values = values.astype(column['compact_dtype'])
+            elif column['kind'] == 'cat':
+                categories = npz[key].astype(object)
+                codes = npz[key + '_codes']
+                if compact:
+                    values = pd.Categorical.from_codes(codes, categories=categories)
+                else:
+                    values = categories[codes]
+                    values[codes < 0] = np.nan
+            elif column['kind'] == 'str':
+                values = npz[key].astype(object)
+                values[npz[key + '_mask']] = np.nan
+            else:
+                values = json.loads(str(npz[key]))
+            data[column['name']] = values
+    return pd.DataFrame(data, columns=[column['name'] for column in columns if column['name'] in selected])
+
+
+def _read_manifest(snapshot_dir):
+    """读取快照清单，不存在或损坏时返回 None"""
+    manifest_path = os.path.join(snapshot_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _write_manifest(snapshot_dir, manifest):
+    """原子地写入快照清单"""
+    manifest_path = os.path.join(snapshot_dir, MANIFEST_NAME)
+    tmp_path = manifest_path + f'.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def snapshot_is_current(data_dir, manifest):
+    """
+    检查快照是否与源文件一致
+
+    先比较大小和修改时间；修改时间变化但大小相同时再比较内容哈希，
+    内容未变则刷新清单中的修改时间，避免下次重复计算哈希。
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+        manifest (dict): 快照清单
+
+    返回:
+        bool: 快照是否可用
+    """
+    if not manifest:
+        return False
+
+    refreshed = False
+    for name, path in fndds_source_paths(data_dir).items():
+        recorded = manifest.get('sources', {}).get(name)
+        if not recorded:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size != recorded['size']:
+            return False
+        if stat.st_mtime_ns != recorded['mtime_ns']:
+            if hash_file(path) != recorded['sha256']:
+                return False
+            recorded['mtime_ns'] = stat.st_mtime_ns
+            refreshed = True
+
+    if refreshed:
+        try:
+            _write_manifest(snapshot_dir_for(data_dir), manifest)
+        except OSError:
+            pass
+    return True
+
+
+def load_snapshot(data_dir, manifest, names=None, usecols=None):
+    """
+    从快照加载 FNDDS 数据表
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+        manifest (dict): 快照清单
+        names (iterable): 要加载的表名，默认全部三张表
+        usecols (dict): 表名 -> 要保留的列（见 select_columns），默认全部列
+
+    返回:
+        dict: 表名 -> DataFrame
+    """
+    snapshot_dir = snapshot_dir_for(data_dir)
+    usecols = usecols or {}
+    return {
+        name: _load_table(os.path.join(snapshot_dir, f'{name}.npz'), manifest['tables'][name]['columns'],
+                          usecols.get(name))
+        for name in (manifest['tables'] if names is None else names)
+    }
+
+
+def build_snapshot(data_dir):
+    """
+    解析 Excel 工作簿并写入二进制快照，同时测量并报告提速效果
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+
+    返回:
+        tuple: (表名 -> DataFrame, 快照清单)
+    """
+    paths = fndds_source_paths(data_dir)
+    fingerprints = {name: file_fingerprint(path) for name, path in paths.items()}
+
+    start = time.perf_counter()
+    tables = read_fndds_excel(data_dir)
+    excel_seconds = time.perf_counter() - start
+
+    snapshot_dir = snapshot_dir_for(data_dir)
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    manifest = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'sources': fingerprints,
+        'data_version': combine_data_version(fingerprints),
+        'tables': {},
+    }
+    for name, df in tables.items():
+        columns = _save_table(df, os.path.join(snapshot_dir, f'{name}.npz'))
+        manifest['tables'][name] = {'columns': columns, 'rows': len(df)}
+
+    start = time.perf_counter()
+    load_snapshot(data_dir, manifest)
+    snapshot_seconds = time.perf_counter() - start
+
+    manifest['build_report'] = {
+        'excel_seconds': round(excel_seconds, 4),
+        'snapshot_seconds': round(snapshot_seconds, 4),
+        'speedup': round(excel_seconds / snapshot_seconds, 1) if snapshot_seconds > 0 else None,
+    }
+    _write_manifest(snapshot_dir, manifest)
+
+    logger.info(
+        f"FNDDS 快照已生成: Excel 解析 {excel_seconds:.2f}s -> 快照加载 {snapshot_seconds * 1000:.1f}ms "
+        f"(提速 {manifest['build_report']['speedup']}x)"
+    )
+    return tables, manifest
+
+
+def _load_tables(names, load_table, report):
+    """
+    逐表加载数据，并记录每张表的加载耗时和内存占用
+
+    参数:
+        names (iterable): 表名
+        load_table (callable): 表名 -> DataFrame
+        report (dict): 不为 None 时写入 表名 -> {'seconds', 'rows', 'columns', 'bytes'}
+
+    返回:
+        dict: 表名 -> DataFrame
+    """
+    tables = {}
+    for name in names:
+        start = time.perf_counter()
+        df = load_table(name)
+        tables[name] = df
+        if report is not None:
+            report[name] = {
+                'seconds': time.perf_counter() - start,
+                'rows': len(df),
+                'columns': len(df.columns),
+                'bytes': int(df.memory_usage(deep=True).sum()),
+            }
+    return tables
+
+
+def load_fndds_tables(data_dir, use_snapshot=True, rebuild=False, names=None, usecols=None, compact=False,
+                      report=None):
+    """
+    加载 FNDDS 数据表，优先使用二进制快照
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+        use_snapshot (bool): 是否使用快照缓存；False 时直接读取 Excel
+        rebuild (bool): 是否强制重建快照
+        names (iterable): 要加载的表名，默认全部三张表
+        usecols (dict): 表名 -> 要保留的列（列名列表或 列名 -> bool 的函数），默认全部列
+        compact (bool): 是否在不改变值的前提下压缩数据类型（见 compact_table）
+        report (dict): 不为 None 时写入每张表的加载耗时、行数、列数和内存字节数
+
+    返回:
+        tuple: (表名 -> DataFrame, 数据版本号)
+    """
+    names = tuple(FNDDS_FILES) if names is None else tuple(names)
+    usecols = usecols or {}
+
+    def finish(df):
+        return compact_table(df) if compact else df
+
+    if not use_snapshot:
+        paths = fndds_source_paths(data_dir)
+        tables = _load_tables(
+            names, lambda name: finish(pd.read_excel(paths[name], skiprows=1, usecols=usecols.get(name))), report
+        )
+        fingerprints = {name: file_fingerprint(path) for name, path in paths.items()}
+        return tables, combine_data_version(fingerprints)
+
+    manifest = None if rebuild else _read_manifest(snapshot_dir_for(data_dir))
+    if snapshot_is_current(data_dir, manifest):
+        snapshot_dir = snapshot_dir_for(data_dir)
+        try:
+            tables = _load_tables(
+                names,
+                lambda name: _load_table(os.path.join(snapshot_dir, f'{name}.npz'),
+                                         manifest['tables'][name]['columns'], usecols.get(name), compact),
+                report
+            )
+            return tables, manifest['data_version']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"警告: FNDDS 快照读取失败，重新生成: {e}")
+
+    try:
+        all_tables, manifest = build_snapshot(data_dir)
+    except OSError as e:
+        # 数据目录不可写时退回到直接读取 Excel
+        logger.warning(f"警告: 无法写入 FNDDS 快照，直接读取 Excel: {e}")
+        return load_fndds_tables(data_dir, use_snapshot=False, names=names, usecols=usecols, compact=compact,
+                                 report=report)
+    tables = _load_tables(
+        names,
+        lambda name: finish(all_tables[name][select_columns(all_tables[name].columns, usecols.get(name))]),
+        report
+    )
+    return tables, manifest['data_version']
+
+
+def fndds_data_version(data_dir):
+    """
+    返回数据目录当前的数据版本号
+
+    快照有效时直接读取清单中的版本号，否则根据源文件内容哈希计算。
+    """
+    manifest = _read_manifest(snapshot_dir_for(data_dir))
+    if snapshot_is_current(data_dir, manifest):
+        return manifest['data_version']
+    fingerprints = {name: file_fingerprint(path) for name, path in fndds_source_paths(data_dir).items()}
+    return combine_data_version(fingerprints)
+
+
+def main():
+    """构建快照并打印提速报告"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    data_dir = args[0] if args else 'fixed_data'
+
+    manifest = None if '--rebuild' in sys.argv else _read_manifest(snapshot_dir_for(data_dir))
+    if snapshot_is_current(data_dir, manifest):
+        start = time.perf_counter()
+        load_snapshot(data_dir, manifest)
+        elapsed = time.perf_counter() - start
+        print(f"快照已是最新 (数据版本 {manifest['data_version']})，加载耗时 {elapsed * 1000:.1f}ms")
+        return
+
+    _, manifest = build_snapshot(data_dir)
+    report = manifest['build_report']
+    print(f"Excel 解析: {report['excel_seconds']:.2f}s")
+    print(f"快照加载:  {report['snapshot_seconds'] * 1000:.1f}ms")
+    print(f"提速:      {report['speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基于 SQLite 的 FNDDS 数据存储
+
+把三张 FNDDS 数据表导入数据目录中的一个 SQLite 文件，并为小写的食品描述、食品代码和
+份量描述建立索引。计算器以 nutrient_store="sqlite" 使用时不再把 DataFrame 和营养矩阵
+常驻内存: 营养值、份量重量和描述查找都变成带索引的查询（sqlite3 按 SQL 文本缓存预编译
+语句，固定的查询语句只编译一次）。小容器中只需几 MB 内存即可运行，多个进程可以只读共享
+同一个文件。
+
+数据库以 FNDDS 数据版本为键，数据文件变化时自动重建。
+
+用法:
+    python fndds_sqlite.py [data_dir] [--rebuild]
+"""
+
+import json
+import logging
+import os
+import pathlib
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from fndds_snapshot import fndds_data_version, load_fndds_tables
+
+logger = logging.getLogger('recipe_calculator')
+
+# 数据库文件名（位于数据目录内）和格式版本，格式变化时递增版本号使旧数据库失效
+FNDDS_SQLITE_FILE_NAME = '.fndds.sqlite3'
+FNDDS_SQLITE_FORMAT_VERSION = 1
+
+# 需要额外保存小写副本（并建立索引）的文本列
+LOWERCASE_COLUMNS = ('Main food description', 'Portion description', 'Ingredient description')
+
+# 营养值表中营养素列的起始位置（前四列是代码、描述和 WWEIA 类别）
+NUTRIENT_COLUMN_OFFSET = 4
+
+
+def fndds_sqlite_path_for(data_dir):
+    """返回数据目录对应的 SQLite 数据库路径"""
+    return os.path.join(data_dir, FNDDS_SQLITE_FILE_NAME)
+
+
+def sql_column_name(name):
+    """把 Excel 列名转换为 SQL 列名（小写，非字母数字字符替换为下划线）"""
+    return re.sub(r'[^0-9a-z]+', '_', str(name).lower()).strip('_')
+
+
+def _table_columns(df, nutrient_columns=False):
+    """
+    生成表的列定义
+
+    参数:
+        df (DataFrame): 数据表
+        nutrient_columns (bool): 营养素列是否命名为 n0, n1, ...（营养值表）
+
+    返回:
+        list: [(SQL 列名, SQL 类型, 源列名, 是否为小写副本), ...]
+    """
+    columns = []
+    for i, col in enumerate(df.columns):
+        if nutrient_columns and i >= NUTRIENT_COLUMN_OFFSET:
+            name = f'n{i - NUTRIENT_COLUMN_OFFSET}'
+        else:
+            name = sql_column_name(col)
+        if pd.api.types.is_integer_dtype(df[col].dtype):
+            sql_type = 'INTEGER'
+        elif pd.api.types.is_numeric_dtype(df[col].dtype):
+            sql_type = 'REAL'
+        else:
+            sql_type = 'TEXT'
+        columns.append((name, sql_type, col, False))
+        if col in LOWERCASE_COLUMNS:
+            columns.append((f'{name}_lower', 'TEXT', col, True))
+    return columns
+
+
+def _import_table(conn, table, df, nutrient_columns=False):
+    """创建表并导入 DataFrame，行号（从 0 开始）作为主键 row_id"""
+    columns = _table_columns(df, nutrient_columns)
+    definitions = ', '.join(f'"{name}" {sql_type}' for name, sql_type, _, _ in columns)
+    conn.execute(f'CREATE TABLE "{table}" (row_id INTEGER PRIMARY KEY, {definitions})')
+
+    values = []
+    for name, _, col, lower in columns:
+        series = df[col]
+        if lower:
+            series = series.str.lower()
+        values.append([None if pd.isna(value) else value for value in series.tolist()])
+    placeholders = ', '.join('?' for _ in range(len(columns) + 1))
+    conn.executemany(f'INSERT INTO "{table}" VALUES ({placeholders})', zip(range(len(df)), *values))
+
+
+def build_fndds_sqlite(data_dir, use_snapshot=True):
+    """
+    把三张 FNDDS 数据表导入 SQLite 数据库并建立索引
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+        use_snapshot (bool): 是否通过二进制快照读取数据表
+
+    返回:
+        str: 数据库路径
+    """
+    tables, data_version = load_fndds_tables(data_dir, use_snapshot=use_snapshot)
+    path = fndds_sqlite_path_for(data_dir)
+    tmp_path = path + f'.{os.getpid()}.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        with conn:
+            _import_table(conn, 'nutrient_values', tables['nutrient_values'], nutrient_columns=True)
+            _import_table(conn, 'portions_weights', tables['portions_weights'])
+            _import_table(conn, 'ingredient_nutrients', tables['ingredient_nutrients'])
+            for table in ('nutrient_values', 'portions_weights', 'ingredient_nutrients'):
+                conn.execute(f'CREATE INDEX "{table}_description" ON "{table}" (main_food_description_lower)')
+                conn.execute(f'CREATE INDEX "{table}_food_code" ON "{table}" (food_code)')
+            conn.execute('CREATE INDEX portions_weights_portion ON portions_weights (portion_description_lower)')
+
+            conn.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            nutrient_columns = [str(col) for col in tables['nutrient_values'].columns[NUTRIENT_COLUMN_OFFSET:]]
+            conn.executemany('INSERT INTO meta VALUES (?, ?)', [
+                ('format_version', str(FNDDS_SQLITE_FORMAT_VERSION)),
+                ('data_version', data_version),
+                ('nutrient_columns', json.dumps(nutrient_columns, ensure_ascii=False)),
+            ])
+        conn.execute('ANALYZE')
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+    logger.info(f"FNDDS SQLite 数据库已生成: {path}")
+    return path
+
+
+class SqliteNutrientRows:
+    """
+    按行号查询营养值的只读"矩阵"（支持 rows[行号] 和 rows[行号列表]，与 nutrient_matrix 相同）
+    """
+
+    def __init__(self, store, dtype='float64'):
+        self._store = store
+        self.dtype = np.dtype(dtype)
+        self.shape = (store.food_count, len(store.nutrient_columns))
+        columns = ', '.join(f'n{i}' for i in range(self.shape[1]))
+        self._sql = f'SELECT {columns} FROM nutrient_values WHERE row_id = ?'
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, rows):
+        if isinstance(rows, (list, tuple, np.ndarray)):
+            values = [self._store.fetchone(self._sql, (int(row),)) for row in rows]
+            return np.array(values, dtype=np.float64).astype(self.dtype, copy=False).reshape(len(values), self.shape[1])
+        row = self._store.fetchone(self._sql, (int(rows),))
+        if row is None:
+            raise IndexError(f"nutrient row {rows} out of range")
+        return np.array(row, dtype=np.float64).astype(self.dtype, copy=False)
+
+
+class SqliteFoodRowIndex:
+    """小写食品描述 -> 营养值表中第一个匹配的行号（带索引的查询）"""
+
+    SQL = 'SELECT MIN(row_id) FROM nutrient_values WHERE main_food_description_lower = ?'
+
+    def __init__(self, store):
+        self._store = store
+
+    def get(self, description, default=None):
+        row = self._store.fetchone(self.SQL, (description,))
+        return default if row is None or row[0] is None else row[0]
+
+    def __contains__(self, description):
+        return self.get(description) is not None
+
+
+class SqlitePortionIndex:
+    """小写食品描述 -> 份量索引条目（按需查询该食品的全部份量，再由 build_entry 汇总）"""
+
+    SQL = ('SELECT portion_description_lower, portion_weight_g FROM portions_weights'
+           ' WHERE main_food_description_lower = ? ORDER BY row_id')
+
+    def __init__(self, store, build_entry):
+        """
+        参数:
+            store (SqliteFnddsStore): 数据库
+            build_entry (callable): [(份量描述或 None, 重量), ...] -> 份量索引条目
+        """
+        self._store = store
+        self._build_entry = build_entry
+
+    def get(self, description, default=None):
+        portions = self._store.fetchall(self.SQL, (description,))
+        return self._build_entry(portions) if portions else default
+
+
+class SqliteFnddsStore:
+    """
+    只读打开的 FNDDS SQLite 数据库
+    """
+
+    def __init__(self, path):
+        """
+        参数:
+            path (str): 数据库路径
+
+        异常:
+            sqlite3.Error: 数据库无法打开
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        uri = pathlib.Path(path).absolute().as_uri() + '?mode=ro'
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        meta = dict(self._conn.execute('SELECT key, value FROM meta').fetchall())
+        self.format_version = int(meta['format_version'])
+        self.data_version = meta['data_version']
+        self.nutrient_columns = json.loads(meta['nutrient_columns'])
+        self.food_count = self._conn.execute('SELECT COUNT(*) FROM nutrient_values').fetchone()[0]
+
+    def fetchone(self, sql, parameters=()):
+        """执行查询并返回第一行"""
+        with self._lock:
+            return self._conn.execute(sql, parameters).fetchone()
+
+    def fetchall(self, sql, parameters=()):
+        """执行查询并返回全部行"""
+        with self._lock:
+            return self._conn.execute(sql, parameters).fetchall()
+
+    def food_descriptions(self):
+        """按行号顺序列出小写的食品描述"""
+        return [row[0] for row in self.fetchall(
+            'SELECT main_food_description_lower FROM nutrient_values ORDER BY row_id')]
+
+    def ingredient_descriptions(self):
+        """按首次出现的顺序列出不重复的小写食材描述"""
+        return [row[0] for row in self.fetchall(
+            'SELECT ingredient_description_lower FROM ingredient_nutrients'
+            ' GROUP BY ingredient_description_lower ORDER BY MIN(row_id)')]
+
+    def nutrient_rows(self, dtype='float64'):
+        """返回按行号查询营养值的只读矩阵"""
+        return SqliteNutrientRows(self, dtype)
+
+    def food_row_index(self):
+        """返回食品描述 -> 行号的查询对象"""
+        return SqliteFoodRowIndex(self)
+
+    def portion_index(self, build_entry):
+        """返回食品描述 -> 份量索引条目的查询对象"""
+        return SqlitePortionIndex(self, build_entry)
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+def open_fndds_sqlite(data_dir, use_snapshot=True, rebuild=False):
+    """
+    打开数据目录中的 FNDDS SQLite 数据库，不存在或数据版本已变化时重新导入
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+        use_snapshot (bool): 导入时是否通过二进制快照读取数据表
+        rebuild (bool): 是否强制重新导入
+
+    返回:
+        SqliteFnddsStore: 数据库；无法创建或打开时记录警告并返回 None
+    """
+    path = fndds_sqlite_path_for(data_dir)
+    store = None
+    if not rebuild and os.path.exists(path):
+        try:
+            store = SqliteFnddsStore(path)
+        except (sqlite3.Error, KeyError, ValueError) as e:
+            logger.warning(f"警告: FNDDS SQLite 数据库无法读取，重新导入: {e}")
+        if store is not None and (store.format_version != FNDDS_SQLITE_FORMAT_VERSION
+                                  or store.data_version != fndds_data_version(data_dir)):
+            store.close()
+            store = None
+    if store is not None:
+        return store
+
+    try:
+        build_fndds_sqlite(data_dir, use_snapshot=use_snapshot)
+        return SqliteFnddsStore(path)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"警告: 无法创建 FNDDS SQLite 数据库 {path}: {e}")
+        return None
+
+
+def main():
+    """导入数据库并打印各表行数"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    data_dir = args[0] if args else 'fixed_data'
+
+    start = time.perf_counter()
+    store = open_fndds_sqlite(data_dir, rebuild='--rebuild' in sys.argv)
+    if store is None:
+        sys.exit(1)
+    print(f"FNDDS SQLite: {store.path} (数据版本 {store.data_version}, {time.perf_counter() - start:.2f}s,"
+          f" {os.path.getsize(store.path) / 1e6:.1f} MB)")
+    for table in ('nutrient_values', 'portions_weights', 'ingredient_nutrients'):
+        print(f"  {table:22s} {store.fetchone(f'SELECT COUNT(*) FROM {table}')[0]:8d} 行")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
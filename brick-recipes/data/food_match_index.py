@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+FNDDS 食品描述的候选生成索引
+
+find_closest_food_match 的评分阶段原本对每个食材都要对全部食品描述调用
+calculate_match_score。本模块把评分拆成两部分:
+
+- 与查询无关的静态分（纯净食材、逗号惩罚、raw 等），在索引构建时为每个描述预先计算；
+- 与查询相关的动态分，只有描述中包含某个“触发串”（食材名称、单词、类别关键词、
+  oil、香料词）时才可能不为常数。
+
+评分规则使用子串判断（例如 'oil' in 'boiled'），所以倒排索引以字符三元组为键，
+查询时取各三元组倒排表的交集后再做子串校验，得到包含触发串的描述集合（按触发串缓存）。
+只有这些候选描述需要完整评分；其余描述的分数等于静态分加常数，按预先排好的静态分
+顺序即可找出最佳者。因此结果与全量扫描完全一致。
+
+候选描述的评分也不再逐对重复与查询无关的工作: 索引为每个描述预先计算特征表
+（静态分、命中的类别/子类别位掩码、香料/盐/胡椒等特殊规则的标志位），每个食材的
+查询相关部分编译为 MatchQuery，评分内循环只剩子串判断和位运算。
+
+NumpyMatchEngine 是另一种评分引擎: 用同一张特征表，对全部描述一次性计算分数向量
+（子串、前缀、后缀、关键词、类别和单词命中都是布尔数组），再用 argmax/argpartition
+选出最佳匹配，结果与逐个评分相同。
+"""
+
+import numpy as np
+
+# 子串查询缓存的最大条目数（倒排索引 / 向量化引擎的布尔数组）
+SUBSTRING_CACHE_SIZE = 8192
+CONTAINS_CACHE_SIZE = 1024
+
+# 描述特征标志位（特殊规则中与查询无关的判断）
+FLAG_OIL = 1             # 包含 'oil'
+FLAG_SPICE = 2           # 包含任一香料/调味料词
+FLAG_SALT = 4            # 等于 'salt, table' 或以 'salt,' 开头
+FLAG_CHEESE = 8          # 包含 'cheese'
+FLAG_BLACK_PEPPER = 16   # 等于 'pepper, black' 或以 'pepper, black' 开头
+FLAG_OTHER_PEPPER = 32   # 包含 bell / hot / sweet pepper
+
+
+def static_match_score(desc_lower, rules):
+    """
+    计算食品描述与查询无关的匹配分数
+
+    参数:
+        desc_lower (str): 小写的食品描述
+        rules (MatchRules): 食材匹配规则
+
+    返回:
+        int: 静态分数
+    """
+    score = 0
+
+    # 优先匹配纯净食材（不含复杂关键词）
+    if not any(indicator in desc_lower for indicator in rules.complex_indicators):
+        score += 25  # 显著提高纯净食材的分数
+
+    # 检查是否是常见纯净食材
+    for pure in rules.pure_ingredients:
+        # 如果描述以纯净食材开头，且长度不超过纯净食材的两倍，认为是纯净描述
+        if desc_lower.startswith(pure) and len(desc_lower) < len(pure) * 2.5:
+            score += 100  # 纯净食材描述加高分
+            break
+        # 如果描述完全匹配纯净食材
+        elif desc_lower == pure:
+            score += 150  # 完全匹配纯净食材加更高分
+            break
+
+    # 惩罚复杂描述（包含多个逗号的描述通常是复合食材）
+    comma_count = desc_lower.count(',')
+    if comma_count > 1:
+        score -= comma_count * 30  # 每多一个逗号减分
+
+    # 优先匹配原始食材（raw）
+    if 'raw' in desc_lower:
+        score += 15  # 提高原始食材的分数
+
+    return score
+
+
+def description_flags(desc_lower, rules):
+    """
+    计算食品描述的特征标志位
+
+    参数:
+        desc_lower (str): 小写的食品描述
+        rules (MatchRules): 食材匹配规则
+
+    返回:
+        int: FLAG_* 的组合
+    """
+    flags = 0
+    if 'oil' in desc_lower:
+        flags |= FLAG_OIL
+    if any(spice in desc_lower for spice in rules.spice_terms):
+        flags |= FLAG_SPICE
+    if desc_lower == 'salt, table' or desc_lower.startswith('salt,'):
+        flags |= FLAG_SALT
+    if 'cheese' in desc_lower:
+        flags |= FLAG_CHEESE
+    if desc_lower == 'pepper, black' or desc_lower.startswith('pepper, black'):
+        flags |= FLAG_BLACK_PEPPER
+    if 'bell pepper' in desc_lower or 'hot pepper' in desc_lower or 'sweet pepper' in desc_lower:
+        flags |= FLAG_OTHER_PEPPER
+    return flags
+
+
+def description_category_masks(desc_lower, rules):
+    """
+    计算食品描述命中的类别和子类别位掩码（描述中包含该类别/子类别的任一关键词）
+
+    返回:
+        tuple: (类别位掩码, 子类别位掩码)
+    """
+    category_mask = 0
+    subcategory_mask = 0
+    automaton = rules.keyword_automaton
+    for pattern_id in automaton.find_all(desc_lower):
+        for category, subcategory in rules.keyword_categories[automaton.patterns[pattern_id]]:
+            category_mask |= rules.category_bits[category]
+            subcategory_mask |= rules.subcategory_bits[(category, subcategory)]
+    return category_mask, subcategory_mask
+
+
+class MatchQuery:
+    """
+    编译后的单个食材评分查询（calculate_match_score 中与描述无关的部分）
+    """
+
+    __slots__ = (
+        'ingredient', 'keyword_scores', 'category_bit', 'subcategory_bit',
+        'compound', 'word_scores', 'word_count', 'oil', 'spice', 'salt', 'black_pepper',
+    )
+
+    def __init__(self, ingredient, category, subcategory, keywords, rules):
+        """
+        参数:
+            ingredient (str): 预处理后的食材名称
+            category (str): 食材主类别
+            subcategory (str): 食材子类别
+            keywords (list): 识别类别时命中的关键词
+            rules (MatchRules): 食材匹配规则
+        """
+        ingredient_lower = ingredient.lower()
+        self.ingredient = ingredient_lower
+        # 每个关键词匹配加 5*权重分，权重为关键词长度（最大为10）
+        self.keyword_scores = tuple((keyword, 5 * min(len(keyword), 10)) for keyword in keywords or ())
+
+        self.category_bit = 0
+        self.subcategory_bit = 0
+        if category and category in rules.ingredient_categories:
+            self.category_bit = rules.category_bits[category]
+            if subcategory and subcategory in rules.ingredient_categories[category]:
+                self.subcategory_bit = rules.subcategory_bits[(category, subcategory)]
+
+        # 复合食材名称中每个单词的匹配分（核心关键词权重乘3倍）
+        self.compound = ' ' in ingredient
+        word_scores = {}
+        if self.compound:
+            for word in ingredient.split():
+                if len(word) <= 2:
+                    continue
+                weight = len(word)
+                if word in rules.keyword_blob:
+                    weight *= 3
+                word_scores[word] = 5 * weight
+        self.word_scores = tuple(word_scores.items())
+        self.word_count = len(word_scores)
+
+        self.oil = 'oil' in ingredient_lower
+        self.spice = any(spice in ingredient_lower for spice in rules.spice_terms)
+        self.salt = 'salt' in ingredient_lower
+        self.black_pepper = 'pepper' in ingredient_lower and 'black' in ingredient_lower
+
+
+def match_triggers(ingredient, category, keywords, rules):
+    """
+    列出可能让 calculate_match_score 的动态分不为常数的触发串
+
+    描述中不包含任何触发串时，其动态分等于返回的常数（复合名称中没有长度大于 2 的
+    单词时，“匹配了所有单词”的 50 分对所有描述都成立）。修改 calculate_match_score 的
+    查询相关规则时必须同步修改这里。
+
+    参数:
+        ingredient (str): 预处理后的食材名称
+        category (str): 食材主类别
+        keywords (list): 识别类别时命中的关键词
+        rules (MatchRules): 食材匹配规则
+
+    返回:
+        tuple: (触发串集合, 常数分)
+    """
+    ingredient_lower = ingredient.lower()
+    triggers = {ingredient_lower}
+    constant = 0
+
+    if keywords:
+        triggers.update(keywords)
+
+    if category and category in rules.category_keywords:
+        triggers.update(rules.category_keywords[category])
+
+    if ' ' in ingredient:
+        words = [word for word in ingredient.split() if len(word) > 2]
+        if words:
+            triggers.update(words)
+        else:
+            constant += 50
+
+    if 'oil' in ingredient_lower:
+        triggers.add('oil')
+
+    if any(spice in ingredient_lower for spice in rules.spice_terms):
+        triggers.update(rules.spice_terms)
+
+    return triggers, constant
+
+
+class FoodMatchIndex:
+    """
+    FNDDS 食品描述的三元组倒排索引和静态分排序
+
+    索引在第一次查询时构建，之后所有查询共享。
+    """
+
+    def __init__(self, descriptions, rules):
+        """
+        参数:
+            descriptions (list): 小写的食品描述列表（与 food_descriptions 顺序一致）
+            rules (MatchRules): 食材匹配规则
+        """
+        self.descriptions = descriptions
+        self.rules = rules
+        self._postings = None
+        self._static_scores = None
+        self._static_order = None
+        self._category_masks = None
+        self._subcategory_masks = None
+        self._flags = None
+        self._substring_cache = {}
+
+        # 统计信息
+        self.queries = 0
+        self.candidates_scored = 0
+
+    def _ensure_built(self):
+        """构建三元组倒排表、描述特征表和按静态分排序的描述顺序"""
+        if self._postings is not None:
+            return
+
+        rules = self.rules
+        postings = {}
+        static_scores = []
+        category_masks = []
+        subcategory_masks = []
+        flags = []
+        for desc_id, desc in enumerate(self.descriptions):
+            if not isinstance(desc, str):
+                static_scores.append(float('-inf'))
+                category_masks.append(0)
+                subcategory_masks.append(0)
+                flags.append(0)
+                continue
+            for gram in {desc[i:i + 3] for i in range(len(desc) - 2)}:
+                postings.setdefault(gram, []).append(desc_id)
+            static_scores.append(static_match_score(desc, rules))
+            category_mask, subcategory_mask = description_category_masks(desc, rules)
+            category_masks.append(category_mask)
+            subcategory_masks.append(subcategory_mask)
+            flags.append(description_flags(desc, rules))
+
+        self._static_scores = static_scores
+        self._static_order = sorted(range(len(static_scores)), key=lambda i: (-static_scores[i], i))
+        self._category_masks = category_masks
+        self._subcategory_masks = subcategory_masks
+        self._flags = flags
+        self._postings = postings
+
+    def score(self, desc_id, query):
+        """
+        使用描述特征表计算匹配分数，结果与 calculate_match_score 相同
+
+        参数:
+            desc_id (int): 描述编号
+            query (MatchQuery): 编译后的评分查询
+
+        返回:
+            int: 匹配分数
+        """
+        desc_lower = self.descriptions[desc_id]
+        ingredient = query.ingredient
+        score = self._static_scores[desc_id]
+
+        # 精确匹配和子字符串匹配
+        if desc_lower == ingredient:
+            score += 200
+        elif ingredient in desc_lower:
+            score += 100
+            if desc_lower.startswith(ingredient):
+                score += 30
+            if desc_lower.endswith(ingredient):
+                score += 15
+
+        # 命中的关键词
+        for keyword, keyword_score in query.keyword_scores:
+            if keyword in desc_lower:
+                score += keyword_score
+
+        # 类别和子类别匹配（位测试）
+        if query.category_bit & self._category_masks[desc_id]:
+            score += 20
+        if query.subcategory_bit & self._subcategory_masks[desc_id]:
+            score += 30
+
+        # 复合食材名称的单词匹配
+        if query.compound:
+            matched_words = 0
+            for word, word_score in query.word_scores:
+                if word in desc_lower:
+                    matched_words += 1
+                    score += word_score
+            if matched_words >= 2:
+                score += matched_words * 10
+            if matched_words == query.word_count:
+                score += 50
+
+        # 油类和香料/调味料的特殊规则
+        flags = self._flags[desc_id]
+        if query.oil and flags & FLAG_OIL:
+            score += 50
+        if query.spice and flags & FLAG_SPICE:
+            score += 100
+            if query.salt:
+                if flags & FLAG_SALT:
+                    score += 200
+                if flags & FLAG_CHEESE:
+                    score -= 300
+            if query.black_pepper:
+                if flags & FLAG_BLACK_PEPPER:
+                    score += 200
+                if flags & FLAG_OTHER_PEPPER:
+                    score -= 300
+
+        return score
+
+    @property
+    def static_scores(self):
+        """每个描述的静态分"""
+        self._ensure_built()
+        return self._static_scores
+
+    def ids_containing(self, text):
+        """
+        返回包含子串 text 的描述编号集合
+
+        参数:
+            text (str): 子串，长度至少为 3
+
+        返回:
+            frozenset: 描述编号
+        """
+        cached = self._substring_cache.get(text)
+        if cached is not None:
+            return cached
+
+        self._ensure_built()
+        grams = {text[i:i + 3] for i in range(len(text) - 2)}
+        posting_lists = sorted((self._postings.get(gram, ()) for gram in grams), key=len)
+        candidates = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        result = frozenset(i for i in candidates if text in self.descriptions[i])
+
+        if len(self._substring_cache) >= SUBSTRING_CACHE_SIZE:
+            self._substring_cache.clear()
+        self._substring_cache[text] = result
+        return result
+
+    def candidates(self, triggers):
+        """
+        返回包含任一触发串的描述编号集合
+
+        参数:
+            triggers (iterable): 触发串
+
+        返回:
+            set: 描述编号；有触发串短于 3 个字符时返回 None（需要全量扫描）
+        """
+        if any(len(trigger) < 3 for trigger in triggers):
+            return None
+        candidate_ids = set()
+        for trigger in triggers:
+            candidate_ids.update(self.ids_containing(trigger))
+        return candidate_ids
+
+    def best_non_candidates(self, candidate_ids, constant, k, min_score):
+        """
+        按分数从高到低返回不在候选集合中的前 k 个描述
+
+        这些描述的分数等于静态分加常数，按静态分顺序遍历即可，分数相同时编号小者优先。
+
+        返回:
+            list: [(描述编号, 分数), ...]
+        """
+        self._ensure_built()
+        results = []
+        for desc_id in self._static_order:
+            score = self._static_scores[desc_id] + constant
+            if score <= min_score or len(results) >= k:
+                break
+            if desc_id not in candidate_ids:
+                results.append((desc_id, score))
+        return results
+
+
+class NumpyMatchEngine:
+    """
+    对全部食品描述向量化评分的匹配引擎
+
+    使用 FoodMatchIndex 的描述特征表，每个查询只需对描述数组做少量 NumPy 字符串运算。
+    """
+
+    def __init__(self, index):
+        """
+        参数:
+            index (FoodMatchIndex): 提供描述列表和特征表的索引
+        """
+        index._ensure_built()
+        rules = index.rules
+
+        self.descriptions = np.array(
+            [desc if isinstance(desc, str) else '' for desc in index.descriptions], dtype=str
+        )
+        # 无效描述的静态分设为极小值，保证不会被选中
+        self.static_scores = np.array(
+            [score if score != float('-inf') else -10 ** 9 for score in index._static_scores], dtype=np.int64
+        )
+        self.flags = np.array(index._flags, dtype=np.int64)
+
+        # 类别/子类别命中矩阵（描述 x 位）
+        category_count = len(rules.category_bits)
+        subcategory_count = len(rules.subcategory_bits)
+        self.category_hits = np.array(
+            [[(mask >> bit) & 1 for bit in range(category_count)] for mask in index._category_masks],
+            dtype=bool
+        ).reshape(len(self.descriptions), category_count)
+        self.subcategory_hits = np.array(
+            [[(mask >> bit) & 1 for bit in range(subcategory_count)] for mask in index._subcategory_masks],
+            dtype=bool
+        ).reshape(len(self.descriptions), subcategory_count)
+        self._contains_cache = {}
+
+    def _contains(self, text):
+        """描述中是否包含子串 text（布尔数组，按子串缓存）"""
+        hits = self._contains_cache.get(text)
+        if hits is None:
+            hits = np.char.find(self.descriptions, text) >= 0
+            if len(self._contains_cache) >= CONTAINS_CACHE_SIZE:
+                self._contains_cache.clear()
+            self._contains_cache[text] = hits
+        return hits
+
+    def scores(self, query):
+        """
+        计算全部描述的匹配分数
+
+        参数:
+            query (MatchQuery): 编译后的评分查询
+
+        返回:
+            numpy.ndarray: int64 分数向量，与 calculate_match_score 逐个计算的结果相同
+        """
+        descriptions = self.descriptions
+        ingredient = query.ingredient
+        score = self.static_scores.copy()
+
+        # 精确匹配、子字符串匹配及开头/结尾加分
+        exact = descriptions == ingredient
+        contains = self._contains(ingredient) & ~exact
+        score += np.where(exact, 200, 0)
+        score += np.where(contains, 100, 0)
+        score += np.where(contains & np.char.startswith(descriptions, ingredient), 30, 0)
+        score += np.where(contains & np.char.endswith(descriptions, ingredient), 15, 0)
+
+        # 命中的关键词
+        for keyword, keyword_score in query.keyword_scores:
+            score += np.where(self._contains(keyword), keyword_score, 0)
+
+        # 类别和子类别匹配
+        if query.category_bit:
+            score += np.where(self.category_hits[:, query.category_bit.bit_length() - 1], 20, 0)
+        if query.subcategory_bit:
+            score += np.where(self.subcategory_hits[:, query.subcategory_bit.bit_length() - 1], 30, 0)
+
+        # 复合食材名称的单词匹配
+        if query.compound:
+            matched_words = np.zeros(len(descriptions), dtype=np.int64)
+            for word, word_score in query.word_scores:
+                word_hits = self._contains(word)
+                matched_words += word_hits
+                score += np.where(word_hits, word_score, 0)
+            score += np.where(matched_words >= 2, matched_words * 10, 0)
+            score += np.where(matched_words == query.word_count, 50, 0)
+
+        # 油类和香料/调味料的特殊规则
+        flags = self.flags
+        if query.oil:
+            score += np.where(flags & FLAG_OIL, 50, 0)
+        if query.spice:
+            spice = (flags & FLAG_SPICE) != 0
+            score += np.where(spice, 100, 0)
+            if query.salt:
+                score += np.where(spice & ((flags & FLAG_SALT) != 0), 200, 0)
+                score -= np.where(spice & ((flags & FLAG_CHEESE) != 0), 300, 0)
+            if query.black_pepper:
+                score += np.where(spice & ((flags & FLAG_BLACK_PEPPER) != 0), 200, 0)
+                score -= np.where(spice & ((flags & FLAG_OTHER_PEPPER) != 0), 300, 0)
+
+        return score
+
+    @staticmethod
+    def top(score, limit, min_score=10):
+        """
+        从分数向量中选出分数超过 min_score 的前 limit 个描述
+
+        返回:
+            list: [(描述编号, 分数), ...]，按分数降序，分数相同时编号小者优先
+        """
+        if limit == 1:
+            best = int(np.argmax(score))
+            return [(best, int(score[best]))] if score[best] > min_score else []
+
+        if limit < len(score):
+            # 先取出第 limit 大的分数，再保留所有不低于它的描述，避免并列时丢失编号更小者
+            threshold = score[np.argpartition(-score, limit - 1)[limit - 1]]
+            selected = np.flatnonzero(score >= max(threshold, min_score + 1))
+        else:
+            selected = np.flatnonzero(score > min_score)
+        order = np.lexsort((selected, -score[selected]))[:limit]
+        return [(int(selected[i]), int(score[selected[i]])) for i in order]
+
+    def top_matches(self, query, limit=3):
+        """返回单个查询分数超过10的前 limit 个描述"""
+        return self.top(self.scores(query), limit)
+
+    def best_matches(self, queries):
+        """
+        批量返回每个查询的最佳描述
+
+        参数:
+            queries (list): MatchQuery 列表
+
+        返回:
+            list: 每个查询的 (描述编号, 分数)，没有分数超过10的描述时为 None
+        """
+        results = []
+        for query in queries:
+            best = self.top(self.scores(query), 1)
+            results.append(best[0] if best else None)
+        return results
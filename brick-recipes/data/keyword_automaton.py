@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Aho–Corasick 多模式匹配自动机
+
+一次扫描输入字符串即可找出所有作为子串出现的模式，等价于对每个模式执行
+`pattern in text`，但耗时只与输入长度和命中数量有关，与模式数量无关。
+"""
+
+
+class KeywordAutomaton:
+    """
+    由一组模式构建的 Aho–Corasick 自动机
+
+    模式按传入顺序编号（重复的模式只保留第一次出现的编号），
+    find_all 返回命中的模式编号，调用方可据此还原“按顺序第一个命中”的优先级。
+    """
+
+    def __init__(self, patterns):
+        """
+        参数:
+            patterns (iterable): 模式字符串，空字符串会被忽略
+        """
+        self.patterns = []
+        # 每个状态的转移表、失败链接和输出（该状态及其后缀状态命中的模式编号）
+        goto = [{}]
+        outputs = [()]
+        seen = set()
+
+        for pattern in patterns:
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            pattern_id = len(self.patterns)
+            self.patterns.append(pattern)
+
+            state = 0
+            for ch in pattern:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] = (pattern_id,)
+
+        # 按层次遍历计算失败链接，并把后缀状态的输出合并进来
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(ch, 0)
+                fail[next_state] = target if target != next_state else 0
+                if outputs[fail[next_state]]:
+                    outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def find_all(self, text):
+        """
+        返回 text 中出现的全部模式编号
+
+        参数:
+            text (str): 输入字符串
+
+        返回:
+            set: 命中的模式编号
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        hits = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                hits.update(outputs[state])
+        return hits
+
+    def contains_any(self, text):
+        """判断 text 是否包含任一模式"""
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                return True
+        return False
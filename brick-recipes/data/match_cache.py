@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+食材匹配结果缓存
+
+同一批食谱中 "salt"、"olive oil"、"garlic" 等食材名称反复出现，
+RecipeNutritionCalculator 用有界 LRU 缓存记住 (标准化名称, 规则版本) -> 食品描述，
+重复的名称不再重新走一遍匹配流程。
+
+NegativeMatchCache 记住找不到匹配的名称（"water for boiling"、中文名称、表情符号等），
+这些名称每次都要走完所有匹配层级，是最昂贵的查询；缓存有独立的容量和过期时间，
+并记录每个名称的命中次数和当初的匹配耗时，用于找出最浪费评分时间的名称。
+
+PersistentMatchCache 把匹配结果写入数据目录中的 SQLite 数据库，在批处理运行之间共享。
+条目以 FNDDS 数据版本和匹配器版本为键，数据文件或匹配规则变化后旧条目自动失效；
+数据库使用 WAL 模式，多个工作进程可以同时读写。
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger('recipe_calculator')
+
+# 默认缓存容量（条目数）
+DEFAULT_MATCH_CACHE_SIZE = 4096
+
+# 未匹配名称缓存的默认容量和过期秒数
+DEFAULT_NEGATIVE_CACHE_SIZE = 1024
+DEFAULT_NEGATIVE_CACHE_TTL = 3600.0
+
+# 持久化缓存文件名（位于数据目录内）和等待其他进程释放写锁的秒数
+MATCH_CACHE_FILE_NAME = '.match_cache.sqlite3'
+SQLITE_BUSY_TIMEOUT = 30.0
+
+
+def normalize_ingredient_key(ingredient_name):
+    """
+    返回食材名称的缓存键（与 find_closest_food_match 的标准化方式一致: 小写并去掉首尾空白）
+    """
+    return ingredient_name.lower().strip()
+
+
+class LRUMatchCache:
+    """
+    线程安全的有界 LRU 缓存，记录命中、未命中和淘汰次数
+    """
+
+    def __init__(self, maxsize=DEFAULT_MATCH_CACHE_SIZE):
+        """
+        参数:
+            maxsize (int): 最大条目数，为 0 时禁用缓存
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """
+        读取缓存，命中时把条目移到最近使用的位置
+
+        返回:
+            缓存的值，未命中时返回 default
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """写入缓存，超过容量时淘汰最久未使用的条目"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存并重置计数器"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        返回缓存统计信息
+
+        返回:
+            dict: hits, misses, evictions, size, maxsize, hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class NegativeMatchCache:
+    """
+    线程安全的未匹配名称缓存（有界，条目在 ttl 秒后过期）
+    """
+
+    def __init__(self, maxsize=DEFAULT_NEGATIVE_CACHE_SIZE, ttl=DEFAULT_NEGATIVE_CACHE_TTL, clock=time.monotonic):
+        """
+        参数:
+            maxsize (int): 最大条目数，为 0 时禁用缓存
+            ttl (float): 条目的有效秒数
+            clock (callable): 时钟函数（便于测试时替换）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        # 键 -> [过期时间, 原匹配耗时(秒), 命中次数]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """判断 key 是否为已知的未匹配名称（命中时计数）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False
+            entry[2] += 1
+            self.hits += 1
+            return True
+
+    def add(self, key, cost_seconds):
+        """
+        记录一个未匹配名称
+
+        参数:
+            key: 缓存键
+            cost_seconds (float): 这次匹配花费的秒数
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = [self._clock() + self.ttl, cost_seconds, 0]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """清空缓存并重置计数器"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def top_offenders(self, n=10):
+        """
+        按节省的匹配时间（命中次数 x 原匹配耗时）返回最常见的未匹配名称
+
+        返回:
+            list: [(键, 命中次数, 原匹配耗时秒数, 节省的秒数), ...]
+        """
+        with self._lock:
+            rows = [
+                (key, hits, cost, hits * cost)
+                for key, (_, cost, hits) in self._entries.items()
+            ]
+        rows.sort(key=lambda row: -row[3])
+        return rows[:n]
+
+    def stats(self):
+        """
+        返回缓存统计信息
+
+        返回:
+            dict: hits, misses, evictions, expirations, size, maxsize, ttl, saved_seconds
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'saved_seconds': sum(hits * cost for _, cost, hits in self._entries.values()),
+            }
+
+
+def match_cache_path_for(data_dir):
+    """返回数据目录对应的持久化匹配缓存路径"""
+    return os.path.join(data_dir, MATCH_CACHE_FILE_NAME)
+
+
+class PersistentMatchCache:
+    """
+    基于 SQLite 的持久化匹配缓存: 标准化名称 -> (食品描述, 分数, 匹配层级)
+    """
+
+    def __init__(self, path, data_version, matcher_version):
+        """
+        参数:
+            path (str): SQLite 数据库路径
+            data_version (str): FNDDS 数据版本（源文件内容哈希）
+            matcher_version (str): 匹配器版本（规则版本、匹配后端和算法版本）
+
+        异常:
+            sqlite3.Error: 数据库无法打开或初始化
+        """
+        self.path = path
+        self.data_version = data_version
+        self.matcher_version = matcher_version
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, timeout=SQLITE_BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS matches ('
+                ' ingredient TEXT NOT NULL,'
+                ' data_version TEXT NOT NULL,'
+                ' matcher_version TEXT NOT NULL,'
+                ' description TEXT NOT NULL,'
+                ' score REAL,'
+                ' tier TEXT NOT NULL,'
+                ' PRIMARY KEY (ingredient, data_version, matcher_version))'
+            )
+            # 清除其他数据版本的过期条目；不同匹配器版本（匹配后端、规则）的条目各自保留，
+            # 共用同一数据目录的计算器不会互相清空缓存
+            self._conn.execute('DELETE FROM matches WHERE data_version != ?', (data_version,))
+
+    def get(self, ingredient):
+        """
+        读取缓存的匹配结果
+
+        返回:
+            tuple: (食品描述, 分数, 匹配层级)，未命中时返回 None
+        """
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    'SELECT description, score, tier FROM matches'
+                    ' WHERE ingredient = ? AND data_version = ? AND matcher_version = ?',
+                    (ingredient, self.data_version, self.matcher_version)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"警告: 读取持久化匹配缓存失败: {e}")
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row
+
+    def put(self, ingredient, description, score, tier):
+        """写入匹配结果（已存在时覆盖）；写入失败只记录警告，不影响匹配"""
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO matches'
+                        ' (ingredient, data_version, matcher_version, description, score, tier)'
+                        ' VALUES (?, ?, ?, ?, ?, ?)',
+                        (ingredient, self.data_version, self.matcher_version, description, score, tier)
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"警告: 写入持久化匹配缓存失败: {e}")
+
+    def __len__(self):
+        with self._lock:
+            try:
+                return self._conn.execute(
+                    'SELECT COUNT(*) FROM matches WHERE data_version = ? AND matcher_version = ?',
+                    (self.data_version, self.matcher_version)
+                ).fetchone()[0]
+            except sqlite3.Error as e:
+                logger.warning(f"警告: 读取持久化匹配缓存失败: {e}")
+                return 0
+
+    def clear(self):
+        """删除当前数据版本和匹配器版本的条目并重置计数器（其他匹配器版本的条目保留）"""
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        'DELETE FROM matches WHERE data_version = ? AND matcher_version = ?',
+                        (self.data_version, self.matcher_version)
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"警告: 清空持久化匹配缓存失败: {e}")
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """
+        返回缓存统计信息
+
+        返回:
+            dict: hits, misses, size, hit_rate, path
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self),
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'path': self.path,
+        }
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+def open_persistent_match_cache(data_dir, data_version, matcher_version):
+    """
+    打开数据目录中的持久化匹配缓存，失败时记录警告并返回 None（退回到仅使用内存缓存）
+    """
+    path = match_cache_path_for(data_dir)
+    try:
+        return PersistentMatchCache(path, data_version, matcher_version)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"警告: 无法打开持久化匹配缓存 {path}: {e}")
+        return None
@@ -0,0 +1,1371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+食材匹配规则
+
+RecipeNutritionCalculator.find_closest_food_match 使用的分类关键词、同义词替换、
+精确食材数据库和类别默认匹配等规则。规则在计算器初始化时编译为不可变的 MatchRules
+对象（预先计算小写键和展平的 关键词 -> (类别, 子类别) 映射），避免每次匹配都重建。
+
+规则也可以从外部 JSON/YAML 文件加载，文件中只需包含要覆盖的部分，其余使用内置默认值:
+    python match_rules.py --dump match_rules.json   # 导出默认规则作为起点
+"""
+
+import hashlib
+import json
+import os
+import sys
+from types import MappingProxyType
+
+from keyword_automaton import KeywordAutomaton
+
+# 食材分类系统 - 更详细的食材分类字典，包含更多的关键词和子类别
+INGREDIENT_CATEGORIES = {
+    # 肉类
+    'meat': {
+        'beef': ['beef', 'steak', 'ribeye', 'sirloin', 'brisket', 'ground beef', 'minced beef', 'burger', 'chuck', 'roast beef'],
+        'pork': ['pork', 'ham', 'bacon', 'sausage', 'loin', 'chop', 'tenderloin', 'ground pork', 'minced pork', 'prosciutto', 'pancetta'],
+        'lamb': ['lamb', 'mutton', 'chop', 'rack', 'leg of lamb', 'ground lamb', 'minced lamb'],
+        'poultry': ['chicken', 'turkey', 'duck', 'goose', 'hen', 'breast', 'thigh', 'wing', 'drumstick', 'ground chicken', 'minced chicken'],
+        'game': ['venison', 'rabbit', 'quail', 'pheasant', 'boar', 'bison', 'buffalo'],
+        'processed': ['sausage', 'salami', 'pepperoni', 'jerky', 'meatball', 'meatloaf', 'deli meat', 'cured meat']
+    },
+
+    # 海鲜类
+    'seafood': {
+        'fish': ['fish', 'salmon', 'tuna', 'cod', 'haddock', 'trout', 'bass', 'tilapia', 'sardine', 'anchovy', 'mackerel', 'halibut', 'snapper', 'mahi mahi', 'swordfish'],
+        'shellfish': ['shrimp', 'prawn', 'king prawn', 'crab', 'lobster', 'crawfish', 'crayfish', 'langoustine'],
+        'mollusks': ['mussel', 'clam', 'oyster', 'scallop', 'squid', 'octopus', 'calamari'],
+        'processed': ['fish stick', 'fish finger', 'fish cake', 'surimi', 'canned tuna', 'canned salmon', 'smoked salmon', 'smoked fish']
+    },
+
+    # 蔬菜类
+    'vegetables': {
+        'root': ['carrot', 'potato', 'sweet potato', 'yam', 'turnip', 'radish', 'beet', 'beetroot', 'parsnip', 'rutabaga', 'celeriac'],
+        'bulb': ['onion', 'garlic', 'shallot', 'leek', 'spring onion', 'scallion', 'green onion', 'fennel'],
+        'leafy_greens': ['lettuce', 'spinach', 'kale', 'chard', 'arugula', 'rocket', 'collard', 'cabbage', 'bok choy', 'watercress', 'endive', 'radicchio'],
+        'cruciferous': ['broccoli', 'cauliflower', 'brussels sprout', 'cabbage', 'kale', 'bok choy', 'kohlrabi'],
+        'nightshade': ['tomato', 'pepper', 'eggplant', 'aubergine', 'potato', 'chili', 'capsicum', 'bell pepper'],
+        'squash': ['zucchini', 'courgette', 'pumpkin', 'butternut squash', 'acorn squash', 'spaghetti squash', 'gourd'],
+        'legume': ['bean', 'pea', 'lentil', 'chickpea', 'garbanzo', 'kidney bean', 'black bean', 'pinto bean', 'navy bean', 'edamame', 'soybean'],
+        'other': ['cucumber', 'celery', 'asparagus', 'artichoke', 'corn', 'maize', 'mushroom', 'avocado']
+    },
+
+    # 水果类
+    'fruits': {
+        'berry': ['strawberry', 'blueberry', 'raspberry', 'blackberry', 'cranberry', 'boysenberry', 'gooseberry', 'elderberry', 'mulberry', 'acai berry'],
+        'citrus': ['orange', 'lemon', 'lime', 'grapefruit', 'tangerine', 'mandarin', 'clementine', 'kumquat', 'citron', 'yuzu'],
+        'tropical': ['banana', 'pineapple', 'mango', 'papaya', 'kiwi', 'guava', 'passion fruit', 'lychee', 'dragon fruit', 'star fruit', 'durian'],
+        'stone': ['peach', 'plum', 'nectarine', 'apricot', 'cherry', 'date', 'olive'],
+        'pome': ['apple', 'pear', 'quince'],
+        'melon': ['watermelon', 'cantaloupe', 'honeydew', 'melon'],
+        'dried': ['raisin', 'prune', 'date', 'fig', 'apricot', 'cranberry', 'currant']
+    },
+
+    # 乳制品类
+    'dairy': {
+        'milk': ['milk', 'whole milk', 'skim milk', 'low-fat milk', 'buttermilk', 'condensed milk', 'evaporated milk'],
+        'cheese': ['cheese', 'cheddar', 'mozzarella', 'parmesan', 'feta', 'gouda', 'brie', 'camembert', 'blue cheese', 'goat cheese', 'ricotta', 'cottage cheese', 'cream cheese'],
+        'cream': ['cream', 'heavy cream', 'whipping cream', 'sour cream', 'creme fraiche', 'half and half'],
+        'yogurt': ['yogurt', 'greek yogurt', 'plain yogurt', 'flavored yogurt', 'kefir'],
+        'butter': ['butter', 'unsalted butter', 'salted butter', 'clarified butter', 'ghee']
+    },
+
+    # 谷类和面粉类
+    'grains': {
+        'rice': ['rice', 'white rice', 'brown rice', 'jasmine rice', 'basmati rice', 'arborio rice', 'wild rice', 'rice flour'],
+        'wheat': ['wheat', 'flour', 'all-purpose flour', 'bread flour', 'cake flour', 'whole wheat flour', 'semolina', 'bulgur', 'couscous'],
+        'corn': ['corn', 'maize', 'cornmeal', 'polenta', 'grits', 'corn flour', 'cornstarch'],
+        'oats': ['oat', 'oatmeal', 'rolled oats', 'steel-cut oats', 'quick oats'],
+        'other_grains': ['barley', 'quinoa', 'millet', 'rye', 'buckwheat', 'amaranth', 'spelt', 'farro', 'teff'],
+        'pasta': ['pasta', 'spaghetti', 'penne', 'fettuccine', 'linguine', 'macaroni', 'noodle', 'egg noodle', 'rice noodle'],
+        'bread': ['bread', 'white bread', 'whole wheat bread', 'rye bread', 'sourdough', 'baguette', 'roll', 'bun', 'pita', 'naan', 'tortilla']
+    },
+
+    # 调味料和香料
+    'seasonings': {
+        'herbs': ['basil', 'oregano', 'thyme', 'rosemary', 'parsley', 'cilantro', 'coriander', 'mint', 'dill', 'sage', 'tarragon', 'chive', 'bay leaf', 'marjoram'],
+        'spices': ['pepper', 'black pepper', 'white pepper', 'red pepper', 'chili', 'paprika', 'cumin', 'coriander', 'cinnamon', 'nutmeg', 'clove', 'allspice', 'cardamom', 'turmeric', 'ginger', 'saffron', 'fennel seed', 'star anise'],
+        'salt': ['salt', 'sea salt', 'kosher salt', 'table salt', 'fleur de sel', 'himalayan salt'],
+        'condiments': ['ketchup', 'mustard', 'mayonnaise', 'soy sauce', 'hot sauce', 'worcestershire sauce', 'fish sauce', 'vinegar', 'balsamic vinegar', 'miso', 'tahini']
+    },
+
+    # 油脂类
+    'oils': {
+        'vegetable_oils': ['oil', 'olive oil', 'vegetable oil', 'canola oil', 'sunflower oil', 'corn oil', 'peanut oil', 'sesame oil', 'coconut oil', 'avocado oil', 'grapeseed oil', 'walnut oil'],
+        'animal_fats': ['butter', 'lard', 'tallow', 'schmaltz', 'duck fat', 'bacon fat', 'ghee'],
+        'other_fats': ['margarine', 'shortening', 'cooking spray']
+    },
+
+    # 坐果和种子类
+    'nuts_seeds': {
+        'nuts': ['nut', 'almond', 'walnut', 'pecan', 'cashew', 'pistachio', 'hazelnut', 'macadamia', 'brazil nut', 'pine nut', 'chestnut'],
+        'seeds': ['seed', 'sesame', 'sunflower', 'pumpkin', 'flax', 'chia', 'hemp', 'poppy seed'],
+        'nut_products': ['peanut butter', 'almond butter', 'tahini', 'nut milk', 'almond milk', 'cashew milk']
+    },
+
+    # 饮料类
+    'beverages': {
+        'alcoholic': ['wine', 'red wine', 'white wine', 'beer', 'vodka', 'rum', 'whiskey', 'gin', 'tequila', 'brandy', 'liqueur', 'champagne', 'prosecco'],
+        'non_alcoholic': ['water', 'juice', 'orange juice', 'apple juice', 'soda', 'coffee', 'tea', 'milk', 'smoothie', 'lemonade', 'iced tea']
+    },
+
+    # 糖类和甜味料
+    'sweeteners': {
+        'sugars': ['sugar', 'white sugar', 'brown sugar', 'powdered sugar', 'confectioners sugar', 'cane sugar', 'raw sugar', 'demerara sugar'],
+        'syrups': ['syrup', 'maple syrup', 'corn syrup', 'golden syrup', 'agave syrup', 'honey', 'molasses', 'date syrup'],
+        'artificial': ['stevia', 'sweetener', 'aspartame', 'sucralose', 'saccharin']
+    }
+}
+
+# 更全面的食材替换字典，包含常见食材的标准名称和同义词
+INGREDIENT_REPLACEMENTS = {
+    # 海鲜类
+    'prawn': 'shrimp',
+    'prawns': 'shrimp',
+    'king prawn': 'shrimp',
+    'king prawns': 'shrimp',
+    'tiger prawn': 'shrimp',
+    'tiger prawns': 'shrimp',
+    'jumbo prawn': 'shrimp',
+    'jumbo prawns': 'shrimp',
+    'raw prawn': 'shrimp, raw',
+    'raw prawns': 'shrimp, raw',
+    'raw king prawn': 'shrimp, raw',
+    'raw king prawns': 'shrimp, raw',
+    'cooked prawn': 'shrimp, cooked',
+    'cooked prawns': 'shrimp, cooked',
+    'shelled prawn': 'shrimp',
+    'shelled prawns': 'shrimp',
+    'peeled prawn': 'shrimp',
+    'peeled prawns': 'shrimp',
+    'shrimp': 'shrimp',
+    'shrimps': 'shrimp',
+    'raw shrimp': 'shrimp, raw',
+    'cooked shrimp': 'shrimp, cooked',
+    'peeled shrimp': 'shrimp',
+    'deveined shrimp': 'shrimp',
+
+    # 乳制品
+    'feta': 'cheese, feta',
+    'feta cheese': 'cheese, feta',
+    'cubed feta': 'cheese, feta',
+    'cubed feta cheese': 'cheese, feta',
+    'crumbled feta': 'cheese, feta',
+    'crumbled feta cheese': 'cheese, feta',
+    'greek feta': 'cheese, feta',
+    'greek feta cheese': 'cheese, feta',
+
+    'cheddar': 'cheese, cheddar',
+    'cheddar cheese': 'cheese, cheddar',
+    'grated cheddar': 'cheese, cheddar',
+    'grated cheddar cheese': 'cheese, cheddar',
+    'shredded cheddar': 'cheese, cheddar',
+    'shredded cheddar cheese': 'cheese, cheddar',
+    'mild cheddar': 'cheese, cheddar',
+    'sharp cheddar': 'cheese, cheddar',
+    'mature cheddar': 'cheese, cheddar',
+
+    'mozzarella': 'cheese, mozzarella',
+    'mozzarella cheese': 'cheese, mozzarella',
+    'fresh mozzarella': 'cheese, mozzarella',
+    'fresh mozzarella cheese': 'cheese, mozzarella',
+    'grated mozzarella': 'cheese, mozzarella',
+    'grated mozzarella cheese': 'cheese, mozzarella',
+    'shredded mozzarella': 'cheese, mozzarella',
+    'shredded mozzarella cheese': 'cheese, mozzarella',
+    'buffalo mozzarella': 'cheese, mozzarella',
+
+    'parmesan': 'cheese, parmesan',
+    'parmesan cheese': 'cheese, parmesan',
+    'grated parmesan': 'cheese, parmesan, dry grated',
+    'grated parmesan cheese': 'cheese, parmesan, dry grated',
+    'shredded parmesan': 'cheese, parmesan',
+    'shredded parmesan cheese': 'cheese, parmesan',
+    'parmigiano': 'cheese, parmesan',
+    'parmigiano reggiano': 'cheese, parmesan',
+    'parmigiano-reggiano': 'cheese, parmesan',
+
+    'ricotta': 'cheese, ricotta',
+    'ricotta cheese': 'cheese, ricotta',
+    'whole milk ricotta': 'cheese, ricotta',
+    'part-skim ricotta': 'cheese, ricotta',
+
+    'cottage cheese': 'cheese, cottage',
+    'cream cheese': 'cheese, cream',
+    'goat cheese': 'cheese, goat',
+    'blue cheese': 'cheese, blue',
+    'gorgonzola': 'cheese, blue',
+    'roquefort': 'cheese, blue',
+    'stilton': 'cheese, blue',
+    'brie': 'cheese, brie',
+    'camembert': 'cheese, camembert',
+    'gouda': 'cheese, gouda',
+    'swiss cheese': 'cheese, swiss',
+    'gruyere': 'cheese, gruyere',
+    'manchego': 'cheese, manchego',
+
+    # 油脂
+    'oil': 'oil, vegetable',
+    'olive oil': 'oil, olive',
+    'extra virgin olive oil': 'oil, olive',
+    'evoo': 'oil, olive',
+    'virgin olive oil': 'oil, olive',
+    'light olive oil': 'oil, olive',
+    'vegetable oil': 'oil, vegetable',
+    'canola oil': 'oil, canola',
+    'rapeseed oil': 'oil, canola',
+    'sunflower oil': 'oil, sunflower',
+    'corn oil': 'oil, corn',
+    'peanut oil': 'oil, peanut',
+    'groundnut oil': 'oil, peanut',
+    'sesame oil': 'oil, sesame',
+    'toasted sesame oil': 'oil, sesame',
+    'coconut oil': 'oil, coconut',
+    'avocado oil': 'oil, avocado',
+    'grapeseed oil': 'oil, grapeseed',
+    'walnut oil': 'oil, walnut',
+    'flaxseed oil': 'oil, flaxseed',
+    'palm oil': 'oil, palm',
+
+    'butter': 'butter, regular, salted',
+    'unsalted butter': 'butter, regular, unsalted',
+    'salted butter': 'butter, regular, salted',
+    'clarified butter': 'butter, clarified',
+    'ghee': 'butter, clarified',
+    'margarine': 'margarine, regular',
+    'lard': 'lard',
+    'shortening': 'shortening, vegetable',
+    'vegetable shortening': 'shortening, vegetable',
+
+    # 蔬菜
+    'garlic': 'garlic, raw',
+    'minced garlic': 'garlic, raw',
+    'crushed garlic': 'garlic, raw',
+    'chopped garlic': 'garlic, raw',
+    'garlic clove': 'garlic, raw',
+    'garlic cloves': 'garlic, raw',
+    'fresh garlic': 'garlic, raw',
+    'garlic powder': 'garlic powder',
+
+    'onion': 'onion, raw',
+    'onions': 'onion, raw',
+    'chopped onion': 'onion, raw',
+    'diced onion': 'onion, raw',
+    'sliced onion': 'onion, raw',
+    'minced onion': 'onion, raw',
+    'white onion': 'onion, raw',
+    'yellow onion': 'onion, raw',
+    'red onion': 'onion, raw',
+    'sweet onion': 'onion, raw',
+    'spring onion': 'onions, green, raw',
+    'spring onions': 'onions, green, raw',
+    'green onion': 'onions, green, raw',
+    'green onions': 'onions, green, raw',
+    'scallion': 'onions, green, raw',
+    'scallions': 'onions, green, raw',
+    'shallot': 'shallot, raw',
+    'shallots': 'shallot, raw',
+
+    'tomato': 'tomato, raw',
+    'tomatoes': 'tomato, raw',
+    'chopped tomato': 'tomato, raw',
+    'chopped tomatoes': 'tomato, raw',
+    'diced tomato': 'tomato, raw',
+    'diced tomatoes': 'tomato, raw',
+    'sliced tomato': 'tomato, raw',
+    'sliced tomatoes': 'tomato, raw',
+    'cherry tomato': 'tomato, raw',
+    'cherry tomatoes': 'tomato, raw',
+    'plum tomato': 'tomato, raw',
+    'plum tomatoes': 'tomato, raw',
+    'roma tomato': 'tomato, raw',
+    'roma tomatoes': 'tomato, raw',
+    'sun-dried tomato': 'tomato, sun-dried',
+    'sun-dried tomatoes': 'tomato, sun-dried',
+    'canned tomato': 'tomatoes, canned',
+    'canned tomatoes': 'tomatoes, canned',
+    'tinned tomato': 'tomatoes, canned',
+    'tinned tomatoes': 'tomatoes, canned',
+    'tomato paste': 'tomato paste',
+    'tomato puree': 'tomato puree',
+    'tomato sauce': 'tomato sauce',
+    'passata': 'tomato puree',
+
+    'carrot': 'carrot, raw',
+    'carrots': 'carrot, raw',
+    'chopped carrot': 'carrot, raw',
+    'chopped carrots': 'carrot, raw',
+    'diced carrot': 'carrot, raw',
+    'diced carrots': 'carrot, raw',
+    'sliced carrot': 'carrot, raw',
+    'sliced carrots': 'carrot, raw',
+    'grated carrot': 'carrot, raw',
+    'grated carrots': 'carrot, raw',
+    'shredded carrot': 'carrot, raw',
+    'shredded carrots': 'carrot, raw',
+    'baby carrot': 'carrot, raw',
+    'baby carrots': 'carrot, raw',
+
+    'bell pepper': 'pepper, sweet, raw',
+    'bell peppers': 'pepper, sweet, raw',
+    'red bell pepper': 'pepper, sweet, red, raw',
+    'red bell peppers': 'pepper, sweet, red, raw',
+    'green bell pepper': 'pepper, sweet, green, raw',
+    'green bell peppers': 'pepper, sweet, green, raw',
+    'yellow bell pepper': 'pepper, sweet, yellow, raw',
+    'yellow bell peppers': 'pepper, sweet, yellow, raw',
+    'orange bell pepper': 'pepper, sweet, orange, raw',
+    'orange bell peppers': 'pepper, sweet, orange, raw',
+    'capsicum': 'pepper, sweet, raw',
+    'red capsicum': 'pepper, sweet, red, raw',
+    'green capsicum': 'pepper, sweet, green, raw',
+    'yellow capsicum': 'pepper, sweet, yellow, raw',
+    'orange capsicum': 'pepper, sweet, orange, raw',
+
+    # 香草和调味料
+    'parsley': 'parsley, raw',
+    'fresh parsley': 'parsley, raw',
+    'chopped parsley': 'parsley, raw',
+    'freshly chopped parsley': 'parsley, raw',
+    'flat-leaf parsley': 'parsley, raw',
+    'curly parsley': 'parsley, raw',
+    'italian parsley': 'parsley, raw',
+    'dried parsley': 'parsley, dried',
+
+    'basil': 'basil, raw',
+    'fresh basil': 'basil, raw',
+    'chopped basil': 'basil, raw',
+    'fresh chopped basil': 'basil, raw',
+    'basil leaves': 'basil, raw',
+    'fresh basil leaves': 'basil, raw',
+    'dried basil': 'basil, dried',
+    'thai basil': 'basil, raw',
+    'holy basil': 'basil, raw',
+
+    'cilantro': 'cilantro, raw',
+    'fresh cilantro': 'cilantro, raw',
+    'chopped cilantro': 'cilantro, raw',
+    'fresh chopped cilantro': 'cilantro, raw',
+    'cilantro leaves': 'cilantro, raw',
+    'coriander leaves': 'cilantro, raw',
+    'fresh coriander': 'cilantro, raw',
+    'chinese parsley': 'cilantro, raw',
+
+    'rosemary': 'rosemary, raw',
+    'fresh rosemary': 'rosemary, raw',
+    'dried rosemary': 'rosemary, dried',
+    'rosemary sprig': 'rosemary, raw',
+    'rosemary sprigs': 'rosemary, raw',
+
+    'thyme': 'thyme, raw',
+    'fresh thyme': 'thyme, raw',
+    'dried thyme': 'thyme, dried',
+    'thyme sprig': 'thyme, raw',
+    'thyme sprigs': 'thyme, raw',
+
+    'oregano': 'oregano, raw',
+    'fresh oregano': 'oregano, raw',
+    'dried oregano': 'oregano, dried',
+
+    'mint': 'mint, raw',
+    'fresh mint': 'mint, raw',
+    'dried mint': 'mint, dried',
+    'mint leaves': 'mint, raw',
+    'peppermint': 'mint, raw',
+    'spearmint': 'mint, raw',
+
+    'sage': 'sage, raw',
+    'fresh sage': 'sage, raw',
+    'dried sage': 'sage, dried',
+    'sage leaves': 'sage, raw',
+
+    'dill': 'dill, raw',
+    'fresh dill': 'dill, raw',
+    'dried dill': 'dill, dried',
+    'dill weed': 'dill, raw',
+
+    'chive': 'chives, raw',
+    'chives': 'chives, raw',
+    'fresh chives': 'chives, raw',
+    'dried chives': 'chives, dried',
+    'chopped chives': 'chives, raw',
+
+    'bay leaf': 'bay leaf, dried',
+    'bay leaves': 'bay leaf, dried',
+    'dried bay leaf': 'bay leaf, dried',
+    'dried bay leaves': 'bay leaf, dried',
+
+    'black pepper': 'pepper, black',
+    'ground black pepper': 'pepper, black',
+    'freshly ground black pepper': 'pepper, black',
+    'cracked black pepper': 'pepper, black',
+    'white pepper': 'pepper, white',
+    'ground white pepper': 'pepper, white',
+
+    'salt': 'salt, table',
+    'table salt': 'salt, table',
+    'sea salt': 'salt, sea',
+    'kosher salt': 'salt, kosher',
+    'fleur de sel': 'salt, sea',
+    'himalayan salt': 'salt, himalayan',
+    'pink salt': 'salt, himalayan',
+
+    # 饮料
+    'white wine': 'wine, white',
+    'dry white wine': 'wine, white',
+    'sweet white wine': 'wine, white',
+    'red wine': 'wine, red',
+    'dry red wine': 'wine, red',
+    'full-bodied red wine': 'wine, red',
+    'rose wine': 'wine, rose',
+    'rosé wine': 'wine, rose',
+    'sparkling wine': 'wine, sparkling',
+    'champagne': 'wine, champagne',
+    'prosecco': 'wine, prosecco',
+    'cooking wine': 'wine, cooking',
+    'rice wine': 'wine, rice',
+    'mirin': 'wine, rice',
+    'sake': 'wine, rice',
+    'sherry': 'wine, sherry',
+    'port': 'wine, port',
+    'marsala': 'wine, marsala',
+    'madeira': 'wine, madeira',
+    'vermouth': 'wine, vermouth',
+
+    # 特殊处理
+    'extra virgin': '',
+    'virgin': '',
+    'freshly': '',
+    'fresh': '',
+    'frozen': '',
+    'dried': '',
+    'canned': '',
+    'tinned': '',
+    'jarred': '',
+    'bottled': '',
+    'packaged': '',
+    'whole': '',
+    'half': '',
+    'quarter': '',
+    'sliced': '',
+    'diced': '',
+    'chopped': '',
+    'minced': '',
+    'grated': '',
+    'shredded': '',
+    'julienned': '',
+    'cubed': '',
+    'crushed': '',
+    'mashed': '',
+    'pureed': '',
+    'ground': '',
+    'crumbled': '',
+    'torn': '',
+    'peeled': '',
+    'skinless': '',
+    'boneless': '',
+    'skin-on': '',
+    'bone-in': '',
+    'large': '',
+    'medium': '',
+    'small': '',
+    'baby': '',
+    'mini': '',
+    'giant': '',
+    'ripe': '',
+    'unripe': '',
+    'overripe': '',
+    'green': '',
+    'red': '',
+    'yellow': '',
+    'orange': '',
+    'purple': '',
+    'black': '',
+    'white': '',
+    'brown': '',
+    'pink': '',
+    'golden': '',
+    'dark': '',
+    'light': '',
+    'mild': '',
+    'hot': '',
+    'spicy': '',
+    'sweet': '',
+    'sour': '',
+    'bitter': '',
+    'salty': '',
+    'savory': '',
+    'umami': '',
+    'organic': '',
+    'free-range': '',
+    'grass-fed': '',
+    'wild-caught': '',
+    'farm-raised': '',
+    'homemade': '',
+    'store-bought': '',
+    'commercial': '',
+    'premium': '',
+    'quality': '',
+    'lean': '',
+    'fatty': '',
+    'fat-free': '',
+    'low-fat': '',
+    'full-fat': '',
+    'reduced-fat': '',
+    'unsalted': '',
+    'salted': '',
+    'sweetened': '',
+    'unsweetened': '',
+    'roasted': '',
+    'toasted': '',
+    'grilled': '',
+    'broiled': '',
+    'baked': '',
+    'fried': '',
+    'deep-fried': '',
+    'pan-fried': '',
+    'stir-fried': '',
+    'sauteed': '',
+    'sautéed': '',
+    'boiled': '',
+    'steamed': '',
+    'poached': '',
+    'braised': '',
+    'stewed': '',
+    'smoked': '',
+    'cured': '',
+    'pickled': '',
+    'fermented': '',
+    'marinated': '',
+    'seasoned': '',
+    'spiced': '',
+    'flavored': '',
+    'infused': '',
+    'stuffed': '',
+    'filled': '',
+    'topped': '',
+    'garnished': '',
+    'mixed': '',
+    'blended': '',
+    'combined': '',
+    'prepared': '',
+    'ready-to-use': '',
+    'ready-to-eat': '',
+    'instant': '',
+    'quick': '',
+    'slow': '',
+    'overnight': '',
+    'day-old': ''
+}
+
+# 精确食材数据库
+PRECISE_INGREDIENT_DB = {
+    # 调味料和香料
+    'salt': 'salt, table',
+    'sea salt': 'salt, table',
+    'table salt': 'salt, table',
+    'kosher salt': 'salt, table',
+    'himalayan salt': 'salt, table',
+    'fleur de sel': 'salt, table',
+    'salt flakes': 'salt, table',
+    'pinch of salt': 'salt, table',
+    'pinch of sea salt': 'salt, table',
+    'black pepper': 'pepper, black',
+    'ground black pepper': 'pepper, black',
+    'freshly ground black pepper': 'pepper, black',
+    'cracked black pepper': 'pepper, black',
+    'ground pepper': 'pepper, black',
+    'pepper': 'pepper, black',  # 默认将pepper视为黑胡椒
+    'white pepper': 'pepper, white',
+    'ground white pepper': 'pepper, white',
+
+    # 乳制品
+    'butter': 'butter, nfs',
+    'unsalted butter': 'butter, nfs',
+    'salted butter': 'butter, regular, salted',
+    'clarified butter': 'butter, nfs',
+    'ghee': 'butter, nfs',
+    'heavy cream': 'cream, heavy',
+    'whipping cream': 'cream, heavy',
+    'sour cream': 'cream, sour',
+    'cream': 'cream, nfs',
+
+    # 其他常见食材
+    'olive oil': 'olive oil',
+    'extra virgin olive oil': 'olive oil',
+    'garlic': 'garlic, raw',
+    'minced garlic': 'garlic, raw',
+    'onion': 'onions, raw',
+    'chopped onion': 'onions, raw',
+    'tomato': 'tomatoes, raw',
+    'chopped tomatoes': 'tomatoes, raw',
+    'parsley': 'parsley, raw',
+    'fresh parsley': 'parsley, raw',
+    'chopped parsley': 'parsley, raw',
+    'freshly chopped parsley': 'parsley, raw'
+}
+
+# 其他常见食材匹配
+OTHER_COMMON_INGREDIENTS = {
+
+    # 肉类
+    'beef': 'beef, ground, raw',
+    'steak': 'beef, steak, raw',
+    'ground beef': 'beef, ground, raw',
+    'minced beef': 'beef, ground, raw',
+    'pork': 'pork, raw',
+    'ham': 'ham, sliced, regular',
+    'bacon': 'pork bacon, raw',
+    'chicken': 'chicken, meat only, raw',
+    'chicken breast': 'chicken, breast, meat only, raw',
+    'turkey': 'turkey, meat only, raw',
+    'lamb': 'lamb, raw',
+    'duck': 'duck, meat only, raw',
+    'sausage': 'sausage, pork, raw',
+
+    # 海鲜类
+    'fish': 'fish, nfs',
+    'salmon': 'salmon, raw',
+    'tuna': 'tuna, raw',
+    'cod': 'cod, raw',
+    'shrimp': 'shrimp, raw',
+    'prawn': 'shrimp, nfs',
+    'king prawn': 'shrimp, nfs',
+    'crab': 'crab, raw',
+    'lobster': 'lobster, raw',
+    'mussel': 'mussel, raw',
+    'clam': 'clam, raw',
+    'oyster': 'oyster, raw',
+    'scallop': 'scallop, raw',
+    'squid': 'squid, raw',
+    'octopus': 'octopus, raw',
+
+    # 蔬菜类
+    'vegetable': 'vegetables, nfs',
+    'carrot': 'carrot, raw',
+    'potato': 'potato, raw',
+    'onion': 'onion, raw',
+    'chopped onion': 'onion, raw',
+    'garlic': 'garlic, raw',
+    'minced garlic': 'garlic, raw',
+    'tomato': 'tomato, raw',
+    'chopped tomatoes': 'tomato, raw',
+    'pepper': 'pepper, sweet, raw',
+    'bell pepper': 'pepper, sweet, raw',
+    'lettuce': 'lettuce, raw',
+    'spinach': 'spinach, raw',
+    'broccoli': 'broccoli, raw',
+    'cauliflower': 'cauliflower, raw',
+    'cabbage': 'cabbage, raw',
+    'zucchini': 'zucchini, raw',
+    'eggplant': 'eggplant, raw',
+    'cucumber': 'cucumber, with peel, raw',
+    'celery': 'celery, raw',
+    'corn': 'corn, raw',
+    'pea': 'peas, green, raw',
+    'bean': 'beans, string, green, raw',
+    'lentil': 'lentils, raw',
+
+    # 水果类
+    'fruit': 'fruit, nfs',
+    'apple': 'apple, raw',
+    'banana': 'banana, raw',
+    'orange': 'orange, raw',
+    'lemon': 'lemon, raw',
+    'lime': 'lime, raw',
+    'grape': 'grapes, raw',
+    'strawberry': 'strawberries, raw',
+    'blueberry': 'blueberries, raw',
+    'raspberry': 'raspberries, raw',
+    'blackberry': 'blackberries, raw',
+    'melon': 'melon, nfs, raw',
+    'watermelon': 'watermelon, raw',
+    'pineapple': 'pineapple, raw',
+    'mango': 'mango, raw',
+    'peach': 'peach, raw',
+    'pear': 'pear, raw',
+    'plum': 'plum, raw',
+    'cherry': 'cherries, raw',
+    'kiwi': 'kiwi fruit, raw',
+
+    # 乳制品类
+    'milk': 'milk, nfs',
+    'cheese': 'cheese, nfs',
+    'feta': 'cheese, feta',
+    'feta cheese': 'cheese, feta',
+    'cubed feta cheese': 'cheese, feta',
+    'cheddar': 'cheese, cheddar',
+    'mozzarella': 'cheese, mozzarella',
+    'parmesan': 'cheese, parmesan',
+    'yogurt': 'yogurt, plain',
+    'cream': 'cream, nfs',
+    'heavy cream': 'cream, heavy',
+    'whipping cream': 'cream, heavy',
+    'sour cream': 'cream, sour',
+    'butter': 'butter, nfs',
+    'unsalted butter': 'butter, nfs',
+    'salted butter': 'butter, regular, salted',
+    'clarified butter': 'butter, nfs',
+    'ghee': 'butter, nfs',
+
+    # 谷类和面粉类
+    'flour': 'flour, wheat, white, all purpose',
+    'rice': 'rice, white, nfs',
+    'pasta': 'pasta, nfs',
+    'bread': 'bread, white',
+    'oat': 'oats, raw',
+    'cereal': 'cereal, nfs',
+    'wheat': 'wheat, nfs',
+    'barley': 'barley, raw',
+    'quinoa': 'quinoa, raw',
+    'noodle': 'noodles, egg, raw',
+
+    # 调味料和香料
+    'salt': 'salt, table',
+    'pepper': 'pepper, black',
+    'spice': 'spices, nfs',
+    'herb': 'herbs, nfs',
+    'basil': 'basil, fresh',
+    'oregano': 'oregano, fresh',
+    'thyme': 'thyme, fresh',
+    'rosemary': 'rosemary, fresh',
+    'parsley': 'parsley, fresh',
+    'freshly chopped parsley': 'parsley, raw',
+    'cilantro': 'cilantro, fresh',
+    'coriander': 'coriander, fresh',
+    'cumin': 'cumin, ground',
+    'paprika': 'paprika',
+    'cinnamon': 'cinnamon, ground',
+    'nutmeg': 'nutmeg, ground',
+    'ginger': 'ginger root, raw',
+    'turmeric': 'turmeric, ground',
+
+    # 油脂类
+    'oil': 'oil, vegetable, nfs',
+    'olive oil': 'oil, olive',
+    'vegetable oil': 'oil, vegetable, nfs',
+    'canola oil': 'oil, canola',
+    'sunflower oil': 'oil, sunflower',
+    'sesame oil': 'oil, sesame',
+    'coconut oil': 'oil, coconut',
+    'margarine': 'margarine, regular',
+    'lard': 'lard',
+    'shortening': 'shortening, vegetable',
+
+    # 坐果和种子类
+    'nut': 'nuts, nfs',
+    'seed': 'seeds, nfs',
+    'almond': 'almonds, raw',
+    'walnut': 'walnuts, raw',
+    'pecan': 'pecans, raw',
+    'cashew': 'cashews, raw',
+    'pistachio': 'pistachios, raw',
+    'peanut': 'peanuts, raw',
+    'sesame': 'sesame seeds, raw',
+    'sunflower': 'sunflower seeds, raw',
+    'pumpkin': 'pumpkin seeds, raw',
+    'flax': 'flaxseeds, raw',
+    'chia': 'chia seeds, raw',
+
+    # 饮料类
+    'water': 'water, nfs',
+    'juice': 'juice, nfs',
+    'soda': 'soft drink, nfs',
+    'coffee': 'coffee, brewed',
+    'tea': 'tea, brewed',
+    'wine': 'wine, nfs',
+    'white wine': 'wine, white',
+    'red wine': 'wine, red',
+    'beer': 'beer, nfs',
+    'milk': 'milk, nfs',
+    'smoothie': 'smoothie, nfs',
+
+    # 糖类和甜味料
+    'sugar': 'sugar, white, granulated or lump',
+    'honey': 'honey',
+    'syrup': 'syrup, nfs',
+    'maple': 'syrup, maple',
+    'molasses': 'molasses',
+    'agave': 'agave syrup',
+    'stevia': 'sweetener, stevia',
+    'sweetener': 'sweetener, nfs'
+}
+
+# 根据类别进行默认匹配
+DEFAULT_MATCHES = {
+    'meat': {
+        'beef': 'beef, ground, raw',
+        'pork': 'pork, raw',
+        'lamb': 'lamb, raw',
+        'poultry': 'chicken, meat only, raw',
+        'game': 'venison, raw',
+        'processed': 'sausage, pork, raw',
+        'default': 'meat, nfs'
+    },
+    'seafood': {
+        'fish': 'fish, nfs',
+        'shellfish': 'shrimp, nfs',
+        'mollusks': 'mussel, raw',
+        'processed': 'fish, processed, nfs',
+        'default': 'seafood, nfs'
+    },
+    'vegetables': {
+        'root': 'potato, raw',
+        'bulb': 'onion, raw',
+        'leafy_greens': 'spinach, raw',
+        'cruciferous': 'broccoli, raw',
+        'nightshade': 'tomato, raw',
+        'squash': 'zucchini, raw',
+        'legume': 'beans, string, green, raw',
+        'other': 'vegetables, nfs',
+        'default': 'vegetables, nfs'
+    },
+    'fruits': {
+        'berry': 'strawberries, raw',
+        'citrus': 'orange, raw',
+        'tropical': 'banana, raw',
+        'stone': 'peach, raw',
+        'pome': 'apple, raw',
+        'melon': 'watermelon, raw',
+        'dried': 'raisins',
+        'default': 'fruit, nfs'
+    },
+    'dairy': {
+        'milk': 'milk, nfs',
+        'cheese': 'cheese, nfs',
+        'cream': 'cream, nfs',
+        'yogurt': 'yogurt, plain',
+        'butter': 'butter, regular, salted',
+        'default': 'dairy, nfs'
+    },
+    'grains': {
+        'rice': 'rice, white, nfs',
+        'wheat': 'flour, wheat, white, all purpose',
+        'corn': 'corn, raw',
+        'oats': 'oats, raw',
+        'other_grains': 'grains, nfs',
+        'pasta': 'pasta, nfs',
+        'bread': 'bread, white',
+        'default': 'grains, nfs'
+    },
+    'seasonings': {
+        'herbs': 'herbs, nfs',
+        'spices': 'spices, nfs',
+        'salt': 'salt, table',
+        'condiments': 'condiments, nfs',
+        'default': 'seasonings, nfs'
+    },
+    'oils': {
+        'vegetable_oils': 'oil, vegetable, nfs',
+        'animal_fats': 'butter, regular, salted',
+        'other_fats': 'shortening, vegetable',
+        'default': 'oil, nfs'
+    },
+    'nuts_seeds': {
+        'nuts': 'nuts, nfs',
+        'seeds': 'seeds, nfs',
+        'nut_products': 'peanut butter',
+        'default': 'nuts, nfs'
+    },
+    'beverages': {
+        'alcoholic': 'wine, nfs',
+        'non_alcoholic': 'water, nfs',
+        'default': 'beverages, nfs'
+    },
+    'sweeteners': {
+        'sugars': 'sugar, white, granulated or lump',
+        'syrups': 'syrup, nfs',
+        'artificial': 'sweetener, nfs',
+        'default': 'sugar, nfs'
+    }
+}
+
+# 常见纯净食材列表（基于常见食材）
+PURE_INGREDIENTS = [
+    'butter', 'garlic', 'olive oil', 'onion', 'salt', 'eggs', 'water', 'sugar', 
+    'potatoes', 'milk', 'flour', 'pepper', 'carrots', 'parsley', 'vegetable oil', 
+    'soy sauce', 'rice', 'tomatoes', 'chicken', 'beef', 'pork', 'lamb', 'fish', 'salmon',
+    'tuna', 'shrimp', 'cheese', 'cream', 'yogurt', 'lemon', 'lime', 'orange', 'apple',
+    'banana', 'berries', 'strawberry', 'blueberry', 'raspberry', 'nuts', 'almonds',
+    'walnuts', 'peanuts', 'beans', 'pasta', 'noodles', 'bread', 'wine', 'vinegar',
+    'honey', 'maple syrup', 'chocolate', 'vanilla', 'cinnamon', 'cumin', 'basil',
+    'oregano', 'thyme', 'rosemary', 'ginger', 'mushrooms', 'avocado', 'cucumber',
+    'lettuce', 'spinach', 'kale', 'cabbage', 'broccoli', 'cauliflower', 'corn',
+    'peas', 'bell pepper', 'chili', 'bacon', 'ham', 'sausage', 'tofu', 'quinoa'
+]
+
+# 纯净食材判断中表示复合食材的关键词
+COMPLEX_INDICATORS = ['mixed', 'with', 'and', 'in', 'or', 'plus', 'topped', 'stuffed', 'filled', 'coated', 'breaded', 'battered']
+
+# 香料和调味料关键词
+SPICE_TERMS = ['pepper', 'salt', 'spice', 'herb', 'seasoning']
+
+# 默认规则（规则文件中缺少的部分使用这些值）
+# 中文食材名称 -> 英文食材名称（B 站食谱），英文名称再经替换表、精确食材数据库等规则解析为 FNDDS 描述；
+# 查找时取名称中出现的最长键，如 "去皮鸡胸肉" 通过 "鸡胸肉" 解析
+CHINESE_INGREDIENT_NAMES = {
+    # 肉类
+    '鸡肉': 'chicken',
+    '鸡': 'chicken',
+    '鸡胸肉': 'chicken breast',
+    '鸡胸': 'chicken breast',
+    '鸡腿': 'chicken thigh',
+    '鸡腿肉': 'chicken thigh',
+    '鸡翅': 'chicken wing',
+    '鸡翅中': 'chicken wing',
+    '鸡爪': 'chicken feet',
+    '猪肉': 'pork',
+    '猪': 'pork',
+    '五花肉': 'pork belly',
+    '里脊': 'pork tenderloin',
+    '猪里脊': 'pork tenderloin',
+    '排骨': 'pork ribs',
+    '猪排骨': 'pork ribs',
+    '肉末': 'ground pork',
+    '猪肉末': 'ground pork',
+    '培根': 'bacon',
+    '火腿': 'ham',
+    '香肠': 'sausage',
+    '腊肠': 'sausage',
+    '牛肉': 'beef',
+    '牛': 'beef',
+    '牛腩': 'beef brisket',
+    '牛排': 'steak',
+    '肥牛': 'beef',
+    '牛肉末': 'ground beef',
+    '羊肉': 'lamb',
+    '羊排': 'lamb chop',
+    '鸭肉': 'duck',
+    '鸭': 'duck',
+
+    # 海鲜类
+    '虾': 'shrimp',
+    '虾仁': 'shrimp',
+    '大虾': 'shrimp',
+    '鱼': 'fish',
+    '鱼肉': 'fish',
+    '三文鱼': 'salmon',
+    '鲈鱼': 'bass',
+    '鳕鱼': 'cod',
+    '金枪鱼': 'tuna',
+    '带鱼': 'fish',
+    '鱿鱼': 'squid',
+    '螃蟹': 'crab',
+    '蟹': 'crab',
+    '扇贝': 'scallop',
+    '蛤蜊': 'clam',
+    '生蚝': 'oyster',
+    '青口': 'mussel',
+
+    # 蛋奶豆制品
+    '鸡蛋': 'egg',
+    '蛋': 'egg',
+    '蛋黄': 'egg yolk',
+    '蛋清': 'egg white',
+    '蛋白': 'egg white',
+    '牛奶': 'milk',
+    '纯牛奶': 'milk',
+    '淡奶油': 'heavy cream',
+    '奶油': 'cream',
+    '黄油': 'butter',
+    '芝士': 'cheese',
+    '奶酪': 'cheese',
+    '马苏里拉': 'mozzarella',
+    '酸奶': 'yogurt',
+    '豆腐': 'tofu',
+    '嫩豆腐': 'tofu',
+    '老豆腐': 'tofu',
+    '豆浆': 'soy milk',
+
+    # 蔬菜类
+    '大蒜': 'garlic',
+    '蒜': 'garlic',
+    '蒜末': 'garlic',
+    '蒜瓣': 'garlic',
+    '蒜苗': 'leek',
+    '姜': 'ginger',
+    '生姜': 'ginger',
+    '姜片': 'ginger',
+    '姜末': 'ginger',
+    '葱': 'green onion',
+    '小葱': 'green onion',
+    '葱花': 'green onion',
+    '大葱': 'leek',
+    '香葱': 'green onion',
+    '洋葱': 'onion',
+    '番茄': 'tomato',
+    '西红柿': 'tomato',
+    '土豆': 'potato',
+    '马铃薯': 'potato',
+    '红薯': 'sweet potato',
+    '胡萝卜': 'carrot',
+    '白萝卜': 'radish',
+    '萝卜': 'radish',
+    '黄瓜': 'cucumber',
+    '茄子': 'eggplant',
+    '青椒': 'green pepper',
+    '彩椒': 'bell pepper',
+    '红椒': 'red pepper',
+    '辣椒': 'chili',
+    '小米辣': 'chili',
+    '干辣椒': 'chili',
+    '白菜': 'cabbage',
+    '大白菜': 'cabbage',
+    '卷心菜': 'cabbage',
+    '包菜': 'cabbage',
+    '青菜': 'bok choy',
+    '上海青': 'bok choy',
+    '小白菜': 'bok choy',
+    '菠菜': 'spinach',
+    '生菜': 'lettuce',
+    '西兰花': 'broccoli',
+    '西蓝花': 'broccoli',
+    '花菜': 'cauliflower',
+    '菜花': 'cauliflower',
+    '芹菜': 'celery',
+    '韭菜': 'chives',
+    '香菜': 'cilantro',
+    '蘑菇': 'mushroom',
+    '香菇': 'shiitake mushroom',
+    '金针菇': 'enoki mushroom',
+    '杏鲍菇': 'mushroom',
+    '木耳': 'mushroom',
+    '玉米': 'corn',
+    '豌豆': 'pea',
+    '毛豆': 'edamame',
+    '豆角': 'green bean',
+    '四季豆': 'green bean',
+    '南瓜': 'pumpkin',
+    '西葫芦': 'zucchini',
+    '莲藕': 'lotus root',
+    '山药': 'yam',
+    '芦笋': 'asparagus',
+    '牛油果': 'avocado',
+
+    # 水果类
+    '苹果': 'apple',
+    '香蕉': 'banana',
+    '柠檬': 'lemon',
+    '橙子': 'orange',
+    '草莓': 'strawberry',
+    '蓝莓': 'blueberry',
+    '芒果': 'mango',
+    '菠萝': 'pineapple',
+
+    # 主食和粉类
+    '大米': 'rice',
+    '米饭': 'rice',
+    '米': 'rice',
+    '糯米': 'glutinous rice',
+    '面粉': 'flour',
+    '中筋面粉': 'all-purpose flour',
+    '低筋面粉': 'cake flour',
+    '高筋面粉': 'bread flour',
+    '面条': 'noodle',
+    '挂面': 'noodle',
+    '米粉': 'rice noodle',
+    '意面': 'pasta',
+    '面包': 'bread',
+    '吐司': 'bread',
+    '淀粉': 'cornstarch',
+    '玉米淀粉': 'cornstarch',
+    '生粉': 'cornstarch',
+    '燕麦': 'oats',
+
+    # 调味料
+    '盐': 'salt',
+    '食盐': 'salt',
+    '白糖': 'sugar',
+    '糖': 'sugar',
+    '冰糖': 'sugar',
+    '红糖': 'brown sugar',
+    '细砂糖': 'sugar',
+    '糖粉': 'powdered sugar',
+    '蜂蜜': 'honey',
+    '生抽': 'soy sauce',
+    '老抽': 'soy sauce',
+    '酱油': 'soy sauce',
+    '蚝油': 'oyster sauce',
+    '醋': 'vinegar',
+    '陈醋': 'vinegar',
+    '香醋': 'vinegar',
+    '米醋': 'rice vinegar',
+    '料酒': 'rice wine',
+    '黄酒': 'rice wine',
+    '胡椒粉': 'ground pepper',
+    '白胡椒粉': 'white pepper',
+    '黑胡椒': 'black pepper',
+    '黑胡椒粉': 'black pepper',
+    '花椒': 'sichuan pepper',
+    '八角': 'star anise',
+    '桂皮': 'cinnamon',
+    '孜然': 'cumin',
+    '辣椒粉': 'chili powder',
+    '辣椒面': 'chili powder',
+    '豆瓣酱': 'bean paste',
+    '郫县豆瓣酱': 'bean paste',
+    '番茄酱': 'ketchup',
+    '鱼露': 'fish sauce',
+    '鸡精': 'chicken bouillon',
+    '味精': 'monosodium glutamate',
+    '芝麻': 'sesame seeds',
+    '白芝麻': 'sesame seeds',
+    '芝麻酱': 'tahini',
+    '花生': 'peanuts',
+    '花生米': 'peanuts',
+
+    # 油类
+    '食用油': 'vegetable oil',
+    '油': 'vegetable oil',
+    '植物油': 'vegetable oil',
+    '花生油': 'peanut oil',
+    '橄榄油': 'olive oil',
+    '香油': 'sesame oil',
+    '芝麻油': 'sesame oil',
+    '猪油': 'lard',
+
+    # 饮品和其他
+    '水': 'water',
+    '清水': 'water',
+    '高汤': 'broth',
+    '鸡汤': 'chicken broth',
+    '啤酒': 'beer',
+    '红酒': 'red wine',
+}
+
+DEFAULT_RULES = {
+    'ingredient_categories': INGREDIENT_CATEGORIES,
+    'ingredient_replacements': INGREDIENT_REPLACEMENTS,
+    'precise_ingredient_db': PRECISE_INGREDIENT_DB,
+    'other_common_ingredients': OTHER_COMMON_INGREDIENTS,
+    'default_matches': DEFAULT_MATCHES,
+    'pure_ingredients': PURE_INGREDIENTS,
+    'complex_indicators': COMPLEX_INDICATORS,
+    'spice_terms': SPICE_TERMS,
+    'chinese_ingredient_names': CHINESE_INGREDIENT_NAMES,
+}
+
+
+class MatchRules:
+    """
+    编译后的不可变食材匹配规则
+
+    属性:
+        ingredient_categories: 类别 -> 子类别 -> 关键词元组（只读映射）
+        category_keywords: 类别 -> 该类别全部关键词（按子类别顺序展平）
+        keyword_categories: 关键词 -> ((类别, 子类别), ...)，按规则顺序
+        keyword_blob: 所有关键词以换行连接的字符串，用于判断单词是否为某个关键词的子串
+        keyword_automaton: 全部分类关键词的 Aho–Corasick 自动机（编号与 keyword_categories 顺序一致）
+        keyword_ranks: 关键词 -> ((类别序号, 类别内序号, 子类别序号, 子类别内序号), ...)
+        category_bits / subcategory_bits: 类别 / (类别, 子类别) -> 位掩码中的位
+        ingredient_replacements: 同义词替换表；replacement_items 为其有序键值对
+        replacement_automaton: 替换表键的 Aho–Corasick 自动机（编号与 replacement_items 顺序一致）
+        precise_items: 精确食材数据库的 (小写键, 键 + ' ', ' ' + 键, 值) 元组
+        precise_ingredient_db / other_common_ingredients / default_matches: 只读映射
+        pure_ingredients / complex_indicators / spice_terms: 元组
+        chinese_ingredient_names: 中文食材名称 -> 英文食材名称；chinese_name_automaton 为其键的自动机
+        version: 规则内容的哈希，用于缓存失效
+    """
+
+    def __init__(self, rules):
+        """
+        参数:
+            rules (dict): 规则字典，结构与 DEFAULT_RULES 相同
+        """
+        categories = {
+            category: MappingProxyType({
+                subcategory: tuple(keywords) for subcategory, keywords in subcategories.items()
+            })
+            for category, subcategories in rules['ingredient_categories'].items()
+        }
+        category_keywords = {
+            category: tuple(keyword for keywords in subcategories.values() for keyword in keywords)
+            for category, subcategories in categories.items()
+        }
+        keyword_categories = {}
+        keyword_ranks = {}
+        for category_rank, (category, subcategories) in enumerate(categories.items()):
+            flat_rank = 0
+            for subcategory_rank, (subcategory, keywords) in enumerate(subcategories.items()):
+                for position, keyword in enumerate(keywords):
+                    keyword_categories.setdefault(keyword, []).append((category, subcategory))
+                    keyword_ranks.setdefault(keyword, []).append(
+                        (category_rank, flat_rank, subcategory_rank, position)
+                    )
+                    flat_rank += 1
+
+        precise_db = dict(rules['precise_ingredient_db'])
+        replacements = dict(rules['ingredient_replacements'])
+
+        set_attr = super().__setattr__
+        set_attr('ingredient_categories', MappingProxyType(categories))
+        set_attr('category_keywords', MappingProxyType(category_keywords))
+        set_attr('keyword_categories', MappingProxyType(
+            {keyword: tuple(pairs) for keyword, pairs in keyword_categories.items()}
+        ))
+        set_attr('keyword_blob', '\n'.join(keyword_categories))
+        set_attr('keyword_automaton', KeywordAutomaton(keyword_categories))
+        set_attr('keyword_ranks', MappingProxyType(
+            {keyword: tuple(ranks) for keyword, ranks in keyword_ranks.items()}
+        ))
+        set_attr('category_bits', MappingProxyType(
+            {category: 1 << rank for rank, category in enumerate(categories)}
+        ))
+        set_attr('subcategory_bits', MappingProxyType({
+            pair: 1 << rank for rank, pair in enumerate(
+                (category, subcategory)
+                for category, subcategories in categories.items()
+                for subcategory in subcategories
+            )
+        }))
+        set_attr('ingredient_replacements', MappingProxyType(replacements))
+        set_attr('replacement_items', tuple(replacements.items()))
+        set_attr('replacement_automaton', KeywordAutomaton(replacements))
+        set_attr('_category_names', tuple(
+            (category, tuple(subcategories)) for category, subcategories in categories.items()
+        ))
+        set_attr('precise_ingredient_db', MappingProxyType(precise_db))
+        set_attr('precise_items', tuple(
+            (key.lower(), key.lower() + ' ', ' ' + key.lower(), value) for key, value in precise_db.items()
+        ))
+        set_attr('other_common_ingredients', MappingProxyType(dict(rules['other_common_ingredients'])))
+        set_attr('default_matches', MappingProxyType({
+            category: MappingProxyType(dict(matches)) for category, matches in rules['default_matches'].items()
+        }))
+        set_attr('pure_ingredients', tuple(rules['pure_ingredients']))
+        set_attr('complex_indicators', tuple(rules['complex_indicators']))
+        set_attr('spice_terms', tuple(rules['spice_terms']))
+        chinese_names = dict(rules['chinese_ingredient_names'])
+        set_attr('chinese_ingredient_names', MappingProxyType(chinese_names))
+        set_attr('chinese_name_automaton', KeywordAutomaton(chinese_names))
+        set_attr('version', hashlib.sha256(
+            json.dumps(rules, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()[:16])
+
+    def find_replacement(self, text):
+        """
+        查找 text 中出现的第一个替换键（按替换表顺序）
+
+        参数:
+            text (str): 食材名称
+
+        返回:
+            tuple: (键, 替换值)，没有命中时返回 None
+        """
+        automaton = self.replacement_automaton
+        hits = automaton.find_all(text)
+        if not hits:
+            return None
+        key = automaton.patterns[min(hits)]
+        return key, self.ingredient_replacements[key]
+
+    def find_chinese_name(self, text):
+        """
+        查找 text 中出现的最长中文食材名称（长度相同时取表中靠前的键）
+
+        参数:
+            text (str): 食材名称
+
+        返回:
+            tuple: (中文名称, 英文名称)，没有命中时返回 None
+        """
+        automaton = self.chinese_name_automaton
+        hits = automaton.find_all(text)
+        if not hits:
+            return None
+        key = automaton.patterns[min(hits, key=lambda pattern_id: (-len(automaton.patterns[pattern_id]), pattern_id))]
+        return key, self.chinese_ingredient_names[key]
+
+    def detect_category(self, text):
+        """
+        一次扫描确定食材的主类别和子类别
+
+        优先级与逐个类别、逐个关键词检查相同: 主类别取规则中第一个有关键词命中的类别，
+        关键词取该类别展平列表中第一个命中的关键词；子类别取该类别中第一个有关键词命中的
+        子类别及其第一个命中的关键词。
+
+        参数:
+            text (str): 食材名称
+
+        返回:
+            tuple: (主类别, 子类别, 命中的关键词列表)，未识别时为 (None, None, [])
+        """
+        automaton = self.keyword_automaton
+        hits = automaton.find_all(text)
+        if not hits:
+            return None, None, []
+
+        ranked = [
+            (rank, automaton.patterns[pattern_id])
+            for pattern_id in hits
+            for rank in self.keyword_ranks[automaton.patterns[pattern_id]]
+        ]
+        (category_rank, _, _, _), main_keyword = min(ranked)
+        (_, _, subcategory_rank, _), sub_keyword = min(
+            ranked, key=lambda item: (item[0][0] != category_rank, item[0][2], item[0][3])
+        )
+
+        category, subcategory_names = self._category_names[category_rank]
+        subcategory = subcategory_names[subcategory_rank]
+        keywords = [main_keyword]
+        if sub_keyword != main_keyword:
+            keywords.append(sub_keyword)
+        return category, subcategory, keywords
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MatchRules is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("MatchRules is immutable")
+
+    def __repr__(self):
+        return f"MatchRules(version={self.version!r}, keywords={len(self.keyword_categories)})"
+
+
+def _read_rules_file(path):
+    """读取 JSON 或 YAML 规则文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("读取 YAML 规则文件需要安装 PyYAML") from e
+            return yaml.safe_load(f) or {}
+        return json.load(f)
+
+
+def load_match_rules(path=None):
+    """
+    加载并编译食材匹配规则
+
+    参数:
+        path (str): JSON/YAML 规则文件路径；为 None 时使用内置默认规则。
+            文件中缺少的部分使用默认值。
+
+    返回:
+        MatchRules: 编译后的规则
+    """
+    rules = dict(DEFAULT_RULES)
+    if path is not None:
+        overrides = _read_rules_file(path)
+        unknown = set(overrides) - set(DEFAULT_RULES)
+        if unknown:
+            raise ValueError(f"未知的规则部分: {', '.join(sorted(unknown))}")
+        rules.update(overrides)
+    return MatchRules(rules)
+
+
+def main():
+    """导出默认规则: python match_rules.py --dump match_rules.json"""
+    if len(sys.argv) == 3 and sys.argv[1] == '--dump':
+        with open(sys.argv[2], 'w', encoding='utf-8') as f:
+            json.dump(DEFAULT_RULES, f, ensure_ascii=False, indent=2)
+        print(f"默认匹配规则已导出到 {sys.argv[2]}")
+    else:
+        print("用法: python match_rules.py --dump <rules.json>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+食材计量字符串解析
+
+原 parse_measurement 每次调用都重新构建单位映射字典，依次尝试多个正则，再逐个扫描
+多词短语。MeasurementParser 把单位别名、描述性短语和数量词表构建一次:
+数字开头的计量由一个预编译的正则识别，短语由一次 Aho–Corasick 扫描查找，
+解析结果按输入字符串缓存。
+
+原实现能解析的字符串结果保持不变；原实现退回默认值 (1, 'piece') 的字符串，
+再尝试识别 Unicode 分数（"½ cup"、"1½ cups"）、范围（"2-3"、"2 to 3 cups"）、
+倍数（"2 x 400g tins"）、带小数的括号重量（"1 (1.5kg) bag"）和 "175g/6oz" 这类写法，
+以及 B 站食谱中的中文数量和单位（"200克"、"2勺"、"半个"、"一小把"、"500毫升"）。
+"""
+
+import logging
+import re
+import unicodedata
+
+from keyword_automaton import KeywordAutomaton
+from match_cache import LRUMatchCache
+
+logger = logging.getLogger('recipe_calculator')
+
+# 默认缓存容量（不同计量字符串的数量）
+DEFAULT_MEASUREMENT_CACHE_SIZE = 4096
+
+# 无法解析时的默认值
+DEFAULT_MEASUREMENT = (1.0, 'piece')
+
+# 常见计量单位映射到标准单位（顺序即原实现的匹配优先级）
+UNIT_ALIASES = {
+    # 重量单位
+    'g': 'g',
+    'gram': 'g',
+    'grams': 'g',
+    'kg': 'kg',
+    'kilogram': 'kg',
+    'kilograms': 'kg',
+    'oz': 'oz',
+    'ounce': 'oz',
+    'ounces': 'oz',
+    'lb': 'lb',
+    'pound': 'lb',
+    'pounds': 'lb',
+
+    # 体积单位
+    'ml': 'ml',
+    'milliliter': 'ml',
+    'milliliters': 'ml',
+    'millilitre': 'ml',
+    'millilitres': 'ml',
+    'l': 'l',
+    'liter': 'l',
+    'liters': 'l',
+    'litre': 'l',
+    'litres': 'l',
+    'cup': 'cup',
+    'cups': 'cup',
+    'tbsp': 'tbsp',
+    'tablespoon': 'tbsp',
+    'tablespoons': 'tbsp',
+    'tsp': 'tsp',
+    'teaspoon': 'tsp',
+    'teaspoons': 'tsp',
+    'fl oz': 'fl_oz',
+    'fluid ounce': 'fl_oz',
+    'fluid ounces': 'fl_oz',
+    'pint': 'pint',
+    'pints': 'pint',
+    'quart': 'quart',
+    'quarts': 'quart',
+    'gallon': 'gallon',
+    'gallons': 'gallon',
+
+    # 其他常见计量
+    'pinch': 'pinch',
+    'pinches': 'pinch',
+    'dash': 'dash',
+    'dashes': 'dash',
+    'tin': 'tin',
+    'tins': 'tin',
+    'can': 'can',
+    'cans': 'can',
+    'pack': 'pack',
+    'packs': 'pack',
+    'package': 'pack',
+    'packages': 'pack',
+    'bunch': 'bunch',
+    'bunches': 'bunch',
+    'clove': 'clove',
+    'cloves': 'clove',
+    'slice': 'slice',
+    'slices': 'slice',
+    'piece': 'piece',
+    'pieces': 'piece',
+    'whole': 'whole',
+    'wholes': 'whole',
+    'sprig': 'sprig',
+    'sprigs': 'sprig',
+    'handful': 'handful',
+    'handfuls': 'handful',
+
+    # 特殊表达方式
+    'to taste': 'to_taste',
+    'to serve': 'to_serve',
+    'as needed': 'as_needed',
+    'as required': 'as_needed',
+    'optional': 'optional',
+    'zest of 1': 'zest',
+    'zest of one': 'zest',
+    'juice of 1': 'juice',
+    'juice of one': 'juice',
+    'chopped': 'chopped',
+    'minced': 'minced',
+    'crushed': 'crushed',
+    'beaten': 'beaten',
+    'to cover': 'to_cover',
+    'for garnish': 'garnish',
+    'for decoration': 'garnish',
+    'for serving': 'to_serve',
+    'a few': 'few',
+    'a little': 'little',
+    'a handful': 'handful',
+    'a pinch': 'pinch',
+    'a dash': 'dash',
+    'one': 'one',
+    'two': 'two',
+    'three': 'three',
+    'four': 'four',
+    'five': 'five',
+    'ear': 'ear',
+    'stalk': 'stalk',
+    'stalks': 'stalk',
+    'leaf': 'leaf',
+    'leaves': 'leaf',
+    'pod': 'pod',
+    'pods': 'pod',
+    'knob': 'knob',
+}
+
+# 描述性短语（不区分大小写的子串匹配）
+DESCRIPTIVE_PHRASES = {
+    'to taste': 'to_taste',
+    'to serve': 'to_serve',
+    'as needed': 'as_needed',
+    'as required': 'as_needed',
+    'optional': 'optional',
+    'for garnish': 'garnish',
+    'for decoration': 'garnish',
+    'for serving': 'to_serve',
+    'adjust to taste': 'to_taste',
+    'zest of 1': 'zest',
+    'zest of one': 'zest',
+    'juice of 1': 'juice',
+    'juice of one': 'juice',
+    'juice of 1/2': 'juice',
+    'juice of half': 'juice',
+    'zest and juice of 1': 'zest_and_juice',
+    'tied in a knot': 'piece',
+    'one sheet': 'sheet',
+    'one ear': 'ear',
+    '适量': 'as_needed',  # 适量 (中文“适量”)
+    '少许': 'little',     # 少许 (中文“少许”)
+    '少量': 'little',     # 少量 (中文“少量”)
+}
+
+# 开头的数量词
+QUANTITY_WORDS = {
+    'one': 1.0,
+    'two': 2.0,
+    'three': 3.0,
+    'four': 4.0,
+    'five': 5.0,
+    'a few': 3.0,
+    'few': 3.0,
+    'a couple': 2.0,
+    'couple': 2.0,
+    'several': 4.0,
+}
+
+# 支持的 Unicode 分数字符
+VULGAR_FRACTIONS = {ch: unicodedata.numeric(ch) for ch in '½⅓⅔¼¾⅕⅖⅗⅘⅙⅚⅛⅜⅝⅞'}
+
+# 中文单位 -> (标准单位, 换算系数)；"大勺/小勺" 等按常见用法区分汤匙和茶匙
+CHINESE_UNITS = {
+    '千克': ('kg', 1.0),
+    '公斤': ('kg', 1.0),
+    '克': ('g', 1.0),
+    '斤': ('g', 500.0),
+    '毫升': ('ml', 1.0),
+    '升': ('l', 1.0),
+    '汤匙': ('tbsp', 1.0),
+    '大勺': ('tbsp', 1.0),
+    '大匙': ('tbsp', 1.0),
+    '勺': ('tbsp', 1.0),
+    '茶匙': ('tsp', 1.0),
+    '小勺': ('tsp', 1.0),
+    '小匙': ('tsp', 1.0),
+    '杯': ('cup', 1.0),
+    '撮': ('pinch', 1.0),
+    '个': ('piece', 1.0),
+    '只': ('piece', 1.0),
+    '颗': ('piece', 1.0),
+    '块': ('piece', 1.0),
+    '根': ('stalk', 1.0),
+    '片': ('slice', 1.0),
+    '瓣': ('clove', 1.0),
+    '把': ('handful', 1.0),
+}
+
+# 中文数字
+CHINESE_NUMERALS = {
+    '零': 0, '一': 1, '二': 2, '两': 2, '三': 3, '四': 4,
+    '五': 5, '六': 6, '七': 7, '八': 8, '九': 9,
+}
+
+_NUMBER = r'\d+(?:\.\d+)?(?:/\d+)?'
+
+# 原实现的括号重量（"1 (400g) tin"）
+_BRACKET_RE = re.compile(r'\((\d+)\s*([a-z]+)\)')
+
+# 原实现的数字加单位: "500g" 或 "2 1/2 cups"
+_QUANTITY_RE = re.compile(r'''
+    ^(?:
+        (?P<number>\d+)\s*(?P<direct>[a-z]+)
+      | (?P<amount>[\d\s./]+)\s+(?P<rest>.+)
+    )$
+''', re.X)
+
+# 扩展语法: 范围、倍数、Unicode 分数和普通数字，后接可选的单位
+_EXTENDED_RE = re.compile(rf'''
+    ^(?:
+        (?P<low>{_NUMBER})\s*(?:-|–|to)\s*(?P<high>{_NUMBER})
+      | (?P<count>{_NUMBER})\s*[x×]\s*(?P<size>{_NUMBER})
+      | (?P<whole>\d+)?\s*(?P<vulgar>[{''.join(VULGAR_FRACTIONS)}])
+      | (?P<plain>{_NUMBER})
+    )
+    \s*(?:(?P<unit>[a-z]+)(?:\s+(?P<unit2>[a-z]+))?)?
+''', re.X)
+
+# 扩展语法: 括号中的重量，允许小数和斜杠后的换算（"(1.5kg)"、"(400g/14oz)"）
+_EXTENDED_BRACKET_RE = re.compile(r'\(\s*(\d+(?:\.\d+)?)\s*([a-z]+)')
+
+# 中文数量: 阿拉伯或中文数字（可带范围），"半"，可选的 "大/小" 修饰和中文单位，如 "一个半"
+_CHINESE_NUMBER = rf'(?:{_NUMBER}|[零一二两三四五六七八九]?十[一二三四五六七八九]?|[零一二两三四五六七八九])'
+_CHINESE_RE = re.compile(rf'''
+    ^(?:(?P<low>{_CHINESE_NUMBER})\s*(?:-|~|～|到|至)\s*)?
+    (?P<number>{_CHINESE_NUMBER})?
+    (?P<half>半)?
+    \s*(?:[大小](?![勺匙]))?
+    (?P<unit>{'|'.join(sorted(CHINESE_UNITS, key=len, reverse=True))})?
+    (?P<unit_half>半)?
+''', re.X)
+
+_QUANTITY_WORD_RE = re.compile('^(?:' + '|'.join(re.escape(word) for word in QUANTITY_WORDS) + ')')
+
+
+def parse_chinese_number(text):
+    """
+    解析阿拉伯数字或不超过九十九的中文数字，如 "200"、"1.5"、"两"、"十二"
+
+    返回:
+        float: 数量，无法解析时返回 None
+    """
+    if text[0] not in CHINESE_NUMERALS and text[0] != '十':
+        return parse_number(text)
+    if '十' not in text:
+        return float(CHINESE_NUMERALS[text])
+    tens, _, ones = text.partition('十')
+    return float(CHINESE_NUMERALS[tens] * 10 if tens else 10) + CHINESE_NUMERALS.get(ones, 0)
+
+
+def parse_number(text):
+    """
+    按原实现的规则解析数量: 整数、小数、分数 "1/2" 或带分数 "2 1/2"
+
+    返回:
+        float: 数量，无法解析时返回 None
+    """
+    try:
+        if '/' not in text:
+            return float(text)
+        if ' ' in text:
+            whole, fraction = text.split(' ', 1)
+            num, denom = fraction.split('/')
+            return float(whole) + float(num) / float(denom)
+        num, denom = text.split('/')
+        return float(num) / float(denom)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+class MeasurementParser:
+    """
+    预编译的计量字符串解析器，结果按输入字符串缓存
+    """
+
+    def __init__(self, cache_size=DEFAULT_MEASUREMENT_CACHE_SIZE):
+        """
+        参数:
+            cache_size (int): 解析结果缓存的最大条目数，为 0 时禁用缓存
+        """
+        self.cache = LRUMatchCache(cache_size)
+
+        # 多词单位别名在前、描述性短语在后，编号最小的命中与原实现的逐个检查顺序一致
+        phrases = [(alias, unit) for alias, unit in UNIT_ALIASES.items() if ' ' in alias]
+        phrases += [(phrase.lower(), unit) for phrase, unit in DESCRIPTIVE_PHRASES.items()]
+        self.phrase_automaton = KeywordAutomaton(phrase for phrase, _ in phrases)
+        first_units = {}
+        for phrase, unit in phrases:
+            first_units.setdefault(phrase, unit)
+        self._phrase_units = [first_units[phrase] for phrase in self.phrase_automaton.patterns]
+
+        # 单位别名的优先级（用于 "one cup" 之类的前缀匹配）
+        self._aliases = list(UNIT_ALIASES)
+        self._alias_ranks = {alias: rank for rank, alias in enumerate(self._aliases)}
+        self._max_alias_length = max(len(alias) for alias in UNIT_ALIASES)
+
+    def parse(self, measurement_str):
+        """
+        解析食材的计量单位和数量
+
+        参数:
+            measurement_str (str): 计量字符串，如"500g", "1 (400g) tin", "pinch"
+
+        返回:
+            tuple: (数量, 单位)
+        """
+        if not measurement_str or not isinstance(measurement_str, str) or measurement_str.strip() == '':
+            return DEFAULT_MEASUREMENT
+
+        cached = self.cache.get(measurement_str)
+        if cached is not None:
+            return cached
+        result = self._parse(measurement_str)
+        self.cache.put(measurement_str, result)
+        return result
+
+    def _parse(self, original_str):
+        """解析一个非空计量字符串（不使用缓存）"""
+        text = original_str.strip().lower()
+
+        # 括号中的重量，如 "1 (400g) tin"
+        match = _BRACKET_RE.search(text)
+        if match and match.group(2) in UNIT_ALIASES:
+            return float(match.group(1)), UNIT_ALIASES[match.group(2)]
+
+        # 数字加单位，如 "500g"、"2 cups"、"2 1/2 cups"
+        match = _QUANTITY_RE.match(text)
+        if match:
+            if match.group('number') is not None:
+                unit = match.group('direct')
+                if unit in UNIT_ALIASES:
+                    return float(match.group('number')), UNIT_ALIASES[unit]
+            else:
+                unit = match.group('rest').strip()
+                if unit in UNIT_ALIASES:
+                    amount = parse_number(match.group('amount').strip())
+                    if amount is not None:
+                        return amount, UNIT_ALIASES[unit]
+
+        # 单独的单位或描述，如 "pinch"
+        if text in UNIT_ALIASES:
+            return 1.0, UNIT_ALIASES[text]
+
+        # 包含多词单位或描述性短语，如 "to taste"、"juice of 1"、"适量"
+        hits = self.phrase_automaton.find_all(text)
+        if hits:
+            return 1.0, self._phrase_units[min(hits)]
+
+        # 数量词开头，如 "two cloves"
+        match = _QUANTITY_WORD_RE.match(text)
+        if match:
+            unit = self._first_alias_prefix(text[match.end():].strip())
+            return QUANTITY_WORDS[match.group(0)], unit or 'piece'
+
+        # 只有数字，假设为克
+        if text.isdigit():
+            try:
+                return float(text), 'g'
+            except ValueError:
+                pass
+
+        chinese = self._parse_chinese(text)
+        if chinese is not None:
+            return chinese
+
+        extended = self._parse_extended(text)
+        if extended is not None:
+            return extended
+
+        # 如果无法解析，默认为1件，但记录原始计量单位以便分析
+        logger.warning(f"警告: 无法解析计量单位: {original_str}. 使用默认值 1 piece.")
+        return DEFAULT_MEASUREMENT
+
+    def _first_alias_prefix(self, text):
+        """返回作为 text 前缀的单位别名中优先级最高者对应的标准单位"""
+        best = None
+        for length in range(1, min(len(text), self._max_alias_length) + 1):
+            rank = self._alias_ranks.get(text[:length])
+            if rank is not None and (best is None or rank < best):
+                best = rank
+        if best is None:
+            return None
+        return UNIT_ALIASES[self._aliases[best]]
+
+    def _parse_chinese(self, text):
+        """
+        识别中文数量和单位，如 "200克"、"2勺"、"半个"、"一小把"、"一个半"、"2-3瓣"
+
+        返回:
+            tuple: (数量, 单位)，不是中文数量时返回 None
+        """
+        match = _CHINESE_RE.match(text)
+        if not match or not match.group(0):
+            return None
+        number, unit = match.group('number'), match.group('unit')
+        half = match.group('half') or match.group('unit_half')
+        # 只有阿拉伯数字而没有中文单位或 "半" 的字符串交给其他规则
+        if unit is None and not half and (number is None or number[0].isdigit()):
+            return None
+
+        amount = parse_chinese_number(number) if number is not None else (0.0 if half else 1.0)
+        if amount is None:
+            return None
+        if match.group('low') is not None:
+            low = parse_chinese_number(match.group('low'))
+            if low is None:
+                return None
+            amount = (low + amount) / 2
+        if half:
+            amount += 0.5
+
+        if unit is None:
+            return amount, 'piece'
+        standard_unit, factor = CHINESE_UNITS[unit]
+        return amount * factor, standard_unit
+
+    def _parse_extended(self, text):
+        """
+        识别原实现不支持的写法
+
+        返回:
+            tuple: (数量, 单位)，不是扩展语法时返回 None
+        """
+        match = _EXTENDED_BRACKET_RE.search(text)
+        if match and match.group(2) in UNIT_ALIASES:
+            return float(match.group(1)), UNIT_ALIASES[match.group(2)]
+
+        match = _EXTENDED_RE.match(text)
+        if not match:
+            return None
+        if match.group('low') is not None:
+            low, high = parse_number(match.group('low')), parse_number(match.group('high'))
+            if low is None or high is None:
+                return None
+            amount = (low + high) / 2
+        elif match.group('count') is not None:
+            count, size = parse_number(match.group('count')), parse_number(match.group('size'))
+            if count is None or size is None:
+                return None
+            amount = count * size
+        elif match.group('vulgar') is not None:
+            amount = VULGAR_FRACTIONS[match.group('vulgar')] + float(match.group('whole') or 0)
+        else:
+            amount = parse_number(match.group('plain'))
+            if amount is None:
+                return None
+
+        unit, unit2 = match.group('unit'), match.group('unit2')
+        if unit2 is not None and f'{unit} {unit2}' in UNIT_ALIASES:
+            return amount, UNIT_ALIASES[f'{unit} {unit2}']
+        if unit in UNIT_ALIASES:
+            return amount, UNIT_ALIASES[unit]
+        # 普通数字后面跟着未知单位（如 "3 medium"）仍按原实现使用默认值
+        if match.group('plain') is not None:
+            return None
+        return amount, 'piece'
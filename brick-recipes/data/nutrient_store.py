@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+内存映射的 FNDDS 列式数值存储
+
+计算器的热路径只需要食品描述索引、食品 x 营养素矩阵和份量表，却把三张完整的 DataFrame
+（包括对象类型的文本列）常驻内存。本模块把这些数据逐列写成独立的 .npy 文件（数值数组，
+以及以 NUL 分隔的 UTF-8 字符串表），加载时用 numpy.memmap 只读映射: 数据页由操作系统的
+页缓存按需载入，并在进程之间、多次运行之间共享。营养矩阵另存一份 float32 版本，占用减半。
+
+存储位于数据目录的 .nutrient_store 中，以 FNDDS 数据版本为键，数据文件变化时自动重建。
+
+用法:
+    python nutrient_store.py [data_dir] [--rebuild]
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+from fndds_snapshot import fndds_data_version, load_fndds_tables
+from shared_fndds import decode_string_table, encode_string_table
+
+logger = logging.getLogger('recipe_calculator')
+
+# 存储目录（位于数据目录内）和格式版本，格式变化时递增版本号使旧存储失效
+NUTRIENT_STORE_DIR_NAME = '.nutrient_store'
+NUTRIENT_STORE_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# 营养矩阵可选的数值类型
+NUTRIENT_DTYPES = ('float64', 'float32')
+
+# 字符串表（与 RecipeNutritionCalculator 从 DataFrame 生成的小写列表一致）
+STRING_TABLES = ('food_descriptions', 'ingredient_descriptions', 'portion_foods', 'portion_descriptions')
+
+
+def nutrient_store_dir_for(data_dir):
+    """返回数据目录对应的列式存储目录"""
+    return os.path.join(data_dir, NUTRIENT_STORE_DIR_NAME)
+
+
+def _read_manifest(store_dir):
+    """读取存储清单，不存在、损坏或格式版本不符时返回 None"""
+    try:
+        with open(os.path.join(store_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('format_version') != NUTRIENT_STORE_FORMAT_VERSION:
+        return None
+    return manifest
+
+
+def _save_array(store_dir, name, array):
+    """原子地写入一列 .npy 文件"""
+    path = os.path.join(store_dir, f'{name}.npy')
+    tmp_path = path + f'.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, array, allow_pickle=False)
+    os.replace(tmp_path, path)
+
+
+def build_nutrient_store(data_dir, use_snapshot=True):
+    """
+    从 FNDDS 数据表生成列式存储
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+        use_snapshot (bool): 是否通过二进制快照读取数据表
+
+    返回:
+        dict: 存储清单
+    """
+    tables, data_version = load_fndds_tables(data_dir, use_snapshot=use_snapshot)
+    nutrient_values = tables['nutrient_values']
+    portions = tables['portions_weights']
+
+    nutrient_columns = [str(col) for col in nutrient_values.columns[4:]]
+    matrix = np.ascontiguousarray(nutrient_values[nutrient_values.columns[4:]].to_numpy(dtype=np.float64))
+    arrays = {
+        'nutrient_matrix_float64': matrix,
+        'nutrient_matrix_float32': matrix.astype(np.float32),
+        'portion_weights': portions['Portion weight\n(g)'].to_numpy(),
+    }
+    strings = {
+        'food_descriptions': nutrient_values['Main food description'].str.lower().tolist(),
+        'ingredient_descriptions': tables['ingredient_nutrients']['Ingredient description'].str.lower().unique().tolist(),
+        'portion_foods': portions['Main food description'].str.lower().tolist(),
+        'portion_descriptions': portions['Portion description'].str.lower().tolist(),
+    }
+    for name in STRING_TABLES:
+        arrays[f'{name}_blob'], arrays[f'{name}_missing'] = encode_string_table(strings[name])
+
+    store_dir = nutrient_store_dir_for(data_dir)
+    os.makedirs(store_dir, exist_ok=True)
+    for name, array in arrays.items():
+        _save_array(store_dir, name, array)
+
+    manifest = {
+        'format_version': NUTRIENT_STORE_FORMAT_VERSION,
+        'data_version': data_version,
+        'nutrient_columns': nutrient_columns,
+        'arrays': {name: {'dtype': array.dtype.str, 'shape': list(array.shape)} for name, array in arrays.items()},
+    }
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    tmp_path = manifest_path + f'.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    logger.info(f"FNDDS 列式存储已生成: {store_dir}")
+    return manifest
+
+
+class NutrientStore:
+    """
+    只读映射的 FNDDS 列式存储（接口与 SharedFnddsData 相同，可直接用于计算器）
+    """
+
+    def __init__(self, store_dir, manifest, nutrient_dtype='float64'):
+        """
+        参数:
+            store_dir (str): 存储目录
+            manifest (dict): 存储清单
+            nutrient_dtype (str): 营养矩阵的数值类型，"float64" 或 "float32"
+        """
+        if nutrient_dtype not in NUTRIENT_DTYPES:
+            raise ValueError(f"Unknown nutrient dtype: {nutrient_dtype!r} (expected one of {', '.join(NUTRIENT_DTYPES)})")
+        self.store_dir = store_dir
+        self.manifest = manifest
+        self.nutrient_dtype = nutrient_dtype
+        self.data_version = manifest['data_version']
+        self.nutrient_columns = list(manifest['nutrient_columns'])
+
+    def array(self, name):
+        """
+        以只读 numpy.memmap 打开一列（nutrient_matrix 按 nutrient_dtype 选择对应版本）
+
+        返回:
+            numpy.memmap: 只读数组
+        """
+        if name == 'nutrient_matrix':
+            name = f'nutrient_matrix_{self.nutrient_dtype}'
+        return np.load(os.path.join(self.store_dir, f'{name}.npy'), mmap_mode='r', allow_pickle=False)
+
+    def strings(self, name):
+        """解码字符串表为 Python 字符串列表（缺失值为 None）"""
+        return decode_string_table(self.array(f'{name}_blob'), self.array(f'{name}_missing'))
+
+    @property
+    def nbytes(self):
+        """当前数值类型下存储中各列的总字节数"""
+        total = 0
+        for name, info in self.manifest['arrays'].items():
+            if name.startswith('nutrient_matrix_') and name != f'nutrient_matrix_{self.nutrient_dtype}':
+                continue
+            total += int(np.prod(info['shape'])) * np.dtype(info['dtype']).itemsize
+        return total
+
+
+def open_nutrient_store(data_dir, nutrient_dtype='float64', use_snapshot=True, rebuild=False):
+    """
+    打开数据目录中的列式存储，不存在或数据版本已变化时重新生成
+
+    参数:
+        data_dir (str): FNDDS 数据目录
+        nutrient_dtype (str): 营养矩阵的数值类型，"float64" 或 "float32"
+        use_snapshot (bool): 生成存储时是否通过二进制快照读取数据表
+        rebuild (bool): 是否强制重建
+
+    返回:
+        NutrientStore: 列式存储；数据目录不可写时记录警告并返回 None
+    """
+    store_dir = nutrient_store_dir_for(data_dir)
+    manifest = None if rebuild else _read_manifest(store_dir)
+    if manifest is None or manifest['data_version'] != fndds_data_version(data_dir):
+        try:
+            manifest = build_nutrient_store(data_dir, use_snapshot=use_snapshot)
+        except OSError as e:
+            logger.warning(f"警告: 无法写入 FNDDS 列式存储 {store_dir}: {e}")
+            return None
+    return NutrientStore(store_dir, manifest, nutrient_dtype)
+
+
+def main():
+    """生成列式存储并打印各列大小"""
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    data_dir = args[0] if args else 'fixed_data'
+
+    start = time.perf_counter()
+    store = open_nutrient_store(data_dir, rebuild='--rebuild' in sys.argv)
+    if store is None:
+        sys.exit(1)
+    print(f"列式存储: {store.store_dir} (数据版本 {store.data_version}, {time.perf_counter() - start:.2f}s)")
+    for name, info in store.manifest['arrays'].items():
+        size = int(np.prod(info['shape'])) * np.dtype(info['dtype']).itemsize
+        print(f"  {name:32s} {info['dtype']:>5s} {str(tuple(info['shape'])):>12s} {size / 1024:10.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import pandas as pd
+import argparse
 import json
 import os
 import re
@@ -9,44 +9,395 @@ import numpy as np
 from pathlib import Path
 import logging
 import copy
+import heapq
+import multiprocessing
+import threading
+import time
+from collections.abc import Mapping
+
+from fndds_snapshot import fndds_data_version, fndds_source_paths, load_fndds_tables
+from fndds_sqlite import open_fndds_sqlite
+from food_match_index import FoodMatchIndex, MatchQuery, NumpyMatchEngine, match_triggers, static_match_score
+from match_cache import (
+    DEFAULT_MATCH_CACHE_SIZE,
+    DEFAULT_NEGATIVE_CACHE_SIZE,
+    DEFAULT_NEGATIVE_CACHE_TTL,
+    LRUMatchCache,
+    NegativeMatchCache,
+    normalize_ingredient_key,
+    open_persistent_match_cache,
+)
+from match_rules import MatchRules, load_match_rules
+from measurement_parser import MeasurementParser
+from nutrient_store import NUTRIENT_DTYPES, open_nutrient_store
+from shared_fndds import SharedFnddsData
+from tfidf_matcher import TfidfFoodMatcher
+from typo_index import SymmetricDeleteIndex, max_typo_distance
 
 # 设置日志记录
 logging.basicConfig(level=logging.INFO, format='%(message)s')
 logger = logging.getLogger('recipe_calculator')
 
+# 模糊匹配评分引擎和匹配后端
+MATCH_ENGINES = ("python", "numpy")
+MATCHERS = ("heuristic", "tfidf")
+
+# 营养数据存储方式: 常驻内存的 DataFrame、内存映射的列式存储（见 nutrient_store.py）
+# 或按需查询的 SQLite 数据库（见 fndds_sqlite.py）
+NUTRIENT_STORES = ("memory", "memmap", "sqlite")
+
+# 内存模式下加载的 FNDDS 列: 营养值表跳过只用于标识的列，份量表只读取食谱计算用到的三列；
+# 食材营养表不参与食谱计算，首次访问时才加载
+FNDDS_ID_COLUMNS = ('Food code', 'WWEIA Category number', 'WWEIA Category description')
+PORTION_COLUMNS = ['Main food description', 'Portion description', 'Portion weight\n(g)']
+HOT_PATH_COLUMNS = {
+    'nutrient_values': lambda col: col not in FNDDS_ID_COLUMNS,
+    'portions_weights': PORTION_COLUMNS,
+}
+
+# 匹配算法版本，修改匹配逻辑（而不只是规则）时递增，使持久化匹配缓存失效
+MATCH_ALGORITHM_VERSION = 1
+
+# process_recipes 并行处理时每次分派给工作进程的食谱数量
+DEFAULT_RECIPE_CHUNK_SIZE = 8
+
+# 中文（CJK 统一表意文字）字符
+CJK_CHARACTER_PATTERN = re.compile(r'[\u3400-\u9fff]')
+
+# preprocess_ingredient_name 要移除的常见修饰词和计量单位（整词匹配）
+PREPROCESS_MODIFIERS = frozenset([
+    # 数量和计量单位
+    'cup', 'cups', 'tablespoon', 'tablespoons',
+    'teaspoon', 'teaspoons', 'tbsp', 'tsp', 'oz', 'ounce', 'ounces', 'pound', 'pounds',
+    'gram', 'grams', 'g', 'kg', 'ml', 'liter', 'liters', 'l', 'pinch', 'dash',
+    # 容器和包装
+    'tin', 'can', 'jar', 'packet', 'pack', 'package', 'container', 'box', 'bottle',
+    # 状态修饰词
+    'fresh', 'frozen', 'canned', 'dried', 'dry', 'raw', 'cooked', 'boiled', 'steamed',
+    'roasted', 'baked', 'fried', 'grilled', 'smoked', 'cured', 'pickled', 'preserved',
+    # 大小和形状
+    'large', 'medium', 'small', 'tiny', 'big', 'huge', 'whole', 'half', 'quarter',
+    'sliced', 'diced', 'chopped', 'minced', 'grated', 'shredded', 'ground', 'mashed',
+    'cubed', 'julienned', 'crushed', 'crumbled', 'torn', 'broken', 'split', 'halved',
+    # 其他修饰词
+    'optional', 'to taste', 'as needed', 'approximately', 'about', 'roughly', 'or so',
+    'extra', 'virgin', 'pure', 'natural', 'organic', 'free-range', 'grass-fed', 'wild',
+    'farm-raised', 'homemade', 'store-bought', 'commercial', 'premium', 'quality',
+    'skinless', 'boneless', 'skin-on', 'bone-in', 'lean', 'fatty', 'fat-free', 'low-fat',
+    'full-fat', 'reduced-fat', 'unsalted', 'salted', 'sweetened', 'unsweetened',
+    'finely', 'coarsely', 'thinly', 'thickly', 'freshly', 'lightly', 'heavily'
+])
+
+# preprocess_ingredient_name 要移除的连接词和介词
+PREPROCESS_CONNECTORS = frozenset([',', 'and', 'or', 'with', 'without', 'plus', 'of', 'for', 'from', 'in', 'on', 'as'])
+
+# 数量修饰词: "2"、"(400g)"、"500g"
+PREPROCESS_QUANTITY_PATTERN = re.compile(r'\d+|\(\d+[a-z]*\)|\d+[a-z]+')
+
+# 常见计量单位到克的转换
+UNIT_TO_GRAM = {
+    # 重量单位
+    'g': 1.0,
+    'kg': 1000.0,
+    'oz': 28.35,  # 1盎司 = 28.35克
+    'lb': 453.59, # 1磅 = 453.59克
+    
+    # 体积单位 (假设密度为1g/ml)
+    'ml': 1.0,
+    'l': 1000.0,
+    'cup': 240.0,  # 1杯 = 240毫升
+    'tbsp': 15.0,  # 1汤匙 = 15毫升
+    'tsp': 5.0,    # 1茶匙 = 5毫升
+    'fl_oz': 30.0, # 1液体盎司 = 30毫升
+    'pint': 473.0, # 1員脑 = 473毫升
+    'quart': 946.0, # 1夸脑 = 946毫升
+    'gallon': 3785.0, # 1加仑 = 3785毫升
+    
+    # 其他常见计量
+    'pinch': 0.5,  # 一捏约为0.5克
+    'dash': 0.5,   # 一点约为0.5克
+    'clove': 5.0,  # 一瓣大蒜约为5克
+    'bunch': 100.0, # 一束约为100克
+    'handful': 30.0, # 一把约为30克
+    'sprig': 5.0,  # 一小枝约为5克
+    'slice': 30.0, # 一片约为30克
+    'piece': 50.0, # 一块约为50克
+    'whole': 150.0, # 一整个约为150克
+    'tin': 400.0,  # 一罐约为400克
+    'can': 400.0,  # 一罐约为400克
+    'pack': 200.0, # 一包约为200克
+}
+
+# 根据食品类型的密度调整
+FOOD_DENSITY_ADJUSTMENTS = {
+    # 液体食品
+    'milk': 1.03,  # 牛奶密度约为1.03g/ml
+    'cream': 1.0,  # 奶油密度约为1g/ml
+    'oil': 0.92,   # 油密度约为0.92g/ml
+    'wine': 1.0,   # 葡萄酒密度约为1g/ml
+    'juice': 1.05,  # 果汁密度约为1.05g/ml
+    'water': 1.0,   # 水密度为1g/ml
+    'soup': 1.05,   # 汤密度约为1.05g/ml
+    
+    # 固体食品
+    'flour': 0.55,  # 面粉密度约为0.55g/ml
+    'sugar': 0.85,  # 糖密度约为0.85g/ml
+    'rice': 0.75,   # 米密度约为0.75g/ml
+    'salt': 1.2,    # 盐密度约为1.2g/ml
+}
+
+# 需要按食品密度调整的体积单位
+VOLUME_UNITS = {'ml', 'l', 'cup', 'tbsp', 'tsp', 'fl_oz', 'pint', 'quart', 'gallon'}
+
+
+class NutrientVector(Mapping):
+    """
+    与营养素列索引对齐的营养值向量
+    
+    内部以 NumPy 数组保存，缩放等运算都在数组上完成，只在需要时才生成 {营养素名称: 数值} 字典。
+    仅在计算器内部使用，calculate_recipe_nutrition 返回前转换为普通字典。
+    """
+    
+    def __init__(self, names, values=None):
+        """
+        参数:
+            names (list): 营养素名称，与 values 的各列对齐
+            values (np.ndarray): 营养值向量；为 None 时表示没有营养数据
+        """
+        self.names = names
+        self.values = values
+        self._dict = None
+    
+    def scaled(self, factor):
+        """返回按标量缩放后的新向量"""
+        if self.values is None:
+            return NutrientVector(self.names)
+        return NutrientVector(self.names, self.values * factor)
+    
+    def to_dict(self):
+        """生成（并缓存）营养素字典"""
+        if self._dict is None:
+            self._dict = {} if self.values is None else dict(zip(self.names, self.values.tolist()))
+        return self._dict
+    
+    def __getitem__(self, nutrient):
+        return self.to_dict()[nutrient]
+    
+    def __iter__(self):
+        return iter(self.to_dict())
+    
+    def __len__(self):
+        return len(self.to_dict())
+    
+    def __bool__(self):
+        return self.values is not None and len(self.names) > 0
+    
+    def __repr__(self):
+        return f"NutrientVector({self.to_dict()!r})"
+
+
 class RecipeNutritionCalculator:
-    def __init__(self, data_dir):
+    def __init__(self, data_dir, use_snapshot=True, match_rules=None, match_index=True, engine="python",
+                 matcher="heuristic", match_cache_size=DEFAULT_MATCH_CACHE_SIZE, persistent_match_cache=True,
+                 negative_cache_size=DEFAULT_NEGATIVE_CACHE_SIZE, negative_cache_ttl=DEFAULT_NEGATIVE_CACHE_TTL,
+                 shared_data=None, nutrient_store="memory", nutrient_dtype="float64"):
         """
         Initialize the nutrition calculator with data files.
         
         Args:
             data_dir (str): Directory containing the FNDDS Excel files
+            use_snapshot (bool): Load the tables from the binary snapshot cache
+                (built from the Excel files on first use, see fndds_snapshot.py)
+            match_rules (MatchRules or str): Compiled ingredient matching rules, or the
+                path of a JSON/YAML rules file. Defaults to the built-in rules.
+            match_index (bool): Generate fuzzy matching candidates from the trigram
+                index instead of scoring every food description (same results)
+            engine (str): Fuzzy scoring engine, "python" (score candidates one by one)
+                or "numpy" (score all food descriptions in one vectorized pass)
+            matcher (str): Fuzzy matching backend, "heuristic" (substring and keyword
+                rules) or "tfidf" (character n-gram TF-IDF cosine similarity)
+            match_cache_size (int): Maximum number of ingredient -> food matches kept in
+                the in-process LRU cache (0 disables the cache)
+            persistent_match_cache (bool): Share match results across runs and worker
+                processes through the SQLite cache in data_dir (see match_cache.py)
+            negative_cache_size (int): Maximum number of unmatched ingredient names
+                remembered (0 disables the negative cache)
+            negative_cache_ttl (float): Seconds an unmatched name stays cached
+            shared_data (SharedFnddsData): Attach to the nutrient matrix, portion table
+                and description tables a parent process placed in shared memory instead
+                of loading the FNDDS files (see shared_fndds.py). The DataFrame
+                attributes are None in this mode.
+            nutrient_store (str): "memory" (load the FNDDS tables as DataFrames),
+                "memmap" (map the nutrient matrix, portion table and description tables
+                read-only from the columnar store in data_dir, see nutrient_store.py) or
+                "sqlite" (look up nutrients, portions and descriptions with indexed
+                queries on the SQLite import in data_dir, see fndds_sqlite.py). The
+                DataFrame attributes are None unless the store is "memory".
+            nutrient_dtype (str): "float64" or "float32" nutrient matrix (float32 halves
+                its memory; nutrient sums are still accumulated in float64)
         """
+        if engine not in MATCH_ENGINES:
+            raise ValueError(f"Unknown matching engine: {engine!r} (expected one of {', '.join(MATCH_ENGINES)})")
+        if matcher not in MATCHERS:
+            raise ValueError(f"Unknown matching backend: {matcher!r} (expected one of {', '.join(MATCHERS)})")
+        if nutrient_store not in NUTRIENT_STORES:
+            raise ValueError(f"Unknown nutrient store: {nutrient_store!r} (expected one of {', '.join(NUTRIENT_STORES)})")
+        if nutrient_dtype not in NUTRIENT_DTYPES:
+            raise ValueError(f"Unknown nutrient dtype: {nutrient_dtype!r} (expected one of {', '.join(NUTRIENT_DTYPES)})")
         self.data_dir = data_dir
+        self.engine = engine
+        self.matcher = matcher
+        
+        # Compile the ingredient matching rules once per calculator
+        if isinstance(match_rules, MatchRules):
+            self.match_rules = match_rules
+        else:
+            self.match_rules = load_match_rules(match_rules)
         
         # Load the Excel files (skip the first row which is a header title)
         print("Loading nutrition data files...")
+        startup_start = time.perf_counter()
+        
+        # Load time, rows, columns and memory of each table (see print_startup_report)
+        self.load_report = {}
+        self._use_snapshot = use_snapshot
+        self._ingredient_nutrients_df = None
+        self._ingredient_descriptions = None
+        self._load_ingredient_table = None
+        
+        self.shared_data = shared_data
+        self.nutrient_store = nutrient_store
+        self.nutrient_dtype = nutrient_dtype
+        source = shared_data
+        self.sqlite_store = None
+        if source is None and nutrient_store == "memmap":
+            # Read-only memory maps of the columnar store (None if it cannot be written)
+            source = open_nutrient_store(data_dir, nutrient_dtype=nutrient_dtype, use_snapshot=use_snapshot)
+            if source is None:
+                self.nutrient_store = "memory"
+        elif source is None and nutrient_store == "sqlite":
+            # Indexed queries on the SQLite import (None if it cannot be created)
+            self.sqlite_store = open_fndds_sqlite(data_dir, use_snapshot=use_snapshot)
+            if self.sqlite_store is None:
+                self.nutrient_store = "memory"
+        
+        if self.sqlite_store is not None:
+            # Only the description lists used for fuzzy matching stay in memory; nutrient
+            # rows, description -> row lookups and portions are queried on demand
+            self.data_version = self.sqlite_store.data_version
+            self.portions_weights_df = None
+            self.nutrient_values_df = None
+            self.food_descriptions = self.sqlite_store.food_descriptions()
+            self._load_ingredient_descriptions = self.sqlite_store.ingredient_descriptions
+            nutrient_columns = self.sqlite_store.nutrient_columns
+            self.nutrient_matrix = self.sqlite_store.nutrient_rows(nutrient_dtype)
+            portion_columns = None
+        elif source is not None:
+            # Zero-copy, read-only views of the arrays in shared memory or the memory
+            # mapped store; only the string tables are decoded in this process
+            self.data_version = source.data_version
+            self.portions_weights_df = None
+            self.nutrient_values_df = None
+            self.food_descriptions = source.strings('food_descriptions')
+            self._load_ingredient_descriptions = lambda: source.strings('ingredient_descriptions')
+            nutrient_columns = source.nutrient_columns
+            self.nutrient_matrix = source.array('nutrient_matrix')
+            portion_columns = (
+                source.strings('portion_foods'),
+                source.strings('portion_descriptions'),
+                source.array('portion_weights').tolist(),
+            )
+        else:
+            # Load the data files (from the snapshot cache when it matches the Excel files):
+            # only the columns the recipe path reads, with dtypes compacted without
+            # changing any value; the ingredient nutrients table is loaded on first access
+            tables, self.data_version = load_fndds_tables(
+                data_dir, use_snapshot=use_snapshot, names=('nutrient_values', 'portions_weights'),
+                usecols=HOT_PATH_COLUMNS, compact=True, report=self.load_report
+            )
+            self.load_report['ingredient_nutrients'] = None
+            self._load_ingredient_table = self._read_ingredient_nutrients
+            self.portions_weights_df = tables['portions_weights']
+            self.nutrient_values_df = tables['nutrient_values']
+            
+            # Get lists of all food descriptions for matching
+            self.food_descriptions = self.nutrient_values_df['Main food description'].str.lower().tolist()
+            self._load_ingredient_descriptions = (
+                lambda: self.ingredient_nutrients_df['Ingredient description'].str.lower().unique().tolist()
+            )
+            
+            # Contiguous float64 food x nutrient matrix (values per 100g); every column
+            # after the description is a nutrient
+            nutrient_columns = self.nutrient_values_df.columns[1:]
+            self.nutrient_matrix = np.ascontiguousarray(
+                self.nutrient_values_df[nutrient_columns].to_numpy(dtype=np.float64)
+            )
+            portion_columns = (
+                self.portions_weights_df['Main food description'].str.lower().tolist(),
+                self.portions_weights_df['Portion description'].str.lower().tolist(),
+                self.portions_weights_df['Portion weight\n(g)'].tolist(),
+            )
         
-        # File paths
-        ingredient_nutrient_path = os.path.join(data_dir, "2021-2023 FNDDS At A Glance - Ingredient Nutrient Values.xlsx")
-        portions_weights_path = os.path.join(data_dir, "2021-2023 FNDDS At A Glance - Portions and Weights.xlsx")
-        nutrient_values_path = os.path.join(data_dir, "2021-2023 FNDDS At A Glance - FNDDS Nutrient Values.xlsx")
-        
-        # Load the data files
-        self.ingredient_nutrients_df = pd.read_excel(ingredient_nutrient_path, skiprows=1)
-        self.portions_weights_df = pd.read_excel(portions_weights_path, skiprows=1)
-        self.nutrient_values_df = pd.read_excel(nutrient_values_path, skiprows=1)
+        if self._load_ingredient_table is None:
+            # Shared memory, the memmap store and SQLite are reported as one entry
+            self.load_report['shared_memory' if shared_data is not None else self.nutrient_store] = {
+                'seconds': time.perf_counter() - startup_start,
+                'rows': len(self.food_descriptions),
+                'columns': len(nutrient_columns),
+                'bytes': None,
+            }
         
-        # Get lists of all food descriptions for matching
-        self.food_descriptions = self.nutrient_values_df['Main food description'].str.lower().tolist()
-        self.ingredient_descriptions = self.ingredient_nutrients_df['Ingredient description'].str.lower().unique().tolist()
+        # Optional float32 nutrient matrix (the memmap store keeps a float32 copy on disk)
+        if self.nutrient_matrix.dtype != np.dtype(nutrient_dtype):
+            self.nutrient_matrix = self.nutrient_matrix.astype(nutrient_dtype)
         
         # Clean column names by removing newlines
         self.clean_columns = {}
-        for col in self.nutrient_values_df.columns[4:]:
+        for col in nutrient_columns:
             clean_col = col.replace('\n', '')
             self.clean_columns[col] = clean_col
         
+        # Nutrient names aligned to the columns of the nutrient matrix
+        self.nutrient_names = [self.clean_columns[col] for col in nutrient_columns]
+        
+        # Lowercase description -> first matching row of the nutrient matrix
+        if self.sqlite_store is not None:
+            self.food_row_index = self.sqlite_store.food_row_index()
+        else:
+            self.food_row_index = {}
+            for row, description in enumerate(self.food_descriptions):
+                self.food_row_index.setdefault(description, row)
+        
+        # Candidate index and description features for fuzzy matching (built on the
+        # first fuzzy match); the numpy engine is built from the same feature table
+        if match_index or engine == "numpy":
+            self._match_index = FoodMatchIndex(self.food_descriptions, self.match_rules)
+        else:
+            self._match_index = None
+        self._numpy_engine = None
+        self._tfidf_matcher = None
+        self._typo_index = None
+        
+        # Number of ingredients resolved by each matching tier
+        self.match_tier_counts = {}
+        
+        # LRU cache of (normalized ingredient name, rules version) -> food description
+        self.match_cache = LRUMatchCache(match_cache_size)
+        
+        # Compiled measurement parser with a per-string result cache
+        self.measurement_parser = MeasurementParser()
+        
+        # Bounded, expiring cache of names that matched nothing
+        self.negative_match_cache = NegativeMatchCache(negative_cache_size, negative_cache_ttl)
+        
+        # On-disk cache shared across runs, invalidated by the FNDDS data version and
+        # the matcher version
+        self.persistent_match_cache = None
+        if persistent_match_cache:
+            self.persistent_match_cache = open_persistent_match_cache(
+                data_dir, self.data_version, self.matcher_version
+            )
+        
         # Create a dictionary for units conversion (common recipe units to grams)
         self.unit_conversion = {
             'cup': 'cup',
@@ -88,8 +439,94 @@ class RecipeNutritionCalculator:
             'cloves': 'clove'
         }
         
+        # Pre-grouped portion weights: food description -> (canonical unit -> grams, default grams)
+        self.portion_units = list(dict.fromkeys(self.unit_conversion.values()))
+        if self.sqlite_store is not None:
+            self.portion_index = self.sqlite_store.portion_index(self._portion_index_entry)
+        else:
+            self.portion_index = self._build_portion_index(*portion_columns)
+        self._portion_unit_cache = {}
+        
+        # Total time spent in __init__ (tables, indexes and caches)
+        self.startup_seconds = time.perf_counter() - startup_start
+        
         print("Data loaded successfully.")
 
+    @property
+    def ingredient_nutrients_df(self):
+        """
+        The FNDDS ingredient nutrient values table, loaded on first access (the recipe
+        calculation path never reads it). None unless the tables are kept in memory.
+        """
+        if self._ingredient_nutrients_df is None and self._load_ingredient_table is not None:
+            self._ingredient_nutrients_df = self._load_ingredient_table()
+        return self._ingredient_nutrients_df
+
+    @property
+    def ingredient_descriptions(self):
+        """Unique lowercase ingredient descriptions, built on first access."""
+        if self._ingredient_descriptions is None:
+            self._ingredient_descriptions = self._load_ingredient_descriptions()
+        return self._ingredient_descriptions
+
+    def _read_ingredient_nutrients(self):
+        """Load the ingredient nutrient values table and record it in the load report."""
+        tables, _ = load_fndds_tables(self.data_dir, use_snapshot=self._use_snapshot,
+                                      names=('ingredient_nutrients',), compact=True, report=self.load_report)
+        return tables['ingredient_nutrients']
+
+    def _build_portion_index(self, descriptions, portions, weights):
+        """
+        Group the portions table by lowercase food description once.
+        
+        For every food, record the first portion weight whose description contains
+        each canonical unit, and the default portion used when no unit matches
+        (first 'cup' portion, then first 'medium' portion, then the first portion).
+        
+        Args:
+            descriptions (list): Lowercase main food description of each portion row
+            portions (list): Lowercase portion description of each row (missing values
+                are not strings)
+            weights (list): Portion weight in grams of each row
+        
+        Returns:
+            dict: food description -> (dict of unit -> grams, default grams)
+        """
+        grouped = {}
+        for description, portion, weight in zip(descriptions, portions, weights):
+            grouped.setdefault(description, []).append((portion if isinstance(portion, str) else None, weight))
+        
+        return {description: self._portion_index_entry(portions) for description, portions in grouped.items()}
+
+    def _portion_index_entry(self, portions):
+        """
+        Summarize the portions of one food.
+        
+        Args:
+            portions (list): (lowercase portion description or None, grams) in table order
+        
+        Returns:
+            tuple: (dict of unit -> grams, default grams)
+        """
+        unit_weights = {}
+        medium_weight = None
+        for portion, weight in portions:
+            if portion is None:
+                continue
+            for unit in self.portion_units:
+                if unit not in unit_weights and unit in portion:
+                    unit_weights[unit] = weight
+            if medium_weight is None and 'medium' in portion:
+                medium_weight = weight
+        
+        if 'cup' in unit_weights:
+            default_weight = unit_weights['cup']
+        elif medium_weight is not None:
+            default_weight = medium_weight
+        else:
+            default_weight = portions[0][1]
+        return unit_weights, default_weight
+
     def find_closest_food_match(self, ingredient_name, verbose=False):
         """
         在FNDDS数据库中查找与给定食材名称最接近的食品
@@ -101,8 +538,113 @@ class RecipeNutritionCalculator:
         返回:
             str: 最接近的食品描述，如果没有找到匹配项则返回None
         """
+        if not isinstance(ingredient_name, str):
+            return None
+        
+        # 先查匹配缓存（以标准化名称和规则版本为键，值为 (食品描述, 匹配层级)）；
+        # 缓存命中也按匹配层级计数，层级报告统计的是食材次数而不是不同名称数
+        cache_key = (normalize_ingredient_key(ingredient_name), self.match_rules.version)
+        cached = self.match_cache.get(cache_key)
+        if cached is not None:
+            description, tier = cached
+            if verbose:
+                logger.info(f"使用缓存的匹配结果: '{ingredient_name}' -> '{description}'")
+            self._count_match_tier(tier)
+            return description
+        
+        # 已知找不到匹配的名称直接返回，不再走完所有匹配层级
+        if cache_key in self.negative_match_cache:
+            if verbose:
+                logger.warning(f"未找到食材匹配（缓存）: '{ingredient_name}'")
+            self._count_match_tier('unmatched')
+            return None
+        
+        # 再查跨运行共享的持久化缓存
+        if self.persistent_match_cache is not None:
+            stored = self.persistent_match_cache.get(cache_key[0])
+            if stored is not None:
+                description, _, tier = stored
+                if verbose:
+                    logger.info(f"使用持久化缓存的匹配结果: '{ingredient_name}' -> '{description}' ({tier})")
+                # 按保存时的匹配层级计数，热启动时层级报告与冷启动一致
+                self._count_match_tier(tier)
+                self.match_cache.put(cache_key, (description, tier))
+                return description
+        
+        start = time.perf_counter()
+        matches = self.find_food_matches(ingredient_name, k=1, verbose=verbose)
+        if not matches:
+            self.negative_match_cache.add(cache_key, time.perf_counter() - start)
+            return None
+        description, score, tier = matches[0]
+        self.match_cache.put(cache_key, (description, tier))
+        if self.persistent_match_cache is not None:
+            self.persistent_match_cache.put(cache_key[0], description, score, tier)
+        return description
+
+    @property
+    def matcher_version(self):
+        """
+        匹配器版本: 规则版本、匹配后端和匹配算法版本，任一变化时持久化缓存失效
+        """
+        return f"{self.match_rules.version}:{self.matcher}:{MATCH_ALGORITHM_VERSION}"
+
+    def cache_clear(self, persistent=False):
+        """
+        清空食材匹配缓存（包括未匹配名称缓存）并重置命中统计
+        
+        参数:
+            persistent (bool): 是否同时清空磁盘上的持久化缓存
+        """
+        self.match_cache.clear()
+        self.negative_match_cache.clear()
+        if persistent and self.persistent_match_cache is not None:
+            self.persistent_match_cache.clear()
+
+    def find_food_matches(self, ingredient_name, k=5, verbose=False):
+        """
+        在FNDDS数据库中查找与给定食材名称最接近的前 k 个食品
+        
+        第一个结果与 find_closest_food_match 的返回值相同，tier 为解析它的匹配层级:
+        precise（精确食材数据库）、exact（精确匹配）、typo（拼写容错）、scan（模糊评分）、
+        precise_contains（精确食材数据库包含关系）、default（类别默认匹配）、
+        chinese（中文名称经中英对照表转为英文名称后匹配）。
+        其余结果是模糊评分的候选（tier 为 scan），用于人工复核时提供备选项。
+        字典层级的结果没有分数，score 为 None。
+        
+        参数:
+            ingredient_name (str): 要查找匹配的食材名称
+            k (int): 返回的最大结果数量
+            verbose (bool): 是否打印详细的匹配信息
+            
+        返回:
+            list: [(食品描述, 分数, 匹配层级), ...]，没有找到匹配项时为空列表
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        
+        matches = self._find_food_matches(ingredient_name, k, verbose)
+        if matches is None:
+            return []
+        self._count_match_tier(matches[0][2] if matches else 'unmatched')
+        return matches
+
+    def _find_food_matches(self, ingredient_name, k, verbose):
+        """
+        find_food_matches 的匹配流程（不记录层级统计）
+        
+        返回:
+            list: [(食品描述, 分数, 匹配层级), ...]；食材名称无效时返回 None
+        """
         # 跳过无效的食材名称
-        if not ingredient_name or not isinstance(ingredient_name, str) or len(ingredient_name.strip()) < 3:
+        if not ingredient_name or not isinstance(ingredient_name, str):
+            return None
+        
+        # 中文食材名称通过中英对照表转为英文名称（常见的中文名称只有两个字，在长度检查之前处理）
+        if CJK_CHARACTER_PATTERN.search(ingredient_name):
+            return self._chinese_food_matches(ingredient_name, k, verbose)
+        
+        if len(ingredient_name.strip()) < 3:
             return None
             
         original_name = ingredient_name
@@ -111,698 +653,32 @@ class RecipeNutritionCalculator:
         # 设置日志级别
         log_func = logger.info if verbose else logger.debug
         
-        # 预处理复杂食材描述，简化为核心食材名称
-        # 先定义食材分类字典，然后传递给预处理函数
-        # 食材分类系统 - 更详细的食材分类字典，包含更多的关键词和子类别
-        ingredient_categories = {
-            # 肉类
-            'meat': {
-                'beef': ['beef', 'steak', 'ribeye', 'sirloin', 'brisket', 'ground beef', 'minced beef', 'burger', 'chuck', 'roast beef'],
-                'pork': ['pork', 'ham', 'bacon', 'sausage', 'loin', 'chop', 'tenderloin', 'ground pork', 'minced pork', 'prosciutto', 'pancetta'],
-                'lamb': ['lamb', 'mutton', 'chop', 'rack', 'leg of lamb', 'ground lamb', 'minced lamb'],
-                'poultry': ['chicken', 'turkey', 'duck', 'goose', 'hen', 'breast', 'thigh', 'wing', 'drumstick', 'ground chicken', 'minced chicken'],
-                'game': ['venison', 'rabbit', 'quail', 'pheasant', 'boar', 'bison', 'buffalo'],
-                'processed': ['sausage', 'salami', 'pepperoni', 'jerky', 'meatball', 'meatloaf', 'deli meat', 'cured meat']
-            },
-            
-            # 海鲜类
-            'seafood': {
-                'fish': ['fish', 'salmon', 'tuna', 'cod', 'haddock', 'trout', 'bass', 'tilapia', 'sardine', 'anchovy', 'mackerel', 'halibut', 'snapper', 'mahi mahi', 'swordfish'],
-                'shellfish': ['shrimp', 'prawn', 'king prawn', 'crab', 'lobster', 'crawfish', 'crayfish', 'langoustine'],
-                'mollusks': ['mussel', 'clam', 'oyster', 'scallop', 'squid', 'octopus', 'calamari'],
-                'processed': ['fish stick', 'fish finger', 'fish cake', 'surimi', 'canned tuna', 'canned salmon', 'smoked salmon', 'smoked fish']
-            },
-            
-            # 蔬菜类
-            'vegetables': {
-                'root': ['carrot', 'potato', 'sweet potato', 'yam', 'turnip', 'radish', 'beet', 'beetroot', 'parsnip', 'rutabaga', 'celeriac'],
-                'bulb': ['onion', 'garlic', 'shallot', 'leek', 'spring onion', 'scallion', 'green onion', 'fennel'],
-                'leafy_greens': ['lettuce', 'spinach', 'kale', 'chard', 'arugula', 'rocket', 'collard', 'cabbage', 'bok choy', 'watercress', 'endive', 'radicchio'],
-                'cruciferous': ['broccoli', 'cauliflower', 'brussels sprout', 'cabbage', 'kale', 'bok choy', 'kohlrabi'],
-                'nightshade': ['tomato', 'pepper', 'eggplant', 'aubergine', 'potato', 'chili', 'capsicum', 'bell pepper'],
-                'squash': ['zucchini', 'courgette', 'pumpkin', 'butternut squash', 'acorn squash', 'spaghetti squash', 'gourd'],
-                'legume': ['bean', 'pea', 'lentil', 'chickpea', 'garbanzo', 'kidney bean', 'black bean', 'pinto bean', 'navy bean', 'edamame', 'soybean'],
-                'other': ['cucumber', 'celery', 'asparagus', 'artichoke', 'corn', 'maize', 'mushroom', 'avocado']
-            },
-            
-            # 水果类
-            'fruits': {
-                'berry': ['strawberry', 'blueberry', 'raspberry', 'blackberry', 'cranberry', 'boysenberry', 'gooseberry', 'elderberry', 'mulberry', 'acai berry'],
-                'citrus': ['orange', 'lemon', 'lime', 'grapefruit', 'tangerine', 'mandarin', 'clementine', 'kumquat', 'citron', 'yuzu'],
-                'tropical': ['banana', 'pineapple', 'mango', 'papaya', 'kiwi', 'guava', 'passion fruit', 'lychee', 'dragon fruit', 'star fruit', 'durian'],
-                'stone': ['peach', 'plum', 'nectarine', 'apricot', 'cherry', 'date', 'olive'],
-                'pome': ['apple', 'pear', 'quince'],
-                'melon': ['watermelon', 'cantaloupe', 'honeydew', 'melon'],
-                'dried': ['raisin', 'prune', 'date', 'fig', 'apricot', 'cranberry', 'currant']
-            },
-            
-            # 乳制品类
-            'dairy': {
-                'milk': ['milk', 'whole milk', 'skim milk', 'low-fat milk', 'buttermilk', 'condensed milk', 'evaporated milk'],
-                'cheese': ['cheese', 'cheddar', 'mozzarella', 'parmesan', 'feta', 'gouda', 'brie', 'camembert', 'blue cheese', 'goat cheese', 'ricotta', 'cottage cheese', 'cream cheese'],
-                'cream': ['cream', 'heavy cream', 'whipping cream', 'sour cream', 'creme fraiche', 'half and half'],
-                'yogurt': ['yogurt', 'greek yogurt', 'plain yogurt', 'flavored yogurt', 'kefir'],
-                'butter': ['butter', 'unsalted butter', 'salted butter', 'clarified butter', 'ghee']
-            },
-            
-            # 谷类和面粉类
-            'grains': {
-                'rice': ['rice', 'white rice', 'brown rice', 'jasmine rice', 'basmati rice', 'arborio rice', 'wild rice', 'rice flour'],
-                'wheat': ['wheat', 'flour', 'all-purpose flour', 'bread flour', 'cake flour', 'whole wheat flour', 'semolina', 'bulgur', 'couscous'],
-                'corn': ['corn', 'maize', 'cornmeal', 'polenta', 'grits', 'corn flour', 'cornstarch'],
-                'oats': ['oat', 'oatmeal', 'rolled oats', 'steel-cut oats', 'quick oats'],
-                'other_grains': ['barley', 'quinoa', 'millet', 'rye', 'buckwheat', 'amaranth', 'spelt', 'farro', 'teff'],
-                'pasta': ['pasta', 'spaghetti', 'penne', 'fettuccine', 'linguine', 'macaroni', 'noodle', 'egg noodle', 'rice noodle'],
-                'bread': ['bread', 'white bread', 'whole wheat bread', 'rye bread', 'sourdough', 'baguette', 'roll', 'bun', 'pita', 'naan', 'tortilla']
-            },
-            
-            # 调味料和香料
-            'seasonings': {
-                'herbs': ['basil', 'oregano', 'thyme', 'rosemary', 'parsley', 'cilantro', 'coriander', 'mint', 'dill', 'sage', 'tarragon', 'chive', 'bay leaf', 'marjoram'],
-                'spices': ['pepper', 'black pepper', 'white pepper', 'red pepper', 'chili', 'paprika', 'cumin', 'coriander', 'cinnamon', 'nutmeg', 'clove', 'allspice', 'cardamom', 'turmeric', 'ginger', 'saffron', 'fennel seed', 'star anise'],
-                'salt': ['salt', 'sea salt', 'kosher salt', 'table salt', 'fleur de sel', 'himalayan salt'],
-                'condiments': ['ketchup', 'mustard', 'mayonnaise', 'soy sauce', 'hot sauce', 'worcestershire sauce', 'fish sauce', 'vinegar', 'balsamic vinegar', 'miso', 'tahini']
-            },
-            
-            # 油脂类
-            'oils': {
-                'vegetable_oils': ['oil', 'olive oil', 'vegetable oil', 'canola oil', 'sunflower oil', 'corn oil', 'peanut oil', 'sesame oil', 'coconut oil', 'avocado oil', 'grapeseed oil', 'walnut oil'],
-                'animal_fats': ['butter', 'lard', 'tallow', 'schmaltz', 'duck fat', 'bacon fat', 'ghee'],
-                'other_fats': ['margarine', 'shortening', 'cooking spray']
-            },
-            
-            # 坐果和种子类
-            'nuts_seeds': {
-                'nuts': ['nut', 'almond', 'walnut', 'pecan', 'cashew', 'pistachio', 'hazelnut', 'macadamia', 'brazil nut', 'pine nut', 'chestnut'],
-                'seeds': ['seed', 'sesame', 'sunflower', 'pumpkin', 'flax', 'chia', 'hemp', 'poppy seed'],
-                'nut_products': ['peanut butter', 'almond butter', 'tahini', 'nut milk', 'almond milk', 'cashew milk']
-            },
-            
-            # 饮料类
-            'beverages': {
-                'alcoholic': ['wine', 'red wine', 'white wine', 'beer', 'vodka', 'rum', 'whiskey', 'gin', 'tequila', 'brandy', 'liqueur', 'champagne', 'prosecco'],
-                'non_alcoholic': ['water', 'juice', 'orange juice', 'apple juice', 'soda', 'coffee', 'tea', 'milk', 'smoothie', 'lemonade', 'iced tea']
-            },
-            
-            # 糖类和甜味料
-            'sweeteners': {
-                'sugars': ['sugar', 'white sugar', 'brown sugar', 'powdered sugar', 'confectioners sugar', 'cane sugar', 'raw sugar', 'demerara sugar'],
-                'syrups': ['syrup', 'maple syrup', 'corn syrup', 'golden syrup', 'agave syrup', 'honey', 'molasses', 'date syrup'],
-                'artificial': ['stevia', 'sweetener', 'aspartame', 'sucralose', 'saccharin']
-            }
-        }
+        # 编译好的匹配规则（分类关键词、替换字典、精确食材数据库等）
+        rules = self.match_rules
         
-        simplified_name, core_ingredients = self.preprocess_ingredient_name(ingredient_name, ingredient_categories)
+        # 预处理复杂食材描述，简化为核心食材名称
+        simplified_name, core_ingredients = self.preprocess_ingredient_name(ingredient_name, rules.ingredient_categories)
         if simplified_name != ingredient_name:
             log_func(f"简化食材名称: '{ingredient_name}' -> '{simplified_name}'")
             if core_ingredients:
                 log_func(f"提取核心食材: {', '.join(core_ingredients)}")
             ingredient_name = simplified_name
         
-        # 食材分类系统 - 更详细的食材分类字典，包含更多的关键词和子类别
-        ingredient_categories = {
-            # 肉类
-            'meat': {
-                'beef': ['beef', 'steak', 'ribeye', 'sirloin', 'brisket', 'ground beef', 'minced beef', 'burger', 'chuck', 'roast beef'],
-                'pork': ['pork', 'ham', 'bacon', 'sausage', 'loin', 'chop', 'tenderloin', 'ground pork', 'minced pork', 'prosciutto', 'pancetta'],
-                'lamb': ['lamb', 'mutton', 'chop', 'rack', 'leg of lamb', 'ground lamb', 'minced lamb'],
-                'poultry': ['chicken', 'turkey', 'duck', 'goose', 'hen', 'breast', 'thigh', 'wing', 'drumstick', 'ground chicken', 'minced chicken'],
-                'game': ['venison', 'rabbit', 'quail', 'pheasant', 'boar', 'bison', 'buffalo'],
-                'processed': ['sausage', 'salami', 'pepperoni', 'jerky', 'meatball', 'meatloaf', 'deli meat', 'cured meat']
-            },
-            
-            # 海鲜类
-            'seafood': {
-                'fish': ['fish', 'salmon', 'tuna', 'cod', 'haddock', 'trout', 'bass', 'tilapia', 'sardine', 'anchovy', 'mackerel', 'halibut', 'snapper', 'mahi mahi', 'swordfish'],
-                'shellfish': ['shrimp', 'prawn', 'king prawn', 'crab', 'lobster', 'crawfish', 'crayfish', 'langoustine'],
-                'mollusks': ['mussel', 'clam', 'oyster', 'scallop', 'squid', 'octopus', 'calamari'],
-                'processed': ['fish stick', 'fish finger', 'fish cake', 'surimi', 'canned tuna', 'canned salmon', 'smoked salmon', 'smoked fish']
-            },
-            
-            # 蔬菜类
-            'vegetables': {
-                'root': ['carrot', 'potato', 'sweet potato', 'yam', 'turnip', 'radish', 'beet', 'beetroot', 'parsnip', 'rutabaga', 'celeriac'],
-                'bulb': ['onion', 'garlic', 'shallot', 'leek', 'spring onion', 'scallion', 'green onion', 'fennel'],
-                'leafy_greens': ['lettuce', 'spinach', 'kale', 'chard', 'arugula', 'rocket', 'collard', 'cabbage', 'bok choy', 'watercress', 'endive', 'radicchio'],
-                'cruciferous': ['broccoli', 'cauliflower', 'brussels sprout', 'cabbage', 'kale', 'bok choy', 'kohlrabi'],
-                'nightshade': ['tomato', 'pepper', 'eggplant', 'aubergine', 'potato', 'chili', 'capsicum', 'bell pepper'],
-                'squash': ['zucchini', 'courgette', 'pumpkin', 'butternut squash', 'acorn squash', 'spaghetti squash', 'gourd'],
-                'legume': ['bean', 'pea', 'lentil', 'chickpea', 'garbanzo', 'kidney bean', 'black bean', 'pinto bean', 'navy bean', 'edamame', 'soybean'],
-                'other': ['cucumber', 'celery', 'asparagus', 'artichoke', 'corn', 'maize', 'mushroom', 'avocado']
-            },
-            
-            # 水果类
-            'fruits': {
-                'berry': ['strawberry', 'blueberry', 'raspberry', 'blackberry', 'cranberry', 'boysenberry', 'gooseberry', 'elderberry', 'mulberry', 'acai berry'],
-                'citrus': ['orange', 'lemon', 'lime', 'grapefruit', 'tangerine', 'mandarin', 'clementine', 'kumquat', 'citron', 'yuzu'],
-                'tropical': ['banana', 'pineapple', 'mango', 'papaya', 'kiwi', 'guava', 'passion fruit', 'lychee', 'dragon fruit', 'star fruit', 'durian'],
-                'stone': ['peach', 'plum', 'nectarine', 'apricot', 'cherry', 'date', 'olive'],
-                'pome': ['apple', 'pear', 'quince'],
-                'melon': ['watermelon', 'cantaloupe', 'honeydew', 'melon'],
-                'dried': ['raisin', 'prune', 'date', 'fig', 'apricot', 'cranberry', 'currant']
-            },
-            
-            # 乳制品类
-            'dairy': {
-                'milk': ['milk', 'whole milk', 'skim milk', 'low-fat milk', 'buttermilk', 'condensed milk', 'evaporated milk'],
-                'cheese': ['cheese', 'cheddar', 'mozzarella', 'parmesan', 'feta', 'gouda', 'brie', 'camembert', 'blue cheese', 'goat cheese', 'ricotta', 'cottage cheese', 'cream cheese'],
-                'cream': ['cream', 'heavy cream', 'whipping cream', 'sour cream', 'creme fraiche', 'half and half'],
-                'yogurt': ['yogurt', 'greek yogurt', 'plain yogurt', 'flavored yogurt', 'kefir'],
-                'butter': ['butter', 'unsalted butter', 'salted butter', 'clarified butter', 'ghee']
-            },
-            
-            # 谷类和面粉类
-            'grains': {
-                'rice': ['rice', 'white rice', 'brown rice', 'jasmine rice', 'basmati rice', 'arborio rice', 'wild rice', 'rice flour'],
-                'wheat': ['wheat', 'flour', 'all-purpose flour', 'bread flour', 'cake flour', 'whole wheat flour', 'semolina', 'bulgur', 'couscous'],
-                'corn': ['corn', 'maize', 'cornmeal', 'polenta', 'grits', 'corn flour', 'cornstarch'],
-                'oats': ['oat', 'oatmeal', 'rolled oats', 'steel-cut oats', 'quick oats'],
-                'other_grains': ['barley', 'quinoa', 'millet', 'rye', 'buckwheat', 'amaranth', 'spelt', 'farro', 'teff'],
-                'pasta': ['pasta', 'spaghetti', 'penne', 'fettuccine', 'linguine', 'macaroni', 'noodle', 'egg noodle', 'rice noodle'],
-                'bread': ['bread', 'white bread', 'whole wheat bread', 'rye bread', 'sourdough', 'baguette', 'roll', 'bun', 'pita', 'naan', 'tortilla']
-            },
-            
-            # 调味料和香料
-            'seasonings': {
-                'herbs': ['basil', 'oregano', 'thyme', 'rosemary', 'parsley', 'cilantro', 'coriander', 'mint', 'dill', 'sage', 'tarragon', 'chive', 'bay leaf', 'marjoram'],
-                'spices': ['pepper', 'black pepper', 'white pepper', 'red pepper', 'chili', 'paprika', 'cumin', 'coriander', 'cinnamon', 'nutmeg', 'clove', 'allspice', 'cardamom', 'turmeric', 'ginger', 'saffron', 'fennel seed', 'star anise'],
-                'salt': ['salt', 'sea salt', 'kosher salt', 'table salt', 'fleur de sel', 'himalayan salt'],
-                'condiments': ['ketchup', 'mustard', 'mayonnaise', 'soy sauce', 'hot sauce', 'worcestershire sauce', 'fish sauce', 'vinegar', 'balsamic vinegar', 'miso', 'tahini']
-            },
-            
-            # 油脂类
-            'oils': {
-                'vegetable_oils': ['oil', 'olive oil', 'vegetable oil', 'canola oil', 'sunflower oil', 'corn oil', 'peanut oil', 'sesame oil', 'coconut oil', 'avocado oil', 'grapeseed oil', 'walnut oil'],
-                'animal_fats': ['butter', 'lard', 'tallow', 'schmaltz', 'duck fat', 'bacon fat', 'ghee'],
-                'other_fats': ['margarine', 'shortening', 'cooking spray']
-            },
-            
-            # 坐果和种子类
-            'nuts_seeds': {
-                'nuts': ['nut', 'almond', 'walnut', 'pecan', 'cashew', 'pistachio', 'hazelnut', 'macadamia', 'brazil nut', 'pine nut', 'chestnut'],
-                'seeds': ['seed', 'sesame', 'sunflower', 'pumpkin', 'flax', 'chia', 'hemp', 'poppy seed'],
-                'nut_products': ['peanut butter', 'almond butter', 'tahini', 'nut milk', 'almond milk', 'cashew milk']
-            },
-            
-            # 饮料类
-            'beverages': {
-                'alcoholic': ['wine', 'red wine', 'white wine', 'beer', 'vodka', 'rum', 'whiskey', 'gin', 'tequila', 'brandy', 'liqueur', 'champagne', 'prosecco'],
-                'non_alcoholic': ['water', 'juice', 'orange juice', 'apple juice', 'soda', 'coffee', 'tea', 'milk', 'smoothie', 'lemonade', 'iced tea']
-            },
-            
-            # 糖类和甜味料
-            'sweeteners': {
-                'sugars': ['sugar', 'white sugar', 'brown sugar', 'powdered sugar', 'confectioners sugar', 'cane sugar', 'raw sugar', 'demerara sugar'],
-                'syrups': ['syrup', 'maple syrup', 'corn syrup', 'golden syrup', 'agave syrup', 'honey', 'molasses', 'date syrup'],
-                'artificial': ['stevia', 'sweetener', 'aspartame', 'sucralose', 'saccharin']
-            }
-        }
-        
-        # 更全面的食材替换字典，包含常见食材的标准名称和同义词
-        ingredient_replacements = {
-            # 海鲜类
-            'prawn': 'shrimp',
-            'prawns': 'shrimp',
-            'king prawn': 'shrimp',
-            'king prawns': 'shrimp',
-            'tiger prawn': 'shrimp',
-            'tiger prawns': 'shrimp',
-            'jumbo prawn': 'shrimp',
-            'jumbo prawns': 'shrimp',
-            'raw prawn': 'shrimp, raw',
-            'raw prawns': 'shrimp, raw',
-            'raw king prawn': 'shrimp, raw',
-            'raw king prawns': 'shrimp, raw',
-            'cooked prawn': 'shrimp, cooked',
-            'cooked prawns': 'shrimp, cooked',
-            'shelled prawn': 'shrimp',
-            'shelled prawns': 'shrimp',
-            'peeled prawn': 'shrimp',
-            'peeled prawns': 'shrimp',
-            'shrimp': 'shrimp',
-            'shrimps': 'shrimp',
-            'raw shrimp': 'shrimp, raw',
-            'cooked shrimp': 'shrimp, cooked',
-            'peeled shrimp': 'shrimp',
-            'deveined shrimp': 'shrimp',
-            
-            # 乳制品
-            'feta': 'cheese, feta',
-            'feta cheese': 'cheese, feta',
-            'cubed feta': 'cheese, feta',
-            'cubed feta cheese': 'cheese, feta',
-            'crumbled feta': 'cheese, feta',
-            'crumbled feta cheese': 'cheese, feta',
-            'greek feta': 'cheese, feta',
-            'greek feta cheese': 'cheese, feta',
-            
-            'cheddar': 'cheese, cheddar',
-            'cheddar cheese': 'cheese, cheddar',
-            'grated cheddar': 'cheese, cheddar',
-            'grated cheddar cheese': 'cheese, cheddar',
-            'shredded cheddar': 'cheese, cheddar',
-            'shredded cheddar cheese': 'cheese, cheddar',
-            'mild cheddar': 'cheese, cheddar',
-            'sharp cheddar': 'cheese, cheddar',
-            'mature cheddar': 'cheese, cheddar',
-            
-            'mozzarella': 'cheese, mozzarella',
-            'mozzarella cheese': 'cheese, mozzarella',
-            'fresh mozzarella': 'cheese, mozzarella',
-            'fresh mozzarella cheese': 'cheese, mozzarella',
-            'grated mozzarella': 'cheese, mozzarella',
-            'grated mozzarella cheese': 'cheese, mozzarella',
-            'shredded mozzarella': 'cheese, mozzarella',
-            'shredded mozzarella cheese': 'cheese, mozzarella',
-            'buffalo mozzarella': 'cheese, mozzarella',
-            
-            'parmesan': 'cheese, parmesan',
-            'parmesan cheese': 'cheese, parmesan',
-            'grated parmesan': 'cheese, parmesan, dry grated',
-            'grated parmesan cheese': 'cheese, parmesan, dry grated',
-            'shredded parmesan': 'cheese, parmesan',
-            'shredded parmesan cheese': 'cheese, parmesan',
-            'parmigiano': 'cheese, parmesan',
-            'parmigiano reggiano': 'cheese, parmesan',
-            'parmigiano-reggiano': 'cheese, parmesan',
-            
-            'ricotta': 'cheese, ricotta',
-            'ricotta cheese': 'cheese, ricotta',
-            'whole milk ricotta': 'cheese, ricotta',
-            'part-skim ricotta': 'cheese, ricotta',
-            
-            'cottage cheese': 'cheese, cottage',
-            'cream cheese': 'cheese, cream',
-            'goat cheese': 'cheese, goat',
-            'blue cheese': 'cheese, blue',
-            'gorgonzola': 'cheese, blue',
-            'roquefort': 'cheese, blue',
-            'stilton': 'cheese, blue',
-            'brie': 'cheese, brie',
-            'camembert': 'cheese, camembert',
-            'gouda': 'cheese, gouda',
-            'swiss cheese': 'cheese, swiss',
-            'gruyere': 'cheese, gruyere',
-            'manchego': 'cheese, manchego',
-            
-            # 油脂
-            'oil': 'oil, vegetable',
-            'olive oil': 'oil, olive',
-            'extra virgin olive oil': 'oil, olive',
-            'evoo': 'oil, olive',
-            'virgin olive oil': 'oil, olive',
-            'light olive oil': 'oil, olive',
-            'vegetable oil': 'oil, vegetable',
-            'canola oil': 'oil, canola',
-            'rapeseed oil': 'oil, canola',
-            'sunflower oil': 'oil, sunflower',
-            'corn oil': 'oil, corn',
-            'peanut oil': 'oil, peanut',
-            'groundnut oil': 'oil, peanut',
-            'sesame oil': 'oil, sesame',
-            'toasted sesame oil': 'oil, sesame',
-            'coconut oil': 'oil, coconut',
-            'avocado oil': 'oil, avocado',
-            'grapeseed oil': 'oil, grapeseed',
-            'walnut oil': 'oil, walnut',
-            'flaxseed oil': 'oil, flaxseed',
-            'palm oil': 'oil, palm',
-            
-            'butter': 'butter, regular, salted',
-            'unsalted butter': 'butter, regular, unsalted',
-            'salted butter': 'butter, regular, salted',
-            'clarified butter': 'butter, clarified',
-            'ghee': 'butter, clarified',
-            'margarine': 'margarine, regular',
-            'lard': 'lard',
-            'shortening': 'shortening, vegetable',
-            'vegetable shortening': 'shortening, vegetable',
-            
-            # 蔬菜
-            'garlic': 'garlic, raw',
-            'minced garlic': 'garlic, raw',
-            'crushed garlic': 'garlic, raw',
-            'chopped garlic': 'garlic, raw',
-            'garlic clove': 'garlic, raw',
-            'garlic cloves': 'garlic, raw',
-            'fresh garlic': 'garlic, raw',
-            'garlic powder': 'garlic powder',
-            
-            'onion': 'onion, raw',
-            'onions': 'onion, raw',
-            'chopped onion': 'onion, raw',
-            'diced onion': 'onion, raw',
-            'sliced onion': 'onion, raw',
-            'minced onion': 'onion, raw',
-            'white onion': 'onion, raw',
-            'yellow onion': 'onion, raw',
-            'red onion': 'onion, raw',
-            'sweet onion': 'onion, raw',
-            'spring onion': 'onions, green, raw',
-            'spring onions': 'onions, green, raw',
-            'green onion': 'onions, green, raw',
-            'green onions': 'onions, green, raw',
-            'scallion': 'onions, green, raw',
-            'scallions': 'onions, green, raw',
-            'shallot': 'shallot, raw',
-            'shallots': 'shallot, raw',
-            
-            'tomato': 'tomato, raw',
-            'tomatoes': 'tomato, raw',
-            'chopped tomato': 'tomato, raw',
-            'chopped tomatoes': 'tomato, raw',
-            'diced tomato': 'tomato, raw',
-            'diced tomatoes': 'tomato, raw',
-            'sliced tomato': 'tomato, raw',
-            'sliced tomatoes': 'tomato, raw',
-            'cherry tomato': 'tomato, raw',
-            'cherry tomatoes': 'tomato, raw',
-            'plum tomato': 'tomato, raw',
-            'plum tomatoes': 'tomato, raw',
-            'roma tomato': 'tomato, raw',
-            'roma tomatoes': 'tomato, raw',
-            'sun-dried tomato': 'tomato, sun-dried',
-            'sun-dried tomatoes': 'tomato, sun-dried',
-            'canned tomato': 'tomatoes, canned',
-            'canned tomatoes': 'tomatoes, canned',
-            'tinned tomato': 'tomatoes, canned',
-            'tinned tomatoes': 'tomatoes, canned',
-            'tomato paste': 'tomato paste',
-            'tomato puree': 'tomato puree',
-            'tomato sauce': 'tomato sauce',
-            'passata': 'tomato puree',
-            
-            'carrot': 'carrot, raw',
-            'carrots': 'carrot, raw',
-            'chopped carrot': 'carrot, raw',
-            'chopped carrots': 'carrot, raw',
-            'diced carrot': 'carrot, raw',
-            'diced carrots': 'carrot, raw',
-            'sliced carrot': 'carrot, raw',
-            'sliced carrots': 'carrot, raw',
-            'grated carrot': 'carrot, raw',
-            'grated carrots': 'carrot, raw',
-            'shredded carrot': 'carrot, raw',
-            'shredded carrots': 'carrot, raw',
-            'baby carrot': 'carrot, raw',
-            'baby carrots': 'carrot, raw',
-            
-            'bell pepper': 'pepper, sweet, raw',
-            'bell peppers': 'pepper, sweet, raw',
-            'red bell pepper': 'pepper, sweet, red, raw',
-            'red bell peppers': 'pepper, sweet, red, raw',
-            'green bell pepper': 'pepper, sweet, green, raw',
-            'green bell peppers': 'pepper, sweet, green, raw',
-            'yellow bell pepper': 'pepper, sweet, yellow, raw',
-            'yellow bell peppers': 'pepper, sweet, yellow, raw',
-            'orange bell pepper': 'pepper, sweet, orange, raw',
-            'orange bell peppers': 'pepper, sweet, orange, raw',
-            'capsicum': 'pepper, sweet, raw',
-            'red capsicum': 'pepper, sweet, red, raw',
-            'green capsicum': 'pepper, sweet, green, raw',
-            'yellow capsicum': 'pepper, sweet, yellow, raw',
-            'orange capsicum': 'pepper, sweet, orange, raw',
-            
-            # 香草和调味料
-            'parsley': 'parsley, raw',
-            'fresh parsley': 'parsley, raw',
-            'chopped parsley': 'parsley, raw',
-            'freshly chopped parsley': 'parsley, raw',
-            'flat-leaf parsley': 'parsley, raw',
-            'curly parsley': 'parsley, raw',
-            'italian parsley': 'parsley, raw',
-            'dried parsley': 'parsley, dried',
-            
-            'basil': 'basil, raw',
-            'fresh basil': 'basil, raw',
-            'chopped basil': 'basil, raw',
-            'fresh chopped basil': 'basil, raw',
-            'basil leaves': 'basil, raw',
-            'fresh basil leaves': 'basil, raw',
-            'dried basil': 'basil, dried',
-            'thai basil': 'basil, raw',
-            'holy basil': 'basil, raw',
-            
-            'cilantro': 'cilantro, raw',
-            'fresh cilantro': 'cilantro, raw',
-            'chopped cilantro': 'cilantro, raw',
-            'fresh chopped cilantro': 'cilantro, raw',
-            'cilantro leaves': 'cilantro, raw',
-            'coriander leaves': 'cilantro, raw',
-            'fresh coriander': 'cilantro, raw',
-            'chinese parsley': 'cilantro, raw',
-            
-            'rosemary': 'rosemary, raw',
-            'fresh rosemary': 'rosemary, raw',
-            'dried rosemary': 'rosemary, dried',
-            'rosemary sprig': 'rosemary, raw',
-            'rosemary sprigs': 'rosemary, raw',
-            
-            'thyme': 'thyme, raw',
-            'fresh thyme': 'thyme, raw',
-            'dried thyme': 'thyme, dried',
-            'thyme sprig': 'thyme, raw',
-            'thyme sprigs': 'thyme, raw',
-            
-            'oregano': 'oregano, raw',
-            'fresh oregano': 'oregano, raw',
-            'dried oregano': 'oregano, dried',
-            
-            'mint': 'mint, raw',
-            'fresh mint': 'mint, raw',
-            'dried mint': 'mint, dried',
-            'mint leaves': 'mint, raw',
-            'peppermint': 'mint, raw',
-            'spearmint': 'mint, raw',
-            
-            'sage': 'sage, raw',
-            'fresh sage': 'sage, raw',
-            'dried sage': 'sage, dried',
-            'sage leaves': 'sage, raw',
-            
-            'dill': 'dill, raw',
-            'fresh dill': 'dill, raw',
-            'dried dill': 'dill, dried',
-            'dill weed': 'dill, raw',
-            
-            'chive': 'chives, raw',
-            'chives': 'chives, raw',
-            'fresh chives': 'chives, raw',
-            'dried chives': 'chives, dried',
-            'chopped chives': 'chives, raw',
-            
-            'bay leaf': 'bay leaf, dried',
-            'bay leaves': 'bay leaf, dried',
-            'dried bay leaf': 'bay leaf, dried',
-            'dried bay leaves': 'bay leaf, dried',
-            
-            'black pepper': 'pepper, black',
-            'ground black pepper': 'pepper, black',
-            'freshly ground black pepper': 'pepper, black',
-            'cracked black pepper': 'pepper, black',
-            'white pepper': 'pepper, white',
-            'ground white pepper': 'pepper, white',
-            
-            'salt': 'salt, table',
-            'table salt': 'salt, table',
-            'sea salt': 'salt, sea',
-            'kosher salt': 'salt, kosher',
-            'fleur de sel': 'salt, sea',
-            'himalayan salt': 'salt, himalayan',
-            'pink salt': 'salt, himalayan',
-            
-            # 饮料
-            'white wine': 'wine, white',
-            'dry white wine': 'wine, white',
-            'sweet white wine': 'wine, white',
-            'red wine': 'wine, red',
-            'dry red wine': 'wine, red',
-            'full-bodied red wine': 'wine, red',
-            'rose wine': 'wine, rose',
-            'rosé wine': 'wine, rose',
-            'sparkling wine': 'wine, sparkling',
-            'champagne': 'wine, champagne',
-            'prosecco': 'wine, prosecco',
-            'cooking wine': 'wine, cooking',
-            'rice wine': 'wine, rice',
-            'mirin': 'wine, rice',
-            'sake': 'wine, rice',
-            'sherry': 'wine, sherry',
-            'port': 'wine, port',
-            'marsala': 'wine, marsala',
-            'madeira': 'wine, madeira',
-            'vermouth': 'wine, vermouth',
-            
-            # 特殊处理
-            'extra virgin': '',
-            'virgin': '',
-            'freshly': '',
-            'fresh': '',
-            'frozen': '',
-            'dried': '',
-            'canned': '',
-            'tinned': '',
-            'jarred': '',
-            'bottled': '',
-            'packaged': '',
-            'whole': '',
-            'half': '',
-            'quarter': '',
-            'sliced': '',
-            'diced': '',
-            'chopped': '',
-            'minced': '',
-            'grated': '',
-            'shredded': '',
-            'julienned': '',
-            'cubed': '',
-            'crushed': '',
-            'mashed': '',
-            'pureed': '',
-            'ground': '',
-            'crumbled': '',
-            'torn': '',
-            'peeled': '',
-            'skinless': '',
-            'boneless': '',
-            'skin-on': '',
-            'bone-in': '',
-            'large': '',
-            'medium': '',
-            'small': '',
-            'baby': '',
-            'mini': '',
-            'giant': '',
-            'ripe': '',
-            'unripe': '',
-            'overripe': '',
-            'green': '',
-            'red': '',
-            'yellow': '',
-            'orange': '',
-            'purple': '',
-            'black': '',
-            'white': '',
-            'brown': '',
-            'pink': '',
-            'golden': '',
-            'dark': '',
-            'light': '',
-            'mild': '',
-            'hot': '',
-            'spicy': '',
-            'sweet': '',
-            'sour': '',
-            'bitter': '',
-            'salty': '',
-            'savory': '',
-            'umami': '',
-            'organic': '',
-            'free-range': '',
-            'grass-fed': '',
-            'wild-caught': '',
-            'farm-raised': '',
-            'homemade': '',
-            'store-bought': '',
-            'commercial': '',
-            'premium': '',
-            'quality': '',
-            'lean': '',
-            'fatty': '',
-            'fat-free': '',
-            'low-fat': '',
-            'full-fat': '',
-            'reduced-fat': '',
-            'unsalted': '',
-            'salted': '',
-            'sweetened': '',
-            'unsweetened': '',
-            'roasted': '',
-            'toasted': '',
-            'grilled': '',
-            'broiled': '',
-            'baked': '',
-            'fried': '',
-            'deep-fried': '',
-            'pan-fried': '',
-            'stir-fried': '',
-            'sauteed': '',
-            'sautéed': '',
-            'boiled': '',
-            'steamed': '',
-            'poached': '',
-            'braised': '',
-            'stewed': '',
-            'smoked': '',
-            'cured': '',
-            'pickled': '',
-            'fermented': '',
-            'marinated': '',
-            'seasoned': '',
-            'spiced': '',
-            'flavored': '',
-            'infused': '',
-            'stuffed': '',
-            'filled': '',
-            'topped': '',
-            'garnished': '',
-            'mixed': '',
-            'blended': '',
-            'combined': '',
-            'prepared': '',
-            'ready-to-use': '',
-            'ready-to-eat': '',
-            'instant': '',
-            'quick': '',
-            'slow': '',
-            'overnight': '',
-            'day-old': ''
-        }
-        
         # 尝试直接替换
-        if ingredient_name in ingredient_replacements:
-            replacement = ingredient_replacements[ingredient_name]
+        if ingredient_name in rules.ingredient_replacements:
+            replacement = rules.ingredient_replacements[ingredient_name]
             logger.info(f"直接替换: '{ingredient_name}' -> '{replacement}'")
             ingredient_name = replacement
         else:
-            # 尝试部分替换
-            for key, value in ingredient_replacements.items():
-                if key in ingredient_name:
-                    ingredient_name = ingredient_name.replace(key, value)
-                    logger.info(f"部分替换: '{key}' -> '{value}' in '{original_name}'")
-                    break
+            # 尝试部分替换（按替换表顺序取第一个出现的键）
+            partial = rules.find_replacement(ingredient_name)
+            if partial:
+                key, value = partial
+                ingredient_name = ingredient_name.replace(key, value)
+                logger.info(f"部分替换: '{key}' -> '{value}' in '{original_name}'")
         
-        # 确定食材的主类别和子类别
-        main_category = None
-        sub_category = None
-        category_keywords = []
-        
-        # 首先确定主类别
-        for category, subcategories in ingredient_categories.items():
-            # 收集所有关键词以进行简单检查
-            all_keywords = []
-            for subcat, keywords in subcategories.items():
-                all_keywords.extend(keywords)
-            
-            # 检查是否包含任何关键词
-            for keyword in all_keywords:
-                if keyword in ingredient_name:
-                    main_category = category
-                    category_keywords.append(keyword)
-                    break
-            
-            if main_category:
-                # 如果找到主类别，尝试确定子类别
-                for subcat, keywords in subcategories.items():
-                    for keyword in keywords:
-                        if keyword in ingredient_name:
-                            sub_category = subcat
-                            if keyword not in category_keywords:
-                                category_keywords.append(keyword)
-                            break
-                    if sub_category:
-                        break
-                break
+        # 确定食材的主类别、子类别和命中的关键词
+        main_category, sub_category, category_keywords = rules.detect_category(ingredient_name)
         
         if main_category:
             if sub_category:
@@ -811,248 +687,54 @@ class RecipeNutritionCalculator:
                 log_func(f"确定食材主类别: '{ingredient_name}' -> {main_category} (关键词: {', '.join(category_keywords)})")
         else:
             log_func(f"无法确定食材类别: '{ingredient_name}'")
-            
-        # 将主类别存储为类别信息，以与其他代码兼容
-        ingredient_category = main_category
         
-        # 定义一个函数来计算匹配分数
-        def calculate_match_score(desc, ingredient, category=None, subcategory=None, keywords=None):
-            desc_lower = desc.lower()
-            score = 0
-            
-            # 精确匹配得分最高
-            if desc_lower == ingredient.lower():
-                score += 200  # 提高精确匹配的分数
-                
-            # 如果食材名称是描述的子字符串，得分较高
-            elif ingredient.lower() in desc_lower:
-                score += 100  # 提高子字符串匹配的分数
-                
-                # 如果在开头或结尾，得分更高
-                if desc_lower.startswith(ingredient.lower()):
-                    score += 30  # 提高开头匹配的分数
-                if desc_lower.endswith(ingredient.lower()):
-                    score += 15  # 提高结尾匹配的分数
-            
-            # 如果有关键词匹配，根据匹配关键词数量增加分数
-            if keywords:
-                for keyword in keywords:
-                    if keyword in desc_lower:
-                        # 根据关键词长度增加权重，越长的关键词权重越高
-                        keyword_weight = min(len(keyword), 10)  # 限制最大权重为10
-                        score += 5 * keyword_weight  # 每个关键词匹配加5*权重分
-            
-            # 如果有类别信息，检查是否匹配类别
-            if category and category in ingredient_categories:
-                # 收集该类别的所有关键词
-                category_keywords = []
-                for subcat, kwords in ingredient_categories[category].items():
-                    category_keywords.extend(kwords)
-                
-                # 检查是否包含类别关键词
-                for keyword in category_keywords:
-                    if keyword in desc_lower:
-                        score += 20  # 提高类别匹配的分数
-                        break
-                
-                # 如果有子类别信息，检查是否匹配子类别
-                if subcategory and subcategory in ingredient_categories[category]:
-                    subcategory_keywords = ingredient_categories[category][subcategory]
-                    for keyword in subcategory_keywords:
-                        if keyword in desc_lower:
-                            score += 30  # 提高子类别匹配的分数
-                            break
-            
-            # 如果是复合食材名称，检查每个单词的匹配情况
-            if ' ' in ingredient:
-                words = ingredient.split()
-                matched_words = 0
-                word_weights = {}
-                
-                # 给每个单词分配权重
-                for word in words:
-                    # 忽略过短的单词
-                    if len(word) <= 2:
-                        continue
-                        
-                    # 检查是否是核心食材关键词
-                    is_core_keyword = False
-                    for cat, subcats in ingredient_categories.items():
-                        for subcat, keywords in subcats.items():
-                            if any(keyword == word or word in keyword for keyword in keywords):
-                                is_core_keyword = True
-                                break
-                        if is_core_keyword:
-                            break
-                    
-                    # 根据单词长度和是否是核心关键词分配权重
-                    word_weight = len(word)
-                    if is_core_keyword:
-                        word_weight *= 3  # 核心关键词权重乘3倍
-                    word_weights[word] = word_weight
-                
-                # 计算匹配分数
-                for word, weight in word_weights.items():
-                    if word in desc_lower:
-                        matched_words += 1
-                        score += 5 * weight  # 每个单词匹配加5*权重分
-                
-                # 如果匹配了多个单词，额外加分
-                if matched_words >= 2:
-                    score += matched_words * 10
-                    
-                # 如果匹配了所有单词，额外加分
-                if matched_words == len(word_weights):
-                    score += 50  # 提高完全匹配的分数
-            
-            # 定义常见纯净食材列表（基于常见食材）
-            pure_ingredients = [
-                'butter', 'garlic', 'olive oil', 'onion', 'salt', 'eggs', 'water', 'sugar', 
-                'potatoes', 'milk', 'flour', 'pepper', 'carrots', 'parsley', 'vegetable oil', 
-                'soy sauce', 'rice', 'tomatoes', 'chicken', 'beef', 'pork', 'lamb', 'fish', 'salmon',
-                'tuna', 'shrimp', 'cheese', 'cream', 'yogurt', 'lemon', 'lime', 'orange', 'apple',
-                'banana', 'berries', 'strawberry', 'blueberry', 'raspberry', 'nuts', 'almonds',
-                'walnuts', 'peanuts', 'beans', 'pasta', 'noodles', 'bread', 'wine', 'vinegar',
-                'honey', 'maple syrup', 'chocolate', 'vanilla', 'cinnamon', 'cumin', 'basil',
-                'oregano', 'thyme', 'rosemary', 'ginger', 'mushrooms', 'avocado', 'cucumber',
-                'lettuce', 'spinach', 'kale', 'cabbage', 'broccoli', 'cauliflower', 'corn',
-                'peas', 'bell pepper', 'chili', 'bacon', 'ham', 'sausage', 'tofu', 'quinoa'
-            ]
-            
-            # 优先匹配纯净食材（不含复杂关键词）
-            complex_indicators = ['mixed', 'with', 'and', 'in', 'or', 'plus', 'topped', 'stuffed', 'filled', 'coated', 'breaded', 'battered']
-            if not any(indicator in desc_lower for indicator in complex_indicators):
-                score += 25  # 显著提高纯净食材的分数
-                
-            # 检查是否是常见纯净食材
-            for pure in pure_ingredients:
-                # 如果描述以纯净食材开头，且长度不超过纯净食材的两倍，认为是纯净描述
-                if desc_lower.startswith(pure) and len(desc_lower) < len(pure) * 2.5:
-                    score += 100  # 纯净食材描述加高分
-                    break
-                # 如果描述完全匹配纯净食材
-                elif desc_lower == pure:
-                    score += 150  # 完全匹配纯净食材加更高分
-                    break
-            
-            # 惩罚复杂描述（包含多个逗号的描述通常是复合食材）
-            comma_count = desc_lower.count(',')
-            if comma_count > 1:
-                score -= comma_count * 30  # 每多一个逗号减分
-                
-            # 优先匹配原始食材（raw）
-            if 'raw' in desc_lower:
-                score += 15  # 提高原始食材的分数
-                
-            # 如果是油类特殊处理
-            if 'oil' in ingredient.lower() and 'oil' in desc_lower:
-                score += 50  # 特别处理油类食材
-                
-            # 如果是香料和调味料特殊处理
-            if any(spice in ingredient.lower() for spice in ['pepper', 'salt', 'spice', 'herb', 'seasoning']):
-                if any(spice in desc_lower for spice in ['pepper', 'salt', 'spice', 'herb', 'seasoning']):
-                    score += 100  # 显著提高香料和调味料的分数
-                    
-                    # 直接匹配盐类
-                    if 'salt' in ingredient.lower():
-                        if desc_lower == 'salt, table' or desc_lower.startswith('salt,'):
-                            score += 200  # 直接匹配盐类加更高分
-                        # 惩罚含有cheese的盐类匹配
-                        if 'cheese' in desc_lower:
-                            score -= 300  # 强烈惩罚将盐匹配到奶酪
-                    
-                    # 直接匹配胡椒类
-                    if 'pepper' in ingredient.lower() and 'black' in ingredient.lower():
-                        if desc_lower == 'pepper, black' or desc_lower.startswith('pepper, black'):
-                            score += 200  # 直接匹配黑胡椒加更高分
-                        # 惩罚含有bell pepper或hot pepper的匹配
-                        if 'bell pepper' in desc_lower or 'hot pepper' in desc_lower or 'sweet pepper' in desc_lower:
-                            score -= 300  # 强烈惩罚将黑胡椒匹配到辣椒
-                    
-            return score
-        
-        # 先检查精确食材数据库中是否有匹配
-        precise_ingredient_db = {
-            # 调味料和香料
-            'salt': 'salt, table',
-            'sea salt': 'salt, table',
-            'table salt': 'salt, table',
-            'kosher salt': 'salt, table',
-            'himalayan salt': 'salt, table',
-            'fleur de sel': 'salt, table',
-            'salt flakes': 'salt, table',
-            'pinch of salt': 'salt, table',
-            'pinch of sea salt': 'salt, table',
-            'black pepper': 'pepper, black',
-            'ground black pepper': 'pepper, black',
-            'freshly ground black pepper': 'pepper, black',
-            'cracked black pepper': 'pepper, black',
-            'ground pepper': 'pepper, black',
-            'pepper': 'pepper, black',  # 默认将pepper视为黑胡椒
-            'white pepper': 'pepper, white',
-            'ground white pepper': 'pepper, white',
-            
-            # 乳制品
-            'butter': 'butter, nfs',
-            'unsalted butter': 'butter, nfs',
-            'salted butter': 'butter, regular, salted',
-            'clarified butter': 'butter, nfs',
-            'ghee': 'butter, nfs',
-            'heavy cream': 'cream, heavy',
-            'whipping cream': 'cream, heavy',
-            'sour cream': 'cream, sour',
-            'cream': 'cream, nfs',
-            
-            # 其他常见食材
-            'olive oil': 'olive oil',
-            'extra virgin olive oil': 'olive oil',
-            'garlic': 'garlic, raw',
-            'minced garlic': 'garlic, raw',
-            'onion': 'onions, raw',
-            'chopped onion': 'onions, raw',
-            'tomato': 'tomatoes, raw',
-            'chopped tomatoes': 'tomatoes, raw',
-            'parsley': 'parsley, raw',
-            'fresh parsley': 'parsley, raw',
-            'chopped parsley': 'parsley, raw',
-            'freshly chopped parsley': 'parsley, raw'
-        }
+        # 字典层级的匹配结果（描述, 层级）
+        dictionary_match = None
         
         # 检查精确食材数据库
-        for key, value in precise_ingredient_db.items():
-            if ingredient_name.lower() == key.lower() or ingredient_name.lower().startswith(key.lower() + ' ') or ingredient_name.lower().endswith(' ' + key.lower()):
+        ingredient_lower = ingredient_name.lower()
+        for key, key_prefix, key_suffix, value in rules.precise_items:
+            if ingredient_lower == key or ingredient_lower.startswith(key_prefix) or ingredient_lower.endswith(key_suffix):
                 # 确保这个精确匹配存在于食品描述中
-                if value in self.food_descriptions:
+                if value in self.food_row_index:
                     log_func(f"使用精确食材数据库匹配: '{ingredient_name}' -> '{value}'")
-                    return value
+                    dictionary_match = (value, 'precise')
+                    break
         
         # 尝试精确匹配
-        exact_matches = [desc for desc in self.food_descriptions if desc.lower() == ingredient_name.lower()]
-        if exact_matches:
-            log_func(f"找到精确匹配: '{ingredient_name}' -> '{exact_matches[0]}'")
-            return exact_matches[0]
-        
-        # 如果没有精确匹配，对所有可能的匹配进行评分
-        potential_matches = []
-        
-        # 收集所有可能的匹配
-        for desc in self.food_descriptions:
-            # 计算匹配分数
-            score = calculate_match_score(
-                desc, 
-                ingredient_name, 
-                main_category, 
-                sub_category, 
-                category_keywords
-            )
-            
-            # 只考虑分数超过10的匹配
-            if score > 10:
-                potential_matches.append((desc, score))
+        if dictionary_match is None and ingredient_lower in self.food_row_index:
+            log_func(f"找到精确匹配: '{ingredient_name}' -> '{ingredient_lower}'")
+            dictionary_match = (ingredient_lower, 'exact')
+        
+        # 容忍拼写错误的字典键查找（精确食材数据库、替换表、常见食材表）
+        if dictionary_match is None:
+            typo_match = self.find_typo_match(ingredient_lower)
+            if typo_match:
+                key, distance, value = typo_match
+                log_func(f"拼写容错匹配: '{ingredient_name}' -> '{key}' (编辑距离 {distance}) -> '{value}'")
+                dictionary_match = (value, 'typo')
+        
+        if dictionary_match is not None:
+            matches = [(dictionary_match[0], None, dictionary_match[1])]
+            if k > 1:
+                # 用模糊评分的候选补足其余结果
+                for match, score in self._fuzzy_food_matches(
+                    ingredient_name, main_category, sub_category, category_keywords, k
+                ):
+                    if match != dictionary_match[0] and len(matches) < k:
+                        matches.append((match, score, 'scan'))
+            return matches
+        
+        # 如果没有精确匹配，对所有可能的匹配进行评分（至少保留分数最高的前3个用于日志）
+        potential_matches = self._fuzzy_food_matches(
+            ingredient_name,
+            main_category,
+            sub_category,
+            category_keywords,
+            max(k, 3) if verbose else k
+        )
         
-        # 按分数降序排序
         if potential_matches:
-            potential_matches.sort(key=lambda x: x[1], reverse=True)
             best_match = potential_matches[0][0]
             best_score = potential_matches[0][1]
             
@@ -1063,308 +745,334 @@ class RecipeNutritionCalculator:
                     log_func(f"  {i}. '{match}' (分数: {score})")
             
             log_func(f"找到最佳匹配: '{ingredient_name}' -> '{best_match}' (分数: {best_score})")
-            return best_match
+            return [(match, score, 'scan') for match, score in potential_matches[:k]]
         
-        # 如果仍然没有匹配，尝试使用其他常见食材匹配
-        other_common_ingredients = {
-            
-            # 肉类
-            'beef': 'beef, ground, raw',
-            'steak': 'beef, steak, raw',
-            'ground beef': 'beef, ground, raw',
-            'minced beef': 'beef, ground, raw',
-            'pork': 'pork, raw',
-            'ham': 'ham, sliced, regular',
-            'bacon': 'pork bacon, raw',
-            'chicken': 'chicken, meat only, raw',
-            'chicken breast': 'chicken, breast, meat only, raw',
-            'turkey': 'turkey, meat only, raw',
-            'lamb': 'lamb, raw',
-            'duck': 'duck, meat only, raw',
-            'sausage': 'sausage, pork, raw',
-            
-            # 海鲜类
-            'fish': 'fish, nfs',
-            'salmon': 'salmon, raw',
-            'tuna': 'tuna, raw',
-            'cod': 'cod, raw',
-            'shrimp': 'shrimp, raw',
-            'prawn': 'shrimp, nfs',
-            'king prawn': 'shrimp, nfs',
-            'crab': 'crab, raw',
-            'lobster': 'lobster, raw',
-            'mussel': 'mussel, raw',
-            'clam': 'clam, raw',
-            'oyster': 'oyster, raw',
-            'scallop': 'scallop, raw',
-            'squid': 'squid, raw',
-            'octopus': 'octopus, raw',
-            
-            # 蔬菜类
-            'vegetable': 'vegetables, nfs',
-            'carrot': 'carrot, raw',
-            'potato': 'potato, raw',
-            'onion': 'onion, raw',
-            'chopped onion': 'onion, raw',
-            'garlic': 'garlic, raw',
-            'minced garlic': 'garlic, raw',
-            'tomato': 'tomato, raw',
-            'chopped tomatoes': 'tomato, raw',
-            'pepper': 'pepper, sweet, raw',
-            'bell pepper': 'pepper, sweet, raw',
-            'lettuce': 'lettuce, raw',
-            'spinach': 'spinach, raw',
-            'broccoli': 'broccoli, raw',
-            'cauliflower': 'cauliflower, raw',
-            'cabbage': 'cabbage, raw',
-            'zucchini': 'zucchini, raw',
-            'eggplant': 'eggplant, raw',
-            'cucumber': 'cucumber, with peel, raw',
-            'celery': 'celery, raw',
-            'corn': 'corn, raw',
-            'pea': 'peas, green, raw',
-            'bean': 'beans, string, green, raw',
-            'lentil': 'lentils, raw',
-            
-            # 水果类
-            'fruit': 'fruit, nfs',
-            'apple': 'apple, raw',
-            'banana': 'banana, raw',
-            'orange': 'orange, raw',
-            'lemon': 'lemon, raw',
-            'lime': 'lime, raw',
-            'grape': 'grapes, raw',
-            'strawberry': 'strawberries, raw',
-            'blueberry': 'blueberries, raw',
-            'raspberry': 'raspberries, raw',
-            'blackberry': 'blackberries, raw',
-            'melon': 'melon, nfs, raw',
-            'watermelon': 'watermelon, raw',
-            'pineapple': 'pineapple, raw',
-            'mango': 'mango, raw',
-            'peach': 'peach, raw',
-            'pear': 'pear, raw',
-            'plum': 'plum, raw',
-            'cherry': 'cherries, raw',
-            'kiwi': 'kiwi fruit, raw',
-            
-            # 乳制品类
-            'milk': 'milk, nfs',
-            'cheese': 'cheese, nfs',
-            'feta': 'cheese, feta',
-            'feta cheese': 'cheese, feta',
-            'cubed feta cheese': 'cheese, feta',
-            'cheddar': 'cheese, cheddar',
-            'mozzarella': 'cheese, mozzarella',
-            'parmesan': 'cheese, parmesan',
-            'yogurt': 'yogurt, plain',
-            'cream': 'cream, nfs',
-            'heavy cream': 'cream, heavy',
-            'whipping cream': 'cream, heavy',
-            'sour cream': 'cream, sour',
-            'butter': 'butter, nfs',
-            'unsalted butter': 'butter, nfs',
-            'salted butter': 'butter, regular, salted',
-            'clarified butter': 'butter, nfs',
-            'ghee': 'butter, nfs',
-            
-            # 谷类和面粉类
-            'flour': 'flour, wheat, white, all purpose',
-            'rice': 'rice, white, nfs',
-            'pasta': 'pasta, nfs',
-            'bread': 'bread, white',
-            'oat': 'oats, raw',
-            'cereal': 'cereal, nfs',
-            'wheat': 'wheat, nfs',
-            'barley': 'barley, raw',
-            'quinoa': 'quinoa, raw',
-            'noodle': 'noodles, egg, raw',
+        # 如果仍然没有匹配，尝试在精确食材数据库中查找包含关系的匹配
+        for key, _, _, value in rules.precise_items:
+            if ingredient_lower == key or key in ingredient_lower:
+                log_func(f"使用精确食材数据库匹配: '{ingredient_name}' -> '{value}'")
+                return [(value, None, 'precise_contains')]
+        
+        # 如果仍然没有匹配，尝试根据类别进行默认匹配
+        if main_category and main_category in rules.default_matches:
+            default_matches = rules.default_matches[main_category]
+            # 如果有子类别信息，使用子类别默认匹配
+            if sub_category and sub_category in default_matches:
+                default_match = default_matches[sub_category]
+                log_func(f"使用子类别默认匹配: '{ingredient_name}' -> '{default_match}' ({main_category}/{sub_category})")
+                return [(default_match, None, 'default')]
+            # 如果没有子类别信息或子类别不存在，使用主类别默认匹配
+            else:
+                default_match = default_matches['default']
+                log_func(f"使用主类别默认匹配: '{ingredient_name}' -> '{default_match}' ({main_category})")
+                return [(default_match, None, 'default')]
+        
+        # 没有找到匹配项
+        if verbose:
+            logger.warning(f"未找到食材匹配: '{original_name}'")
+        else:
+            logger.debug(f"未找到食材匹配: '{original_name}'")
+        return []
+
+    def _chinese_food_matches(self, ingredient_name, k, verbose):
+        """
+        用中英对照表中出现在名称里的最长中文名称（如 "去皮鸡胸肉" 中的 "鸡胸肉"）
+        转为英文名称后匹配；对照表中没有的中文名称不再做英文模糊评分（对中文总是失败）
+        
+        返回:
+            list: [(食品描述, 分数, 匹配层级), ...]，第一个结果的层级为 chinese
+        """
+        log_func = logger.info if verbose else logger.debug
+        hit = self.match_rules.find_chinese_name(ingredient_name.lower())
+        if hit is None:
+            # 中英混合的名称去掉中文部分后按英文匹配
+            english_part = ' '.join(CJK_CHARACTER_PATTERN.sub(' ', ingredient_name).split())
+            if re.search(r'[a-zA-Z]', english_part):
+                return self._find_food_matches(english_part, k, verbose) or []
+            log_func(f"中英对照表中没有该中文名称: '{ingredient_name}'")
+            return []
+        
+        key, english_name = hit
+        log_func(f"中文名称对照: '{ingredient_name}' -> '{key}' -> '{english_name}'")
+        matches = self._find_food_matches(english_name, k, verbose) or []
+        if matches:
+            description, score, _ = matches[0]
+            matches[0] = (description, score, 'chinese')
+        return matches
+
+    def _fuzzy_food_matches(self, ingredient, category, subcategory, keywords, limit):
+        """
+        使用当前匹配后端返回模糊评分最高的前 limit 个匹配
+        
+        返回:
+            list: [(食品描述, 分数), ...]
+        """
+        if self.matcher == "tfidf":
+            return self.tfidf_food_matches(ingredient, limit=limit)
+        return self.score_food_matches(ingredient, category, subcategory, keywords, limit=limit)
+
+    def _count_match_tier(self, tier):
+        """记录一次由指定匹配层级解析的食材"""
+        self.match_tier_counts[tier] = self.match_tier_counts.get(tier, 0) + 1
+
+    def _build_typo_index(self):
+        """
+        为精确食材数据库、替换表和常见食材表的键构建对称删除索引
+        
+        只收录最终能解析到数据库中食品描述的键；替换表的值是食材名称，
+        先通过精确食材数据库或常见食材表转换为食品描述。同一个键出现在多个字典中时，
+        按 精确食材数据库 > 替换表 > 常见食材表 的顺序取值。
+        """
+        rules = self.match_rules
+        targets = {}
+        for key, value in rules.precise_ingredient_db.items():
+            targets.setdefault(key.lower(), value)
+        for key, value in rules.ingredient_replacements.items():
+            value = rules.precise_ingredient_db.get(value) or rules.other_common_ingredients.get(value) or value
+            targets.setdefault(key.lower(), value)
+        for key, value in rules.other_common_ingredients.items():
+            targets.setdefault(key.lower(), value)
+        
+        self._typo_targets = {key: value for key, value in targets.items() if value in self.food_row_index}
+        self._typo_index = SymmetricDeleteIndex(self._typo_targets, max_distance=2)
+        
+        # 已知单词（字典键、分类关键词和食品描述中的单词），这些单词不会被当作拼写错误
+        vocabulary = set()
+        for text in list(targets) + list(rules.keyword_categories) + self.food_descriptions:
+            if isinstance(text, str):
+                vocabulary.update(re.findall(r"[a-z]+", text.lower()))
+        self._typo_vocabulary = vocabulary
+
+    def find_typo_match(self, ingredient):
+        """
+        查找与食材名称编辑距离最近的字典键（允许的距离随名称长度增加）
+        
+        只纠正拼写错误: 名称本身就是字典键时不返回结果（由原有的匹配层级处理）；
+        候选键与名称的单词数必须相同，且只能改动词汇表中不存在的单词，
+        避免把 "coconut milk" 之类的正确名称改成 "coconut oil"。
+        
+        参数:
+            ingredient (str): 小写的食材名称
             
-            # 调味料和香料
-            'salt': 'salt, table',
-            'pepper': 'pepper, black',
-            'spice': 'spices, nfs',
-            'herb': 'herbs, nfs',
-            'basil': 'basil, fresh',
-            'oregano': 'oregano, fresh',
-            'thyme': 'thyme, fresh',
-            'rosemary': 'rosemary, fresh',
-            'parsley': 'parsley, fresh',
-            'freshly chopped parsley': 'parsley, raw',
-            'cilantro': 'cilantro, fresh',
-            'coriander': 'coriander, fresh',
-            'cumin': 'cumin, ground',
-            'paprika': 'paprika',
-            'cinnamon': 'cinnamon, ground',
-            'nutmeg': 'nutmeg, ground',
-            'ginger': 'ginger root, raw',
-            'turmeric': 'turmeric, ground',
+        返回:
+            tuple: (字典键, 编辑距离, 食品描述)，没有找到时返回 None
+        """
+        if self._typo_index is None:
+            self._build_typo_index()
+        # 多余的空格（例如替换后留下的空格）不算拼写错误
+        words = ingredient.split()
+        ingredient = ' '.join(words)
+        for key, distance in self._typo_index.candidates(ingredient, max_typo_distance(ingredient)):
+            if distance == 0:
+                return None
+            key_words = key.split()
+            if len(key_words) != len(words):
+                continue
+            if all(word == key_word or word not in self._typo_vocabulary
+                   for word, key_word in zip(words, key_words)):
+                return key, distance, self._typo_targets[key]
+        return None
+
+    def score_food_matches(self, ingredient, category=None, subcategory=None, keywords=None, limit=3):
+        """
+        对食品描述评分，返回分数超过10的前 limit 个匹配
+        
+        启用候选索引时，只有包含触发串的描述需要按描述特征评分，其余描述的分数等于静态分加常数；
+        numpy 引擎对全部描述一次计算分数向量。各种方式的结果与全量扫描完全一致。
+        
+        参数:
+            ingredient (str): 预处理后的食材名称
+            category (str): 食材主类别
+            subcategory (str): 食材子类别
+            keywords (list): 识别类别时命中的关键词
+            limit (int): 返回的匹配数量
             
-            # 油脂类
-            'oil': 'oil, vegetable, nfs',
-            'olive oil': 'oil, olive',
-            'vegetable oil': 'oil, vegetable, nfs',
-            'canola oil': 'oil, canola',
-            'sunflower oil': 'oil, sunflower',
-            'sesame oil': 'oil, sesame',
-            'coconut oil': 'oil, coconut',
-            'margarine': 'margarine, regular',
-            'lard': 'lard',
-            'shortening': 'shortening, vegetable',
+        返回:
+            list: [(食品描述, 分数), ...]，按分数降序，分数相同时保持数据库顺序
+        """
+        index = self._match_index
+        if self.engine == "numpy":
+            # 向量化引擎: 一次计算全部描述的分数向量
+            if self._numpy_engine is None:
+                self._numpy_engine = NumpyMatchEngine(index)
+            query = MatchQuery(ingredient, category, subcategory, keywords, self.match_rules)
+            return [
+                (self.food_descriptions[desc_id], score)
+                for desc_id, score in self._numpy_engine.top_matches(query, limit)
+            ]
+        
+        if index is None:
+            # 全量扫描: 对每个描述调用 calculate_match_score
+            scored = []
+            for desc_id, desc in enumerate(self.food_descriptions):
+                score = self.calculate_match_score(desc, ingredient, category, subcategory, keywords)
+                # 只考虑分数超过10的匹配
+                if score > 10:
+                    scored.append((desc_id, score))
+        else:
+            triggers, constant = match_triggers(ingredient, category, keywords, self.match_rules)
+            candidate_ids = index.candidates(triggers)
+            if candidate_ids is None:
+                candidate_ids = range(len(self.food_descriptions))
+            
+            # 候选描述使用预先计算的描述特征评分，只考虑分数超过10的匹配
+            query = MatchQuery(ingredient, category, subcategory, keywords, self.match_rules)
+            scored = []
+            for desc_id in candidate_ids:
+                score = index.score(desc_id, query)
+                if score > 10:
+                    scored.append((desc_id, score))
+            
+            index.queries += 1
+            index.candidates_scored += len(candidate_ids)
+            if len(candidate_ids) < len(self.food_descriptions):
+                scored.extend(index.best_non_candidates(candidate_ids, constant, limit, 10))
+        
+        # 用有界堆选出前 limit 个（分数降序，分数相同时描述在前者优先），不对全部候选排序
+        best = heapq.nsmallest(limit, scored, key=lambda item: (-item[1], item[0]))
+        return [(self.food_descriptions[desc_id], score) for desc_id, score in best]
+
+    def tfidf_food_matches(self, ingredient, limit=3):
+        """
+        按字符 n-gram TF-IDF 余弦相似度返回前 limit 个食品描述（相似度低于阈值的不返回）
+        
+        参数:
+            ingredient (str): 预处理后的食材名称
+            limit (int): 返回的匹配数量
             
-            # 坐果和种子类
-            'nut': 'nuts, nfs',
-            'seed': 'seeds, nfs',
-            'almond': 'almonds, raw',
-            'walnut': 'walnuts, raw',
-            'pecan': 'pecans, raw',
-            'cashew': 'cashews, raw',
-            'pistachio': 'pistachios, raw',
-            'peanut': 'peanuts, raw',
-            'sesame': 'sesame seeds, raw',
-            'sunflower': 'sunflower seeds, raw',
-            'pumpkin': 'pumpkin seeds, raw',
-            'flax': 'flaxseeds, raw',
-            'chia': 'chia seeds, raw',
+        返回:
+            list: [(食品描述, 相似度), ...]，按相似度降序
+        """
+        if self._tfidf_matcher is None:
+            self._tfidf_matcher = TfidfFoodMatcher(self.food_descriptions)
+        return [
+            (self.food_descriptions[desc_id], round(similarity, 4))
+            for desc_id, similarity in self._tfidf_matcher.match(ingredient, k=limit)
+        ]
+
+    def calculate_match_score(self, desc, ingredient, category=None, subcategory=None, keywords=None):
+        """
+        计算食品描述与食材名称的匹配分数
+        
+        FoodMatchIndex.score 使用预先计算的描述特征实现了相同的规则，修改评分规则时需同步修改。
+        
+        参数:
+            desc (str): FNDDS 食品描述
+            ingredient (str): 预处理后的食材名称
+            category (str): 食材主类别
+            subcategory (str): 食材子类别
+            keywords (list): 识别类别时命中的关键词
             
-            # 饮料类
-            'water': 'water, nfs',
-            'juice': 'juice, nfs',
-            'soda': 'soft drink, nfs',
-            'coffee': 'coffee, brewed',
-            'tea': 'tea, brewed',
-            'wine': 'wine, nfs',
-            'white wine': 'wine, white',
-            'red wine': 'wine, red',
-            'beer': 'beer, nfs',
-            'milk': 'milk, nfs',
-            'smoothie': 'smoothie, nfs',
+        返回:
+            int: 匹配分数
+        """
+        rules = self.match_rules
+        desc_lower = desc.lower()
+        score = 0
+        
+        
+        # 精确匹配得分最高
+        if desc_lower == ingredient.lower():
+            score += 200  # 提高精确匹配的分数
+            
+        # 如果食材名称是描述的子字符串，得分较高
+        elif ingredient.lower() in desc_lower:
+            score += 100  # 提高子字符串匹配的分数
+            
+            # 如果在开头或结尾，得分更高
+            if desc_lower.startswith(ingredient.lower()):
+                score += 30  # 提高开头匹配的分数
+            if desc_lower.endswith(ingredient.lower()):
+                score += 15  # 提高结尾匹配的分数
+        
+        # 如果有关键词匹配，根据匹配关键词数量增加分数
+        if keywords:
+            for keyword in keywords:
+                if keyword in desc_lower:
+                    # 根据关键词长度增加权重，越长的关键词权重越高
+                    keyword_weight = min(len(keyword), 10)  # 限制最大权重为10
+                    score += 5 * keyword_weight  # 每个关键词匹配加5*权重分
+        
+        # 如果有类别信息，检查是否匹配类别
+        if category and category in rules.ingredient_categories:
+            # 检查是否包含类别关键词（预先展平的该类别全部关键词）
+            for keyword in rules.category_keywords[category]:
+                if keyword in desc_lower:
+                    score += 20  # 提高类别匹配的分数
+                    break
             
-            # 糖类和甜味料
-            'sugar': 'sugar, white, granulated or lump',
-            'honey': 'honey',
-            'syrup': 'syrup, nfs',
-            'maple': 'syrup, maple',
-            'molasses': 'molasses',
-            'agave': 'agave syrup',
-            'stevia': 'sweetener, stevia',
-            'sweetener': 'sweetener, nfs'
-        }
-        
-        # 尝试在精确食材数据库中查找匹配
-        for key, value in precise_ingredient_db.items():
-            if ingredient_name.lower() == key.lower() or key.lower() in ingredient_name.lower():
-                log_func(f"使用精确食材数据库匹配: '{ingredient_name}' -> '{value}'")
-                return value
+            # 如果有子类别信息，检查是否匹配子类别
+            if subcategory and subcategory in rules.ingredient_categories[category]:
+                subcategory_keywords = rules.ingredient_categories[category][subcategory]
+                for keyword in subcategory_keywords:
+                    if keyword in desc_lower:
+                        score += 30  # 提高子类别匹配的分数
+                        break
         
-        # 如果仍然没有匹配，尝试根据类别进行默认匹配
-        if main_category:
-            default_matches = {
-                'meat': {
-                    'beef': 'beef, ground, raw',
-                    'pork': 'pork, raw',
-                    'lamb': 'lamb, raw',
-                    'poultry': 'chicken, meat only, raw',
-                    'game': 'venison, raw',
-                    'processed': 'sausage, pork, raw',
-                    'default': 'meat, nfs'
-                },
-                'seafood': {
-                    'fish': 'fish, nfs',
-                    'shellfish': 'shrimp, nfs',
-                    'mollusks': 'mussel, raw',
-                    'processed': 'fish, processed, nfs',
-                    'default': 'seafood, nfs'
-                },
-                'vegetables': {
-                    'root': 'potato, raw',
-                    'bulb': 'onion, raw',
-                    'leafy_greens': 'spinach, raw',
-                    'cruciferous': 'broccoli, raw',
-                    'nightshade': 'tomato, raw',
-                    'squash': 'zucchini, raw',
-                    'legume': 'beans, string, green, raw',
-                    'other': 'vegetables, nfs',
-                    'default': 'vegetables, nfs'
-                },
-                'fruits': {
-                    'berry': 'strawberries, raw',
-                    'citrus': 'orange, raw',
-                    'tropical': 'banana, raw',
-                    'stone': 'peach, raw',
-                    'pome': 'apple, raw',
-                    'melon': 'watermelon, raw',
-                    'dried': 'raisins',
-                    'default': 'fruit, nfs'
-                },
-                'dairy': {
-                    'milk': 'milk, nfs',
-                    'cheese': 'cheese, nfs',
-                    'cream': 'cream, nfs',
-                    'yogurt': 'yogurt, plain',
-                    'butter': 'butter, regular, salted',
-                    'default': 'dairy, nfs'
-                },
-                'grains': {
-                    'rice': 'rice, white, nfs',
-                    'wheat': 'flour, wheat, white, all purpose',
-                    'corn': 'corn, raw',
-                    'oats': 'oats, raw',
-                    'other_grains': 'grains, nfs',
-                    'pasta': 'pasta, nfs',
-                    'bread': 'bread, white',
-                    'default': 'grains, nfs'
-                },
-                'seasonings': {
-                    'herbs': 'herbs, nfs',
-                    'spices': 'spices, nfs',
-                    'salt': 'salt, table',
-                    'condiments': 'condiments, nfs',
-                    'default': 'seasonings, nfs'
-                },
-                'oils': {
-                    'vegetable_oils': 'oil, vegetable, nfs',
-                    'animal_fats': 'butter, regular, salted',
-                    'other_fats': 'shortening, vegetable',
-                    'default': 'oil, nfs'
-                },
-                'nuts_seeds': {
-                    'nuts': 'nuts, nfs',
-                    'seeds': 'seeds, nfs',
-                    'nut_products': 'peanut butter',
-                    'default': 'nuts, nfs'
-                },
-                'beverages': {
-                    'alcoholic': 'wine, nfs',
-                    'non_alcoholic': 'water, nfs',
-                    'default': 'beverages, nfs'
-                },
-                'sweeteners': {
-                    'sugars': 'sugar, white, granulated or lump',
-                    'syrups': 'syrup, nfs',
-                    'artificial': 'sweetener, nfs',
-                    'default': 'sugar, nfs'
-                }
-            }
+        # 如果是复合食材名称，检查每个单词的匹配情况
+        if ' ' in ingredient:
+            words = ingredient.split()
+            matched_words = 0
+            word_weights = {}
+            
+            # 给每个单词分配权重
+            for word in words:
+                # 忽略过短的单词
+                if len(word) <= 2:
+                    continue
+                    
+                # 检查是否是核心食材关键词（是否为某个分类关键词的子串）
+                is_core_keyword = word in rules.keyword_blob
+                
+                # 根据单词长度和是否是核心关键词分配权重
+                word_weight = len(word)
+                if is_core_keyword:
+                    word_weight *= 3  # 核心关键词权重乘3倍
+                word_weights[word] = word_weight
             
-            # 如果有子类别信息，使用子类别默认匹配
-            if main_category in default_matches:
-                if sub_category and sub_category in default_matches[main_category]:
-                    default_match = default_matches[main_category][sub_category]
-                    log_func(f"使用子类别默认匹配: '{ingredient_name}' -> '{default_match}' ({main_category}/{sub_category})")
-                    return default_match
-                # 如果没有子类别信息或子类别不存在，使用主类别默认匹配
-                else:
-                    default_match = default_matches[main_category]['default']
-                    log_func(f"使用主类别默认匹配: '{ingredient_name}' -> '{default_match}' ({main_category})")
-                    return default_match
+            # 计算匹配分数
+            for word, weight in word_weights.items():
+                if word in desc_lower:
+                    matched_words += 1
+                    score += 5 * weight  # 每个单词匹配加5*权重分
+            
+            # 如果匹配了多个单词，额外加分
+            if matched_words >= 2:
+                score += matched_words * 10
+                
+            # 如果匹配了所有单词，额外加分
+            if matched_words == len(word_weights):
+                score += 50  # 提高完全匹配的分数
         
-        # 没有找到匹配项
-        if verbose:
-            logger.warning(f"未找到食材匹配: '{original_name}'")
-        else:
-            logger.debug(f"未找到食材匹配: '{original_name}'")
-        return None
+        # 与查询无关的部分（纯净食材、复杂描述惩罚、原始食材）
+        score += static_match_score(desc_lower, rules)
+            
+        # 如果是油类特殊处理
+        if 'oil' in ingredient.lower() and 'oil' in desc_lower:
+            score += 50  # 特别处理油类食材
+            
+        # 如果是香料和调味料特殊处理
+        if any(spice in ingredient.lower() for spice in rules.spice_terms):
+            if any(spice in desc_lower for spice in rules.spice_terms):
+                score += 100  # 显著提高香料和调味料的分数
+                
+                # 直接匹配盐类
+                if 'salt' in ingredient.lower():
+                    if desc_lower == 'salt, table' or desc_lower.startswith('salt,'):
+                        score += 200  # 直接匹配盐类加更高分
+                    # 惩罚含有cheese的盐类匹配
+                    if 'cheese' in desc_lower:
+                        score -= 300  # 强烈惩罚将盐匹配到奶酪
+                
+                # 直接匹配胡椒类
+                if 'pepper' in ingredient.lower() and 'black' in ingredient.lower():
+                    if desc_lower == 'pepper, black' or desc_lower.startswith('pepper, black'):
+                        score += 200  # 直接匹配黑胡椒加更高分
+                    # 惩罚含有bell pepper或hot pepper的匹配
+                    if 'bell pepper' in desc_lower or 'hot pepper' in desc_lower or 'sweet pepper' in desc_lower:
+                        score -= 300  # 强烈惩罚将黑胡椒匹配到辣椒
+                
+        return score
 
     def find_portion_weight(self, food_description, portion_description):
         """
@@ -1377,41 +1085,30 @@ class RecipeNutritionCalculator:
         Returns:
             float: Weight in grams
         """
-        # Filter for the specific food
-        food_portions = self.portions_weights_df[
-            self.portions_weights_df['Main food description'].str.lower() == food_description.lower()
-        ]
+        # Look up the pre-grouped portions for the specific food
+        food_portions = self.portion_index.get(food_description.lower())
         
-        if food_portions.empty:
+        if food_portions is None:
             return None
         
-        # Try to find the exact portion match
-        for unit in self.unit_conversion.values():
-            if unit in portion_description.lower():
-                matches = food_portions[
-                    food_portions['Portion description'].str.lower().str.contains(unit, na=False)
-                ]
-                if not matches.empty:
-                    # Return the first matching portion weight
-                    return matches.iloc[0]['Portion weight\n(g)']
-        
-        # If no specific match found, try to use a default portion
-        # First try "1 cup" as it's common
-        cup_match = food_portions[
-            food_portions['Portion description'].str.lower().str.contains('cup', na=False)
-        ]
-        if not cup_match.empty:
-            return cup_match.iloc[0]['Portion weight\n(g)']
+        unit_weights, default_weight = food_portions
         
-        # Then try a medium-sized portion or any available portion
-        medium_match = food_portions[
-            food_portions['Portion description'].str.lower().str.contains('medium', na=False)
-        ]
-        if not medium_match.empty:
-            return medium_match.iloc[0]['Portion weight\n(g)']
+        # Canonical units mentioned in the portion description (cached per description)
+        portion_description = portion_description.lower()
+        units = self._portion_unit_cache.get(portion_description)
+        if units is None:
+            units = tuple(unit for unit in self.portion_units if unit in portion_description)
+            self._portion_unit_cache[portion_description] = units
         
-        # Just return the first available portion if nothing else matches
-        return food_portions.iloc[0]['Portion weight\n(g)']
+        # Try to find the exact portion match
+        for unit in units:
+            if unit in unit_weights:
+                # Return the first matching portion weight
+                return unit_weights[unit]
+        
+        # If no specific match found, use the precomputed default portion
+        # ("cup", then "medium", then the first available portion)
+        return default_weight
 
     def convert_to_grams(self, amount, unit, food_description):
         """
@@ -1425,79 +1122,26 @@ class RecipeNutritionCalculator:
         返回:
             float: 克数
         """
-        # 常见计量单位到克的转换
-        unit_to_gram = {
-            # 重量单位
-            'g': 1.0,
-            'kg': 1000.0,
-            'oz': 28.35,  # 1盎司 = 28.35克
-            'lb': 453.59, # 1磅 = 453.59克
-            
-            # 体积单位 (假设密度为1g/ml)
-            'ml': 1.0,
-            'l': 1000.0,
-            'cup': 240.0,  # 1杯 = 240毫升
-            'tbsp': 15.0,  # 1汤匙 = 15毫升
-            'tsp': 5.0,    # 1茶匙 = 5毫升
-            'fl_oz': 30.0, # 1液体盎司 = 30毫升
-            'pint': 473.0, # 1員脑 = 473毫升
-            'quart': 946.0, # 1夸脑 = 946毫升
-            'gallon': 3785.0, # 1加仑 = 3785毫升
-            
-            # 其他常见计量
-            'pinch': 0.5,  # 一捏约为0.5克
-            'dash': 0.5,   # 一点约为0.5克
-            'clove': 5.0,  # 一瓣大蒜约为5克
-            'bunch': 100.0, # 一束约为100克
-            'handful': 30.0, # 一把约为30克
-            'sprig': 5.0,  # 一小枝约为5克
-            'slice': 30.0, # 一片约为30克
-            'piece': 50.0, # 一块约为50克
-            'whole': 150.0, # 一整个约为150克
-            'tin': 400.0,  # 一罐约为400克
-            'can': 400.0,  # 一罐约为400克
-            'pack': 200.0, # 一包约为200克
-        }
-        
-        # 根据食品类型的密度调整
-        food_density_adjustments = {
-            # 液体食品
-            'milk': 1.03,  # 牛奶密度约为1.03g/ml
-            'cream': 1.0,  # 奶油密度约为1g/ml
-            'oil': 0.92,   # 油密度约为0.92g/ml
-            'wine': 1.0,   # 葡萄酒密度约为1g/ml
-            'juice': 1.05,  # 果汁密度约为1.05g/ml
-            'water': 1.0,   # 水密度为1g/ml
-            'soup': 1.05,   # 汤密度约为1.05g/ml
-            
-            # 固体食品
-            'flour': 0.55,  # 面粉密度约为0.55g/ml
-            'sugar': 0.85,  # 糖密度约为0.85g/ml
-            'rice': 0.75,   # 米密度约为0.75g/ml
-            'salt': 1.2,    # 盐密度约为1.2g/ml
-        }
-        
         # 规范化单位
         unit = unit.lower()
         
         # 首先检查我们是否有直接的单位转换
-        if unit in unit_to_gram:
+        if unit in UNIT_TO_GRAM:
             # 应用密度调整（如果适用）
             density_factor = 1.0
             food_description_lower = food_description.lower()
             
             # 检查食品描述是否包含需要密度调整的关键词
-            for food_type, density in food_density_adjustments.items():
+            for food_type, density in FOOD_DENSITY_ADJUSTMENTS.items():
                 if food_type in food_description_lower:
                     density_factor = density
                     break
             
             # 如果是体积单位，应用密度调整
-            volume_units = ['ml', 'l', 'cup', 'tbsp', 'tsp', 'fl_oz', 'pint', 'quart', 'gallon']
-            if unit in volume_units:
-                return amount * unit_to_gram[unit] * density_factor
+            if unit in VOLUME_UNITS:
+                return amount * UNIT_TO_GRAM[unit] * density_factor
             else:
-                return amount * unit_to_gram[unit]
+                return amount * UNIT_TO_GRAM[unit]
         
         # 如果单位在我们的映射中不存在，尝试使用FNDDS数据库
         if unit in self.unit_conversion:
@@ -1518,6 +1162,21 @@ class RecipeNutritionCalculator:
         logger.warning(f"警告: 无法将 {amount} {unit} 的 {food_description} 转换为克。使用 100g 作为默认值。")
         return 100.0
 
+    def find_food_row(self, food_description):
+        """
+        Find the nutrient matrix row for a food description.
+        
+        Args:
+            food_description (str): The food description to look up
+            
+        Returns:
+            int: Row index in nutrient_matrix, or None if the food is unknown
+        """
+        row = self.food_row_index.get(food_description.lower())
+        if row is None:
+            print(f"Warning: No nutrient data found for {food_description}")
+        return row
+
     def get_nutrient_values(self, food_description, weight_in_grams):
         """
         Get all nutrient values for a given food, adjusted for weight.
@@ -1529,31 +1188,17 @@ class RecipeNutritionCalculator:
         Returns:
             dict: Dictionary of nutrient values
         """
-        # Find the food in the nutrient values dataframe
-        food_match = self.nutrient_values_df[
-            self.nutrient_values_df['Main food description'].str.lower() == food_description.lower()
-        ]
+        # Find the food row through the description index
+        row = self.find_food_row(food_description)
         
-        if food_match.empty:
-            print(f"Warning: No nutrient data found for {food_description}")
+        if row is None:
             return {}
         
-        # Get the row with the nutrient values
-        nutrient_row = food_match.iloc[0]
-        
-        # Create a dictionary with all nutrients and their values
-        nutrient_dict = {}
-        for col in self.nutrient_values_df.columns[4:]:
-            # Get the value and adjust it for the actual weight used in the recipe
-            raw_value = nutrient_row[col]
-            # The values in the database are per 100g, so adjust accordingly
-            adjusted_value = (raw_value / 100) * weight_in_grams
-            
-            # Use the clean column name (without newlines)
-            clean_col = self.clean_columns[col]
-            nutrient_dict[clean_col] = adjusted_value
+        # The values in the database are per 100g, so adjust the whole row at once
+        adjusted_values = (self.nutrient_matrix[row].astype(np.float64) / 100) * weight_in_grams
         
-        return nutrient_dict
+        # Use the clean column names (without newlines)
+        return dict(zip(self.nutrient_names, adjusted_values.tolist()))
 
     def preprocess_ingredient_name(self, ingredient_name, ingredient_categories):
         """
@@ -1570,33 +1215,6 @@ class RecipeNutritionCalculator:
         if len(ingredient_name.split()) <= 2:
             return ingredient_name, [ingredient_name]
         
-        # 要移除的常见修饰词和计量单位
-        modifiers_to_remove = [
-            # 数量和计量单位
-            r'\d+', r'\(\d+[a-z]*\)', r'\d+[a-z]+', r'cup', r'cups', r'tablespoon', r'tablespoons', 
-            r'teaspoon', r'teaspoons', r'tbsp', r'tsp', r'oz', r'ounce', r'ounces', r'pound', r'pounds', 
-            r'gram', r'grams', r'g', r'kg', r'ml', r'liter', r'liters', r'l', r'pinch', r'dash',
-            # 容器和包装
-            r'tin', r'can', r'jar', r'packet', r'pack', r'package', r'container', r'box', r'bottle',
-            # 状态修饰词
-            r'fresh', r'frozen', r'canned', r'dried', r'dry', r'raw', r'cooked', r'boiled', r'steamed',
-            r'roasted', r'baked', r'fried', r'grilled', r'smoked', r'cured', r'pickled', r'preserved',
-            # 大小和形状
-            r'large', r'medium', r'small', r'tiny', r'big', r'huge', r'whole', r'half', r'quarter',
-            r'sliced', r'diced', r'chopped', r'minced', r'grated', r'shredded', r'ground', r'mashed',
-            r'cubed', r'julienned', r'crushed', r'crumbled', r'torn', r'broken', r'split', r'halved',
-            # 其他修饰词
-            r'optional', r'to taste', r'as needed', r'approximately', r'about', r'roughly', r'or so',
-            r'extra', r'virgin', r'pure', r'natural', r'organic', r'free-range', r'grass-fed', r'wild',
-            r'farm-raised', r'homemade', r'store-bought', r'commercial', r'premium', r'quality',
-            r'skinless', r'boneless', r'skin-on', r'bone-in', r'lean', r'fatty', r'fat-free', r'low-fat',
-            r'full-fat', r'reduced-fat', r'unsalted', r'salted', r'sweetened', r'unsweetened',
-            r'finely', r'coarsely', r'thinly', r'thickly', r'freshly', r'lightly', r'heavily'
-        ]
-        
-        # 常见的连接词和介词
-        connectors = [r',', r'and', r'or', r'with', r'without', r'plus', r'of', r'for', r'from', r'in', r'on', r'as']
-        
         # 复制原始名称以便处理
         processed_name = ingredient_name
         
@@ -1606,36 +1224,19 @@ class RecipeNutritionCalculator:
         # 将逗号替换为空格，以便处理
         processed_name = processed_name.replace(',', ' ')
         
-        # 分词并过滤掉修饰词和连接词
-        words = processed_name.split()
-        filtered_words = []
-        for word in words:
-            # 检查是否是要移除的修饰词
-            should_remove = False
-            for modifier in modifiers_to_remove + connectors:
-                if re.fullmatch(modifier, word):
-                    should_remove = True
-                    break
-            if not should_remove:
-                filtered_words.append(word)
+        # 分词并过滤掉修饰词和连接词（集合查找加一个预编译的数量正则）
+        filtered_words = [
+            word for word in processed_name.split()
+            if word not in PREPROCESS_MODIFIERS
+            and word not in PREPROCESS_CONNECTORS
+            and not PREPROCESS_QUANTITY_PATTERN.fullmatch(word)
+        ]
         
         # 如果没有剩余单词，返回原始名称
         if not filtered_words:
             return ingredient_name, [ingredient_name]
         
-        # 使用食材分类字典来识别核心食材
-        core_ingredients = []
-        for word in filtered_words:
-            # 检查是否是核心食材
-            for category, subcategories in ingredient_categories.items():
-                for subcat, keywords in subcategories.items():
-                    if any(keyword == word or keyword in word for keyword in keywords):
-                        core_ingredients.append(word)
-                        break
-                if word in core_ingredients:
-                    break
-        
-        # 特殊食材处理
+        # 特殊食材处理（在识别核心食材之前返回）
         # 如果是盐，直接返回“salt”
         if 'salt' in ingredient_name.lower():
             return 'salt', ['salt']
@@ -1648,6 +1249,30 @@ class RecipeNutritionCalculator:
         if 'butter' in ingredient_name.lower():
             return 'butter', ['butter']
         
+        # 使用食材分类字典来识别核心食材
+        core_ingredients = []
+        if ingredient_categories is self.match_rules.ingredient_categories:
+            # 计算器自身的规则: 用关键词自动机一次扫描判断单词是否包含任一关键词
+            rules = self.match_rules
+            first_category = next(iter(ingredient_categories), None)
+            for word in filtered_words:
+                if not rules.keyword_automaton.contains_any(word):
+                    continue
+                # 与逐类别检查一致: 重复的单词只有在第一个类别中命中时才会再次加入
+                if word in core_ingredients and rules.detect_category(word)[0] != first_category:
+                    continue
+                core_ingredients.append(word)
+        else:
+            for word in filtered_words:
+                # 检查是否是核心食材
+                for category, subcategories in ingredient_categories.items():
+                    for subcat, keywords in subcategories.items():
+                        if any(keyword == word or keyword in word for keyword in keywords):
+                            core_ingredients.append(word)
+                            break
+                    if word in core_ingredients:
+                        break
+        
         # 如果没有识别到核心食材，使用所有过滤后的单词
         if not core_ingredients:
             core_ingredients = filtered_words
@@ -1667,302 +1292,7 @@ class RecipeNutritionCalculator:
         返回:
             tuple: (数量, 单位)
         """
-        if not measurement_str or not isinstance(measurement_str, str) or measurement_str.strip() == '':
-            return 1.0, 'piece'  # 如果没有计量，默认为1件
-        
-        # 清理字符串
-        original_str = measurement_str
-        measurement_str = measurement_str.strip().lower()
-        
-        # 常见计量单位映射到标准单位
-        unit_conversions = {
-            # 重量单位
-            'g': 'g',
-            'gram': 'g',
-            'grams': 'g',
-            'kg': 'kg',
-            'kilogram': 'kg',
-            'kilograms': 'kg',
-            'oz': 'oz',
-            'ounce': 'oz',
-            'ounces': 'oz',
-            'lb': 'lb',
-            'pound': 'lb',
-            'pounds': 'lb',
-            
-            # 体积单位
-            'ml': 'ml',
-            'milliliter': 'ml',
-            'milliliters': 'ml',
-            'millilitre': 'ml',
-            'millilitres': 'ml',
-            'l': 'l',
-            'liter': 'l',
-            'liters': 'l',
-            'litre': 'l',
-            'litres': 'l',
-            'cup': 'cup',
-            'cups': 'cup',
-            'tbsp': 'tbsp',
-            'tablespoon': 'tbsp',
-            'tablespoons': 'tbsp',
-            'tsp': 'tsp',
-            'teaspoon': 'tsp',
-            'teaspoons': 'tsp',
-            'fl oz': 'fl_oz',
-            'fluid ounce': 'fl_oz',
-            'fluid ounces': 'fl_oz',
-            'pint': 'pint',
-            'pints': 'pint',
-            'quart': 'quart',
-            'quarts': 'quart',
-            'gallon': 'gallon',
-            'gallons': 'gallon',
-            
-            # 其他常见计量
-            'pinch': 'pinch',
-            'pinches': 'pinch',
-            'dash': 'dash',
-            'dashes': 'dash',
-            'tin': 'tin',
-            'tins': 'tin',
-            'can': 'can',
-            'cans': 'can',
-            'pack': 'pack',
-            'packs': 'pack',
-            'package': 'pack',
-            'packages': 'pack',
-            'bunch': 'bunch',
-            'bunches': 'bunch',
-            'clove': 'clove',
-            'cloves': 'clove',
-            'slice': 'slice',
-            'slices': 'slice',
-            'piece': 'piece',
-            'pieces': 'piece',
-            'whole': 'whole',
-            'wholes': 'whole',
-            'sprig': 'sprig',
-            'sprigs': 'sprig',
-            'handful': 'handful',
-            'handfuls': 'handful',
-            
-            # 特殊表达方式
-            'to taste': 'to_taste',
-            'to serve': 'to_serve',
-            'as needed': 'as_needed',
-            'as required': 'as_needed',
-            'optional': 'optional',
-            'zest of 1': 'zest',
-            'zest of one': 'zest',
-            'juice of 1': 'juice',
-            'juice of one': 'juice',
-            'chopped': 'chopped',
-            'minced': 'minced',
-            'crushed': 'crushed',
-            'beaten': 'beaten',
-            'to cover': 'to_cover',
-            'for garnish': 'garnish',
-            'for decoration': 'garnish',
-            'for serving': 'to_serve',
-            'a few': 'few',
-            'a little': 'little',
-            'a handful': 'handful',
-            'a pinch': 'pinch',
-            'a dash': 'dash',
-            'one': 'one',
-            'two': 'two',
-            'three': 'three',
-            'four': 'four',
-            'five': 'five',
-            'ear': 'ear',
-            'stalk': 'stalk',
-            'stalks': 'stalk',
-            'leaf': 'leaf',
-            'leaves': 'leaf',
-            'pod': 'pod',
-            'pods': 'pod',
-            'knob': 'knob',
-        }
-        
-        # 常见计量单位的近似重量
-        unit_weights = {
-            'pinch': 0.5,  # 一捏约为0.5克
-            'dash': 0.5,   # 一点约为0.5克
-            'tsp': 5.0,    # 一茶匙约为5克
-            'tbsp': 15.0,  # 一汤匙约为15克
-            'cup': 240.0,  # 一杯约为240毫升
-            'fl_oz': 30.0, # 一液体盎司约为30毫升
-            'pint': 473.0, # 一員脑约为473毫升
-            'quart': 946.0, # 一夸脑约为946毫升
-            'gallon': 3785.0, # 一加仑约为3785毫升
-            'clove': 5.0,  # 一瓣大蒜约为5克
-            'bunch': 100.0, # 一束约为100克
-            'handful': 30.0, # 一把约为30克
-            'sprig': 5.0,  # 一小枝约为5克
-            'slice': 30.0, # 一片约为30克
-            'piece': 50.0, # 一块约为50克
-            'whole': 150.0, # 一整个约为150克
-            
-            # 特殊表达方式的默认值
-            'to_taste': 2.0,  # “按照口味”默认为2克
-            'to_serve': 5.0,  # “供应”默认为5克
-            'as_needed': 10.0, # “根据需要”默认为10克
-            'optional': 5.0,  # “可选”默认为5克
-            'zest': 5.0,      # “皮屑”默认为5克
-            'juice': 30.0,    # “果汁”默认为30克
-            'chopped': 30.0,  # “切碎的”默认为30克
-            'minced': 15.0,   # “切碎的”默认为15克
-            'crushed': 10.0,  # “压碎的”默认为10克
-            'beaten': 50.0,   # “打发的”默认为50克
-            'to_cover': 100.0, # “覆盖”默认为100克
-            'garnish': 5.0,   # “装饰”默认为5克
-            'few': 10.0,      # “几个”默认为10克
-            'little': 5.0,    # “一点”默认为5克
-            'one': 1.0,       # “一个”默认为1个
-            'two': 2.0,       # “两个”默认为2个
-            'three': 3.0,     # “三个”默认为3个
-            'four': 4.0,      # “四个”默认为4个
-            'five': 5.0,      # “五个”默认为5个
-            'ear': 200.0,     # “一穴”默认为200克
-            'stalk': 50.0,    # “一根”默认为50克
-            'leaf': 5.0,      # “一叶”默认为5克
-            'pod': 10.0,      # “一豆荷”默认为10克
-            'knob': 30.0,     # “一块”默认为30克
-        }
-        
-        # 处理复合计量单位，如 "1 (400g) tin"
-        # 尝试提取括号中的重量
-        weight_in_brackets = re.search(r'\((\d+)\s*([a-z]+)\)', measurement_str)
-        if weight_in_brackets:
-            amount = float(weight_in_brackets.group(1))
-            unit = weight_in_brackets.group(2)
-            
-            # 检查单位是否有效
-            if unit in unit_conversions:
-                unit = unit_conversions[unit]
-                return amount, unit
-        
-        # 处理直接连接的数字和单位，如 "500g", "250ml"
-        direct_unit_match = re.match(r'^(\d+)\s*([a-z]+)$', measurement_str)
-        if direct_unit_match:
-            amount = float(direct_unit_match.group(1))
-            unit = direct_unit_match.group(2)
-            
-            # 检查单位是否有效
-            if unit in unit_conversions:
-                unit = unit_conversions[unit]
-                return amount, unit
-        
-        # 处理有空格的数字和单位，如 "2 cups" 或 "2 1/2 cups"
-        spaced_unit_match = re.match(r'^([\d\s.\/]+)\s+(.+)$', measurement_str)
-        if spaced_unit_match:
-            amount_str = spaced_unit_match.group(1).strip()
-            unit = spaced_unit_match.group(2).strip()
-            
-            # 处理分数，如 "1/2"
-            if '/' in amount_str:
-                if ' ' in amount_str:  # 混合数字，如 "2 1/2"
-                    whole, fraction = amount_str.split(' ', 1)
-                    num, denom = fraction.split('/')
-                    amount = float(whole) + float(num) / float(denom)
-                else:  # 简单分数，如 "1/2"
-                    num, denom = amount_str.split('/')
-                    amount = float(num) / float(denom)
-            else:
-                amount = float(amount_str)
-            
-            # 检查单位是否有效
-            if unit in unit_conversions:
-                unit = unit_conversions[unit]
-                return amount, unit
-        
-        # 处理特殊情况，如"pinch"或"dash"或描述性短语
-        if measurement_str in unit_conversions:
-            return 1.0, unit_conversions[measurement_str]
-        
-        # 检查是否包含特殊表达方式
-        for special_phrase, standard_unit in unit_conversions.items():
-            if ' ' in special_phrase and special_phrase in measurement_str:
-                return 1.0, standard_unit
-        
-        # 处理数字开头的特殊表达方式，如"2 to taste"
-        number_with_special_phrase = re.match(r'^(\d+)\s+(.+)$', measurement_str)
-        if number_with_special_phrase:
-            amount = float(number_with_special_phrase.group(1))
-            phrase = number_with_special_phrase.group(2)
-            
-            if phrase in unit_conversions:
-                return amount, unit_conversions[phrase]
-            
-            # 检查是否包含特殊表达方式
-            for special_phrase, standard_unit in unit_conversions.items():
-                if ' ' in special_phrase and special_phrase in phrase:
-                    return amount, standard_unit
-        
-        # 处理常见的描述性短语
-        descriptive_phrases = {
-            'to taste': 'to_taste',
-            'to serve': 'to_serve',
-            'as needed': 'as_needed',
-            'as required': 'as_needed',
-            'optional': 'optional',
-            'for garnish': 'garnish',
-            'for decoration': 'garnish',
-            'for serving': 'to_serve',
-            'adjust to taste': 'to_taste',
-            'zest of 1': 'zest',
-            'zest of one': 'zest',
-            'juice of 1': 'juice',
-            'juice of one': 'juice',
-            'juice of 1/2': 'juice',
-            'juice of half': 'juice',
-            'zest and juice of 1': 'zest_and_juice',
-            'tied in a knot': 'piece',
-            'one sheet': 'sheet',
-            'one ear': 'ear',
-            '适量': 'as_needed',  # 适量 (中文“适量”)
-            '少许': 'little',     # 少许 (中文“少许”)
-            '少量': 'little',     # 少量 (中文“少量”)
-        }
-        
-        # 大小写不敏感地检查描述性短语
-        lower_measurement = measurement_str.lower()
-        for phrase, unit in descriptive_phrases.items():
-            if phrase.lower() in lower_measurement:
-                return 1.0, unit
-        
-        # 处理数量词
-        quantity_words = {
-            'one': 1.0,
-            'two': 2.0,
-            'three': 3.0,
-            'four': 4.0,
-            'five': 5.0,
-            'a few': 3.0,
-            'few': 3.0,
-            'a couple': 2.0,
-            'couple': 2.0,
-            'several': 4.0,
-        }
-        
-        for word, amount in quantity_words.items():
-            if measurement_str.startswith(word):
-                # 提取单位（如果有）
-                unit_part = measurement_str[len(word):].strip()
-                if unit_part:
-                    for unit_name, standard_unit in unit_conversions.items():
-                        if unit_part.startswith(unit_name):
-                            return amount, standard_unit
-                return amount, 'piece'  # 默认单位
-        
-        # 如果只有数字，假设为克
-        if measurement_str.isdigit():
-            return float(measurement_str), 'g'
-        
-        # 如果无法解析，默认为1件，但记录原始计量单位以便分析
-        logger.warning(f"警告: 无法解析计量单位: {original_str}. 使用默认值 1 piece.")
-        return 1.0, 'piece'
+        return self.measurement_parser.parse(measurement_str)
 
     def extract_ingredients_from_recipe(self, recipe_json, verbose=True):
         """
@@ -2068,8 +1398,9 @@ class RecipeNutritionCalculator:
         if not ingredients_list:
             return None
             
-        # 初始化营养成分字典和总重量
-        nutrition = {}
+        # 初始化匹配食品的营养矩阵行号、对应重量和总重量
+        matched_rows = []
+        matched_weights = []
         total_weight_grams = 0
         matched_count = 0
         total_ingredients = len(ingredients_list)
@@ -2154,25 +1485,27 @@ class RecipeNutritionCalculator:
             # 累加总重量
             total_weight_grams += weight_in_grams
             
-            # 获取营养成分
-            nutrient_values = self.get_nutrient_values(food_match, weight_in_grams)
-            
-            # 累加营养成分
-            for nutrient, value in nutrient_values.items():
-                if nutrient in nutrition:
-                    nutrition[nutrient] += value
-                else:
-                    nutrition[nutrient] = value
+            # 记录营养矩阵中的行，最后一次性加权求和
+            row = self.find_food_row(food_match)
+            if row is not None:
+                matched_rows.append(row)
+                matched_weights.append(weight_in_grams)
                     
             if verbose:
                 print(f"匹配成功: '{ingredient_name}' → '{food_match}'")
             
         
+        # 营养总量: 重量向量与匹配行的点积（数据库中的值按每100g计）
+        if matched_rows:
+            weights = np.asarray(matched_weights, dtype=np.float64) / 100
+            nutrition = NutrientVector(self.nutrient_names, weights @ self.nutrient_matrix[matched_rows])
+        else:
+            nutrition = NutrientVector(self.nutrient_names)
+        
         # 计算每100g的营养成分
-        nutrition_per_100g = {}
+        nutrition_per_100g = NutrientVector(self.nutrient_names)
         if total_weight_grams > 0:
-            for nutrient, value in nutrition.items():
-                nutrition_per_100g[nutrient] = (value / total_weight_grams) * 100
+            nutrition_per_100g = nutrition.scaled(100 / total_weight_grams)
         
         # 估算份数 - 根据总重量估算
         # 合理范围内的份数，最少2份，最多8份
@@ -2191,10 +1524,9 @@ class RecipeNutritionCalculator:
             servings = 8  # 最大份数限制为8
         
         # 计算每份的营养成分
-        nutrition_per_serving = {}
+        nutrition_per_serving = NutrientVector(self.nutrient_names)
         if servings > 0:
-            for nutrient, value in nutrition.items():
-                nutrition_per_serving[nutrient] = value / servings
+            nutrition_per_serving = nutrition.scaled(1 / servings)
         
         # 计算匹配率
         match_rate = (matched_count / total_ingredients) * 100 if total_ingredients > 0 else 0
@@ -2205,11 +1537,11 @@ class RecipeNutritionCalculator:
             print(f"\n总重量: {total_weight_grams:.1f}g")
             print(f"估计份数: {servings}")
         
-        # 返回结果
+        # 返回结果（营养向量转换为普通字典，可以修改和 JSON 序列化）
         return {
-            'nutrition': nutrition,
-            'nutrition_per_100g': nutrition_per_100g,
-            'nutrition_per_serving': nutrition_per_serving,
+            'nutrition': nutrition.to_dict(),
+            'nutrition_per_100g': nutrition_per_100g.to_dict(),
+            'nutrition_per_serving': nutrition_per_serving.to_dict(),
             'total_weight_grams': total_weight_grams,
             'match_rate': match_rate if total_ingredients > 0 else 0,
             'matched_count': matched_count,
@@ -2284,6 +1616,215 @@ class RecipeNutritionCalculator:
         
         print("\nNote: Values are for the entire recipe. The per 100g values represent the nutritional content per 100g of the total recipe weight.")
 
+    def close(self):
+        """
+        释放计算器持有的数据表。关闭后的实例不应再使用。
+        """
+        self._ingredient_nutrients_df = None
+        self._load_ingredient_table = None
+        self.portions_weights_df = None
+        self.nutrient_values_df = None
+        self.food_descriptions = []
+        self._ingredient_descriptions = []
+        self._match_index = None
+        self._numpy_engine = None
+        self._tfidf_matcher = None
+        self._typo_index = None
+        if self.persistent_match_cache is not None:
+            self.persistent_match_cache.close()
+            self.persistent_match_cache = None
+        if self.sqlite_store is not None:
+            self.nutrient_matrix = None
+            self.food_row_index = {}
+            self.portion_index = {}
+            self.sqlite_store.close()
+            self.sqlite_store = None
+        if self.shared_data is not None:
+            # 先释放指向共享内存的数组视图，才能关闭映射
+            self.nutrient_matrix = None
+            self.shared_data.close()
+            self.shared_data = None
+
+
+class CalculatorRegistry:
+    """
+    进程级营养计算器注册表
+    
+    按 (数据目录, 构造参数, 数据版本) 缓存已加载的 RecipeNutritionCalculator，
+    同一进程内的转换器、批处理和服务共享同一个预热实例，避免每个食谱都重新加载 FNDDS 数据。
+    构造参数不同（例如不同的匹配算法）时分别创建实例。
+    """
+    
+    def __init__(self, factory=None):
+        """
+        参数:
+            factory (callable): 创建计算器的工厂函数，默认为 RecipeNutritionCalculator
+        """
+        self._factory = factory or RecipeNutritionCalculator
+        self._instances = {}
+        # 数据目录 -> (源文件大小和修改时间, 数据版本)，文件未变化时不再计算内容哈希
+        self._versions = {}
+        self._lock = threading.RLock()
+    
+    def get(self, data_dir="fixed_data", **kwargs):
+        """
+        获取数据目录和构造参数对应的共享计算器，数据文件变化后自动重新加载
+        
+        参数:
+            data_dir (str): FNDDS 数据目录
+            **kwargs: 传给工厂函数的构造参数（参与缓存键）
+            
+        返回:
+            RecipeNutritionCalculator: 共享的计算器实例
+        """
+        dir_key = os.path.abspath(data_dir)
+        options_key = self._options_key(kwargs)
+        with self._lock:
+            version = self._data_version(data_dir, dir_key)
+            calculator = self._instances.get((dir_key, options_key, version))
+            if calculator is None:
+                # 数据版本已变化，关闭该目录下旧版本的实例
+                self._close_matching(lambda key: key[0] == dir_key and key[2] != version)
+                calculator = self._factory(data_dir, **kwargs)
+                self._instances[(dir_key, options_key, calculator.data_version)] = calculator
+            return calculator
+    
+    def reload(self, data_dir="fixed_data", **kwargs):
+        """
+        强制重新加载数据目录对应的计算器
+        
+        返回:
+            RecipeNutritionCalculator: 新的计算器实例
+        """
+        dir_key = os.path.abspath(data_dir)
+        with self._lock:
+            self._versions.pop(dir_key, None)
+            self._close_matching(lambda key: key[0] == dir_key)
+            return self.get(data_dir, **kwargs)
+    
+    @staticmethod
+    def _options_key(kwargs):
+        """把构造参数转换为可哈希的缓存键（不可哈希的值使用 repr）"""
+        items = []
+        for name, value in sorted(kwargs.items()):
+            try:
+                hash(value)
+            except TypeError:
+                value = repr(value)
+            items.append((name, value))
+        return tuple(items)
+    
+    def _data_version(self, data_dir, dir_key):
+        """
+        返回数据目录的数据版本号
+        
+        源文件的大小和修改时间与上次相同时直接返回缓存的版本号，
+        否则调用 fndds_data_version（快照过期时会计算源文件的内容哈希）。
+        """
+        try:
+            signature = tuple(
+                (stat.st_size, stat.st_mtime_ns)
+                for stat in (os.stat(path) for path in fndds_source_paths(data_dir).values())
+            )
+        except OSError:
+            return fndds_data_version(data_dir)
+        cached = self._versions.get(dir_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        version = fndds_data_version(data_dir)
+        self._versions[dir_key] = (signature, version)
+        return version
+    
+    def close(self, data_dir=None):
+        """
+        关闭并移除计算器实例
+        
+        参数:
+            data_dir (str): 只关闭该目录的实例；为 None 时关闭全部实例
+        """
+        dir_key = os.path.abspath(data_dir) if data_dir is not None else None
+        with self._lock:
+            self._close_matching(lambda key: dir_key is None or key[0] == dir_key)
+            for key in [key for key in self._versions if dir_key is None or key == dir_key]:
+                del self._versions[key]
+    
+    def _close_matching(self, predicate):
+        """关闭并移除键满足条件的实例"""
+        for key in [key for key in self._instances if predicate(key)]:
+            self._instances.pop(key).close()
+
+
+# 进程级默认注册表
+_default_registry = CalculatorRegistry()
+
+
+def get_calculator(data_dir="fixed_data", **kwargs):
+    """获取数据目录对应的进程级共享计算器"""
+    return _default_registry.get(data_dir, **kwargs)
+
+
+def reload_calculator(data_dir="fixed_data", **kwargs):
+    """强制重新加载数据目录对应的共享计算器"""
+    return _default_registry.reload(data_dir, **kwargs)
+
+
+def close_calculators(data_dir=None):
+    """关闭共享计算器（data_dir 为 None 时关闭全部）"""
+    _default_registry.close(data_dir)
+
+
+# 食材匹配测试用例（也用于性能基准）
+# 之前有问题的食材
+PROBLEMATIC_TEST_INGREDIENTS = [
+    "raw king prawns",      # 之前匹配到"strawberry milk"
+    "olive oil",           # 之前匹配到"popcorn, popped in oil"
+    "chopped onion",       # 之前匹配到"strawberry milk"
+    "freshly chopped parsley", # 之前匹配到"pork bacon"
+    "white wine",          # 之前匹配到"white sauce or gravy"
+    "chopped tomatoes",    # 之前匹配到"strawberry milk"
+    "minced garlic",       # 之前匹配到"strawberry milk"
+    "cubed feta cheese"    # 之前匹配到"cheese, feta"
+]
+
+# 常见食材
+COMMON_TEST_INGREDIENTS = [
+    "chicken breast",
+    "ground beef",
+    "salmon fillet",
+    "brown rice",
+    "whole wheat flour",
+    "spinach leaves",
+    "broccoli florets",
+    "red bell pepper",
+    "cheddar cheese",
+    "greek yogurt",
+    "honey",
+    "maple syrup",
+    "soy sauce",
+    "balsamic vinegar",
+    "coconut milk",
+    "almond flour",
+    "chia seeds",
+    "walnuts"
+]
+
+# 复杂食材名称
+COMPLEX_TEST_INGREDIENTS = [
+    "1 (400g) tin chopped tomatoes",
+    "2 tablespoons extra virgin olive oil",
+    "500g skinless chicken breast fillets",
+    "1 large onion, finely diced",
+    "3 cloves of garlic, minced",
+    "1 red bell pepper, diced",
+    "fresh basil leaves, torn",
+    "1/4 cup fresh parsley, chopped",
+    "1 cup (250ml) heavy cream",
+    "2 tablespoons unsalted butter",
+    "1/2 cup grated parmesan cheese",
+    "pinch of sea salt",
+    "freshly ground black pepper"
+]
+
 
 def test_ingredient_matching(calculator, test_ingredients):
     """测试食材匹配算法的准确性
@@ -2306,67 +1847,25 @@ def test_ingredient_matching(calculator, test_ingredients):
 
 def test_problematic_ingredients(calculator):
     """测试之前有问题的食材匹配"""
-    problematic_ingredients = [
-        "raw king prawns",      # 之前匹配到"strawberry milk"
-        "olive oil",           # 之前匹配到"popcorn, popped in oil"
-        "chopped onion",       # 之前匹配到"strawberry milk"
-        "freshly chopped parsley", # 之前匹配到"pork bacon"
-        "white wine",          # 之前匹配到"white sauce or gravy"
-        "chopped tomatoes",    # 之前匹配到"strawberry milk"
-        "minced garlic",       # 之前匹配到"strawberry milk"
-        "cubed feta cheese"    # 之前匹配到"cheese, feta"
-    ]
+    problematic_ingredients = PROBLEMATIC_TEST_INGREDIENTS
     
     print("\n===== 问题食材匹配测试 =====")
     return test_ingredient_matching(calculator, problematic_ingredients)
 
 def test_common_ingredients(calculator):
     """测试常见食材匹配"""
-    common_ingredients = [
-        "chicken breast",
-        "ground beef",
-        "salmon fillet",
-        "brown rice",
-        "whole wheat flour",
-        "spinach leaves",
-        "broccoli florets",
-        "red bell pepper",
-        "cheddar cheese",
-        "greek yogurt",
-        "honey",
-        "maple syrup",
-        "soy sauce",
-        "balsamic vinegar",
-        "coconut milk",
-        "almond flour",
-        "chia seeds",
-        "walnuts"
-    ]
+    common_ingredients = COMMON_TEST_INGREDIENTS
     
     print("\n===== 常见食材匹配测试 =====")
     return test_ingredient_matching(calculator, common_ingredients)
 
 def test_complex_ingredients(calculator):
     """测试复杂食材名称匹配"""
-    complex_ingredients = [
-        "1 (400g) tin chopped tomatoes",
-        "2 tablespoons extra virgin olive oil",
-        "500g skinless chicken breast fillets",
-        "1 large onion, finely diced",
-        "3 cloves of garlic, minced",
-        "1 red bell pepper, diced",
-        "fresh basil leaves, torn",
-        "1/4 cup fresh parsley, chopped",
-        "1 cup (250ml) heavy cream",
-        "2 tablespoons unsalted butter",
-        "1/2 cup grated parmesan cheese",
-        "pinch of sea salt",
-        "freshly ground black pepper"
-    ]
+    complex_ingredients = COMPLEX_TEST_INGREDIENTS
     
-    # 创建营养计算器实例
+    # 获取共享的营养计算器实例
     data_dir = "fixed_data"
-    calculator = RecipeNutritionCalculator(data_dir=data_dir)
+    calculator = get_calculator(data_dir)
     
     # 测试食材匹配
     # Skip ingredient matching tests for now
@@ -2462,19 +1961,226 @@ def test_complex_ingredients(calculator):
         traceback.print_exc()
 
 
-def process_recipes():
+def print_match_tier_report(calculator):
+    """
+    打印匹配缓存命中率和各匹配层级解析的食材数量
+    """
+    cache = calculator.match_cache.stats()
+    if cache['hits'] + cache['misses']:
+        print(f"\n匹配缓存: 命中 {cache['hits']}, 未命中 {cache['misses']}, 淘汰 {cache['evictions']}, "
+              f"命中率 {cache['hit_rate']:.1%} ({cache['size']}/{cache['maxsize']} 条)")
+    
+    negative = calculator.negative_match_cache.stats()
+    if negative['hits']:
+        print(f"未匹配名称缓存: 命中 {negative['hits']}, 节省匹配时间 {negative['saved_seconds']:.2f}s "
+              f"({negative['size']}/{negative['maxsize']} 条, 过期 {negative['expirations']}, 淘汰 {negative['evictions']})")
+        for name, hits, cost, saved in calculator.negative_match_cache.top_offenders(10):
+            print(f"  '{name[0]}': 命中 {hits} 次, 每次匹配 {cost * 1000:.1f}ms, 共节省 {saved:.2f}s")
+    
+    if calculator.persistent_match_cache is not None:
+        stored = calculator.persistent_match_cache.stats()
+        print(f"持久化匹配缓存: 命中 {stored['hits']}, 未命中 {stored['misses']}, "
+              f"命中率 {stored['hit_rate']:.1%} ({stored['size']} 条, {stored['path']})")
+    
+    print_match_tier_counts(calculator.match_tier_counts)
+
+def print_match_tier_counts(counts):
+    """
+    打印各匹配层级解析的食材数量
+    
+    参数:
+        counts (dict): 匹配层级 -> 食材数量（RecipeNutritionCalculator.match_tier_counts，
+            或并行处理时各工作进程合并后的计数）
+    """
+    total = sum(counts.values())
+    if not total:
+        return
+    print("\n食材匹配层级统计:")
+    for tier, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"  {tier:<18} {count:6d} ({count / total:.1%})")
+    print(f"  拼写容错层代替全量评分解析了 {counts.get('typo', 0)} 个食材")
+
+def print_startup_report(calculator):
+    """
+    打印计算器启动时每张数据表的加载耗时和内存占用
+    
+    参数:
+        calculator (RecipeNutritionCalculator): 营养计算器
+    """
+    print("\nFNDDS 数据加载报告:")
+    print(f"  {'数据表':22s} {'行数':>8s} {'列数':>6s} {'耗时':>10s} {'内存':>10s}")
+    for name, entry in calculator.load_report.items():
+        if entry is None:
+            print(f"  {name:22s} 延迟加载（尚未使用）")
+            continue
+        memory = f"{entry['bytes'] / 1e6:.2f} MB" if entry['bytes'] is not None else "-"
+        print(f"  {name:22s} {entry['rows']:8d} {entry['columns']:6d} {entry['seconds'] * 1000:8.1f}ms {memory:>10s}")
+    print(f"  计算器初始化总耗时: {calculator.startup_seconds * 1000:.1f}ms")
+
+
+def annotate_recipe_nutrition(calculator, recipe):
+    """
+    计算单个食谱的营养成分，返回添加了营养信息的副本
+    
+    参数:
+        calculator (RecipeNutritionCalculator): 营养计算器
+        recipe (dict): 食谱数据（不会被修改）
+        
+    返回:
+        tuple: (添加了营养信息的食谱副本, 处理结果说明)
+    """
+    recipe_name = recipe.get('strMeal', 'Unknown Recipe')
+    
+    # 深拷贝食谱数据，以便我们可以添加营养信息
+    recipe_copy = copy.deepcopy(recipe)
+    
+    # 计算营养成分
+    try:
+        result = calculator.calculate_recipe_nutrition(recipe, verbose=False)
+    
+        if result and result.get('nutrition') and result.get('total_weight_grams', 0) > 0:
+            # 获取营养成分和总重量
+            nutrition = result['nutrition']
+            nutrition_per_serving = result.get('nutrition_per_serving', {})
+            total_weight = result.get('total_weight_grams', 0)
+            servings = result.get('servings', 4)  # 默认4份
+    
+            # 添加营养信息到食谱
+            recipe_copy['Weight'] = int(total_weight)
+    
+            # 添加份数
+            recipe_copy['servings'] = servings
+    
+            # 初始化主要营养素字段，用于后面添加到顶层
+            main_nutrients = {
+                'Energy': 0,
+                'Protein': 0,
+                'Total Fat': 0,
+                'Saturated': 0,
+                'Carbohydrate Total': 0,
+                'Sugars': 0,
+                'Sodium': 0
+            }
+    
+            # 添加每份营养信息
+            recipe_copy['NutritionPerServing'] = {}
+    
+            # 处理营养素数据
+            for nutrient, value in nutrition_per_serving.items():
+                # 处理字段名称 - 移除单位标签
+                clean_name = nutrient
+                if '(' in clean_name and ')' in clean_name:
+                    clean_name = clean_name.split('(')[0].strip()
+    
+                # 特殊处理某些营养素
+                if 'Energy' in nutrient and 'dietary fiber' in nutrient:
+                    # 将能量从千焦转换为卡路里，并取整数
+                    cal_value = int(value / 4.184) if value else 0
+                    recipe_copy['NutritionPerServing']['Energy'] = f"{cal_value}"
+                    main_nutrients['Energy'] = cal_value
+                elif nutrient == 'Carbohydrate, by difference':
+                    recipe_copy['NutritionPerServing']['Carbohydrate'] = f"{value:.1f}"
+                    main_nutrients['Carbohydrate Total'] = float(value)
+                elif nutrient == 'Fatty acids, total saturated':
+                    recipe_copy['NutritionPerServing']['Fatty acids, total saturated'] = f"{value:.1f}"
+                    main_nutrients['Saturated'] = float(value)
+                elif nutrient == 'Protein':
+                    recipe_copy['NutritionPerServing']['Protein'] = f"{value:.1f}"
+                    main_nutrients['Protein'] = float(value)
+                elif nutrient == 'Total Fat':
+                    recipe_copy['NutritionPerServing']['Total Fat'] = f"{value:.1f}"
+                    main_nutrients['Total Fat'] = float(value)
+                elif nutrient == 'Sugars, total':
+                    recipe_copy['NutritionPerServing']['Sugars, total'] = f"{value:.1f}"
+                    main_nutrients['Sugars'] = float(value)
+                elif nutrient == 'Sodium':
+                    recipe_copy['NutritionPerServing']['Sodium'] = f"{value:.1f}"
+                    main_nutrients['Sodium'] = float(value)
+                else:
+                    # 对于其他营养素，保留小数点后一位
+                    if isinstance(value, (int, float)):
+                        recipe_copy['NutritionPerServing'][clean_name] = f"{value:.1f}"
+                    else:
+                        recipe_copy['NutritionPerServing'][clean_name] = value
+    
+            # 将主要营养素添加到顶层
+            recipe_copy['Energy'] = f"{main_nutrients['Energy']} cal"
+            recipe_copy['Protein'] = f"{main_nutrients['Protein']:.1f} g"
+            recipe_copy['Total Fat'] = f"{main_nutrients['Total Fat']:.1f} g"
+            recipe_copy['Saturated'] = f"{main_nutrients['Saturated']:.1f} g"
+            recipe_copy['Carbohydrate Total'] = f"{main_nutrients['Carbohydrate Total']:.1f} g"
+            recipe_copy['Sugars'] = f"{main_nutrients['Sugars']:.1f} g"
+            recipe_copy['Sodium'] = f"{main_nutrients['Sodium']:.1f} mg"
+    
+            status = f"成功计算 {recipe_name} 的营养成分"
+        else:
+            status = f"无法计算 {recipe_name} 的营养成分"
+    except Exception as e:
+        # 单个食谱出错不影响其他食谱
+        status = f"处理 {recipe_name} 时出错: {e}"
+    
+    return recipe_copy, status
+
+
+# 并行处理时每个工作进程中的计算器（由进程池的 initializer 创建一次）
+_worker_calculator = None
+
+
+def _init_recipe_worker(data_dir, shared_handle=None):
+    """
+    进程池 initializer: 在工作进程中创建一次共享计算器
+    
+    参数:
+        data_dir (str): 营养数据库目录
+        shared_handle (dict): 父进程放入共享内存的 FNDDS 数据（SharedFnddsData.handle）；
+            为 None 时工作进程自行加载数据文件
+    """
+    global _worker_calculator
+    if shared_handle is None:
+        _worker_calculator = get_calculator(data_dir)
+    else:
+        _worker_calculator = get_calculator(data_dir, shared_data=SharedFnddsData.attach(shared_handle))
+
+
+def _annotate_recipe_in_worker(recipe):
+    """
+    在工作进程中处理一个食谱
+    
+    返回:
+        tuple: (添加了营养信息的食谱副本, 状态信息, 本食谱各匹配层级解析的食材数量)
+    """
+    counts = _worker_calculator.match_tier_counts
+    before = dict(counts)
+    recipe_copy, status = annotate_recipe_nutrition(_worker_calculator, recipe)
+    tier_counts = {tier: count - before.get(tier, 0) for tier, count in counts.items() if count != before.get(tier, 0)}
+    return recipe_copy, status, tier_counts
+
+
+def process_recipes(workers=1, chunk_size=DEFAULT_RECIPE_CHUNK_SIZE, data_dir="fixed_data",
+                    input_file_path='update_all_recipes_urls_fixed.json',
+                    output_file_path='recipes_with_nutrition_updated.json', shared_memory=True):
     """
     处理所有食谱并计算营养成分
+    
+    workers 大于 1 时把食谱按 chunk_size 分块交给进程池，每个工作进程只初始化一次计算器；
+    结果按原顺序收集，输出文件与串行处理完全相同。shared_memory 为 True 时由父进程加载一次
+    FNDDS 数据并放入共享内存，工作进程只读附加，不再各自加载数据表。
+    
+    参数:
+        workers (int): 工作进程数，1 表示在当前进程中串行处理
+        chunk_size (int): 每次分派给工作进程的食谱数量
+        data_dir (str): 营养数据库目录
+        input_file_path (str): 输入食谱文件
+        output_file_path (str): 输出文件
+        shared_memory (bool): 并行处理时是否通过共享内存向工作进程提供 FNDDS 数据
     """
-    # 创建营养计算器实例
-    data_dir = "fixed_data"
-    calculator = RecipeNutritionCalculator(data_dir=data_dir)
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
     
     # 加载食谱数据
     try:
-        input_file_path = 'update_all_recipes_urls_fixed.json'
-        output_file_path = 'recipes_with_nutrition_updated.json'
-        
         if not os.path.exists(input_file_path):
             print(f"文件 {input_file_path} 不存在。")
             return
@@ -2488,109 +2194,68 @@ def process_recipes():
         
         # 创建结果数据结构
         result_data = {"meals": []}
-        total_recipes = len(recipes_data['meals'])
-        
-        # 处理每个食谱
-        for i, recipe in enumerate(recipes_data['meals'], 1):
-            recipe_name = recipe.get('strMeal', 'Unknown Recipe')
-            print(f"\n处理食谱 [{i}/{total_recipes}]: {recipe_name}")
-            
-            # 深拷贝食谱数据，以便我们可以添加营养信息
-            recipe_copy = copy.deepcopy(recipe)
-            
-            # 计算营养成分
-            try:
-                result = calculator.calculate_recipe_nutrition(recipe, verbose=False)
-                
-                if result and result.get('nutrition') and result.get('total_weight_grams', 0) > 0:
-                    # 获取营养成分和总重量
-                    nutrition = result['nutrition']
-                    nutrition_per_serving = result.get('nutrition_per_serving', {})
-                    total_weight = result.get('total_weight_grams', 0)
-                    servings = result.get('servings', 4)  # 默认4份
-                    
-                    # 添加营养信息到食谱
-                    recipe_copy['Weight'] = int(total_weight)
-                    
-                    # 添加份数
-                    recipe_copy['servings'] = servings
-                    
-                    # 初始化主要营养素字段，用于后面添加到顶层
-                    main_nutrients = {
-                        'Energy': 0,
-                        'Protein': 0,
-                        'Total Fat': 0,
-                        'Saturated': 0,
-                        'Carbohydrate Total': 0,
-                        'Sugars': 0,
-                        'Sodium': 0
-                    }
-                    
-                    # 添加每份营养信息
-                    recipe_copy['NutritionPerServing'] = {}
-                    
-                    # 处理营养素数据
-                    for nutrient, value in nutrition_per_serving.items():
-                        # 处理字段名称 - 移除单位标签
-                        clean_name = nutrient
-                        if '(' in clean_name and ')' in clean_name:
-                            clean_name = clean_name.split('(')[0].strip()
-                        
-                        # 特殊处理某些营养素
-                        if 'Energy' in nutrient and 'dietary fiber' in nutrient:
-                            # 将能量从千焦转换为卡路里，并取整数
-                            cal_value = int(value / 4.184) if value else 0
-                            recipe_copy['NutritionPerServing']['Energy'] = f"{cal_value}"
-                            main_nutrients['Energy'] = cal_value
-                        elif nutrient == 'Carbohydrate, by difference':
-                            recipe_copy['NutritionPerServing']['Carbohydrate'] = f"{value:.1f}"
-                            main_nutrients['Carbohydrate Total'] = float(value)
-                        elif nutrient == 'Fatty acids, total saturated':
-                            recipe_copy['NutritionPerServing']['Fatty acids, total saturated'] = f"{value:.1f}"
-                            main_nutrients['Saturated'] = float(value)
-                        elif nutrient == 'Protein':
-                            recipe_copy['NutritionPerServing']['Protein'] = f"{value:.1f}"
-                            main_nutrients['Protein'] = float(value)
-                        elif nutrient == 'Total Fat':
-                            recipe_copy['NutritionPerServing']['Total Fat'] = f"{value:.1f}"
-                            main_nutrients['Total Fat'] = float(value)
-                        elif nutrient == 'Sugars, total':
-                            recipe_copy['NutritionPerServing']['Sugars, total'] = f"{value:.1f}"
-                            main_nutrients['Sugars'] = float(value)
-                        elif nutrient == 'Sodium':
-                            recipe_copy['NutritionPerServing']['Sodium'] = f"{value:.1f}"
-                            main_nutrients['Sodium'] = float(value)
-                        else:
-                            # 对于其他营养素，保留小数点后一位
-                            if isinstance(value, (int, float)):
-                                recipe_copy['NutritionPerServing'][clean_name] = f"{value:.1f}"
-                            else:
-                                recipe_copy['NutritionPerServing'][clean_name] = value
-                    
-                    # 将主要营养素添加到顶层
-                    recipe_copy['Energy'] = f"{main_nutrients['Energy']} cal"
-                    recipe_copy['Protein'] = f"{main_nutrients['Protein']:.1f} g"
-                    recipe_copy['Total Fat'] = f"{main_nutrients['Total Fat']:.1f} g"
-                    recipe_copy['Saturated'] = f"{main_nutrients['Saturated']:.1f} g"
-                    recipe_copy['Carbohydrate Total'] = f"{main_nutrients['Carbohydrate Total']:.1f} g"
-                    recipe_copy['Sugars'] = f"{main_nutrients['Sugars']:.1f} g"
-                    recipe_copy['Sodium'] = f"{main_nutrients['Sodium']:.1f} mg"
-                    
-                    print(f"成功计算 {recipe_name} 的营养成分")
+        recipes = recipes_data['meals']
+        total_recipes = len(recipes)
+        start = time.perf_counter()
+        
+        shared = None
+        pool = None
+        # 并行处理时合并各工作进程返回的匹配层级计数
+        tier_counts = {}
+        try:
+            if workers == 1:
+                # 获取共享的营养计算器实例
+                calculator = get_calculator(data_dir)
+                results = (annotate_recipe_nutrition(calculator, recipe) for recipe in recipes)
+            else:
+                calculator = None
+                if shared_memory:
+                    # 父进程加载一次数据并放入共享内存，工作进程只读附加；
+                    # 之后创建进程池失败时由 finally 释放共享内存块
+                    shared = SharedFnddsData.from_calculator(get_calculator(data_dir))
+                # spawn 启动的工作进程不继承父进程的 SQLite 连接和锁，各自初始化一次计算器
+                pool = multiprocessing.get_context('spawn').Pool(
+                    workers, initializer=_init_recipe_worker,
+                    initargs=(data_dir, shared.handle if shared is not None else None)
+                )
+                # imap 按提交顺序返回结果
+                results = pool.imap(_annotate_recipe_in_worker, recipes, chunksize=chunk_size)
+            
+            # 处理每个食谱
+            for i, recipe in enumerate(recipes, 1):
+                recipe_name = recipe.get('strMeal', 'Unknown Recipe')
+                print(f"\n处理食谱 [{i}/{total_recipes}]: {recipe_name}")
+                if pool is None:
+                    recipe_copy, status = next(results)
                 else:
-                    print(f"无法计算 {recipe_name} 的营养成分")
-            except Exception as e:
-                print(f"处理 {recipe_name} 时出错: {e}")
-                # 继续处理下一个食谱
-            
-            # 添加处理后的食谱到结果
-            result_data['meals'].append(recipe_copy)
+                    recipe_copy, status, recipe_tiers = next(results)
+                    for tier, count in recipe_tiers.items():
+                        tier_counts[tier] = tier_counts.get(tier, 0) + count
+                print(status)
+                
+                # 添加处理后的食谱到结果
+                result_data['meals'].append(recipe_copy)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            if shared is not None:
+                shared.close()
+                shared.unlink()
+        
+        elapsed = time.perf_counter() - start
         
         # 保存结果到文件
         with open(output_file_path, 'w', encoding='utf-8') as f:
             json.dump(result_data, f, ensure_ascii=False, indent=4)
             
         print(f"\n处理完成。已将结果保存到 {output_file_path}")
+        print(f"处理 {total_recipes} 个食谱用时 {elapsed:.1f}s ({total_recipes / elapsed if elapsed else 0:.1f} 个/秒, {workers} 个进程)")
+        if calculator is not None:
+            print_match_tier_report(calculator)
+        else:
+            # 缓存统计分散在各工作进程中，这里只报告合并后的匹配层级
+            print_match_tier_counts(tier_counts)
     
     except Exception as e:
         print(f"Error: {e}")
@@ -2601,7 +2266,24 @@ def main():
     """
     主函数
     """
-    process_recipes()
+    parser = argparse.ArgumentParser(description="计算全部食谱的营养成分")
+    parser.add_argument('--workers', type=int, default=1, help="工作进程数（默认 1，串行处理）")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_RECIPE_CHUNK_SIZE,
+                        help=f"每次分派给工作进程的食谱数量（默认 {DEFAULT_RECIPE_CHUNK_SIZE}）")
+    parser.add_argument('--data-dir', default='fixed_data', help="营养数据库目录")
+    parser.add_argument('--input', default='update_all_recipes_urls_fixed.json', help="输入食谱文件")
+    parser.add_argument('--output', default='recipes_with_nutrition_updated.json', help="输出文件")
+    parser.add_argument('--no-shared-memory', dest='shared_memory', action='store_false',
+                        help="并行处理时每个工作进程自行加载 FNDDS 数据，不使用共享内存")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="只加载营养数据，打印每张数据表的加载耗时和内存占用")
+    args = parser.parse_args()
+    if args.startup_report:
+        print_startup_report(get_calculator(args.data_dir))
+        return
+    process_recipes(workers=args.workers, chunk_size=args.chunk_size, data_dir=args.data_dir,
+                    input_file_path=args.input, output_file_path=args.output,
+                    shared_memory=args.shared_memory)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+工作进程共享的 FNDDS 数据
+
+process_recipes 并行处理时，每个工作进程原本都要各自加载三张 FNDDS 数据表、生成描述列表和
+份量索引，内存占用随进程数成倍增长，启动时间也要付 N 次加载。本模块由父进程把计算器热路径
+需要的数据一次性放入一块 multiprocessing.shared_memory:
+
+    - 食品 x 营养素矩阵（每 100g 的营养值）
+    - 份量表: 食品描述、份量描述和份量重量
+    - 字符串表: 食品描述、食材描述（以 NUL 分隔的 UTF-8 字节串，缺失值单独记录）
+
+工作进程按名称附加到同一块内存，数值数组是只读的零拷贝视图；字符串表在附加后按需解码为
+Python 字符串列表（匹配代码需要 str 对象）。
+"""
+
+import logging
+from multiprocessing import shared_memory
+
+import numpy as np
+
+logger = logging.getLogger('recipe_calculator')
+
+# 数组在共享内存中的对齐字节数
+SHARED_ARRAY_ALIGNMENT = 64
+
+# 字符串表中相邻字符串的分隔符
+STRING_SEPARATOR = '\x00'
+
+
+def encode_string_table(values):
+    """
+    把字符串列表编码为以 NUL 分隔的 UTF-8 字节串和缺失值掩码
+
+    参数:
+        values (list): 字符串列表，非 str 的元素（NaN、None）视为缺失
+
+    返回:
+        tuple: (uint8 字节数组, bool 缺失值掩码)
+
+    异常:
+        ValueError: 字符串中含有 NUL 字符
+    """
+    strings = [value if isinstance(value, str) else '' for value in values]
+    if any(STRING_SEPARATOR in value for value in strings):
+        raise ValueError("string table values must not contain NUL characters")
+    missing = np.fromiter((not isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    blob = np.frombuffer(STRING_SEPARATOR.join(strings).encode('utf-8'), dtype=np.uint8)
+    return blob, missing
+
+
+def decode_string_table(blob, missing):
+    """
+    把 encode_string_table 的结果解码为字符串列表（缺失值为 None）
+
+    整个字节串只解码一次再按分隔符切分，比逐个解码快得多。
+
+    返回:
+        list: 字符串列表
+    """
+    if len(missing) == 0:
+        return []
+    values = blob.tobytes().decode('utf-8').split(STRING_SEPARATOR)
+    for row in np.flatnonzero(missing).tolist():
+        values[row] = None
+    return values
+
+
+class SharedFnddsData:
+    """
+    放在共享内存中的 FNDDS 热路径数据（父进程创建，工作进程附加）
+    """
+
+    # 字符串表名称，每个表在共享内存中占两个数组: <名称>_blob、<名称>_missing
+    STRING_TABLES = ('food_descriptions', 'ingredient_descriptions', 'portion_foods', 'portion_descriptions')
+
+    def __init__(self, shm, handle, owner=False):
+        """
+        参数:
+            shm (SharedMemory): 共享内存块
+            handle (dict): 共享内存名称、数组布局和元数据（由 from_calculator 生成，可以 pickle）
+            owner (bool): 是否由当前进程创建（负责 unlink）
+        """
+        self._shm = shm
+        self.handle = handle
+        self.owner = owner
+        self.data_version = handle['data_version']
+        self.nutrient_columns = list(handle['nutrient_columns'])
+        self._arrays = {}
+        for name, (offset, dtype, shape) in handle['layout'].items():
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            array.flags.writeable = False
+            self._arrays[name] = array
+
+    @classmethod
+    def from_calculator(cls, calculator):
+        """
+        把已加载的计算器的热路径数据复制到新建的共享内存块
+
+        参数:
+            calculator (RecipeNutritionCalculator): 从 FNDDS 数据表加载的计算器
+
+        返回:
+            SharedFnddsData: 当前进程拥有的共享数据（用完后调用 close() 和 unlink()）
+
+        异常:
+            ValueError: 计算器本身附加在共享数据上（没有份量表）
+        """
+        df = calculator.portions_weights_df
+        if df is None:
+            raise ValueError("calculator has no portions table (already attached to shared FNDDS data?)")
+
+        arrays = {'nutrient_matrix': np.ascontiguousarray(calculator.nutrient_matrix)}
+        strings = {
+            'food_descriptions': calculator.food_descriptions,
+            'ingredient_descriptions': calculator.ingredient_descriptions,
+            'portion_foods': df['Main food description'].str.lower().tolist(),
+            'portion_descriptions': df['Portion description'].str.lower().tolist(),
+        }
+        for name in cls.STRING_TABLES:
+            arrays[f'{name}_blob'], arrays[f'{name}_missing'] = encode_string_table(strings[name])
+        arrays['portion_weights'] = df['Portion weight\n(g)'].to_numpy()
+
+        # 依次排列各数组（按 SHARED_ARRAY_ALIGNMENT 对齐）
+        layout = {}
+        size = 0
+        for name, array in arrays.items():
+            size = -(-size // SHARED_ARRAY_ALIGNMENT) * SHARED_ARRAY_ALIGNMENT
+            layout[name] = (size, array.dtype.str, array.shape)
+            size += array.nbytes
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for name, array in arrays.items():
+            offset, dtype, shape = layout[name]
+            np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)[...] = array
+
+        handle = {
+            'name': shm.name,
+            'size': size,
+            'layout': layout,
+            'data_version': calculator.data_version,
+            'nutrient_columns': list(calculator.clean_columns),
+        }
+        logger.info(f"FNDDS 数据已放入共享内存 {shm.name} ({size / 1e6:.1f} MB)")
+        return cls(shm, handle, owner=True)
+
+    @classmethod
+    def attach(cls, handle):
+        """
+        在工作进程中按 handle 附加到父进程创建的共享内存
+
+        参数:
+            handle (dict): 父进程 SharedFnddsData.handle
+
+        返回:
+            SharedFnddsData: 只读的共享数据
+
+        异常:
+            FileNotFoundError: 共享内存块已不存在
+        """
+        return cls(shared_memory.SharedMemory(name=handle['name']), handle)
+
+    @property
+    def nbytes(self):
+        """共享内存中数组的总字节数"""
+        return self.handle['size']
+
+    def array(self, name):
+        """返回共享内存中数组的只读视图"""
+        return self._arrays[name]
+
+    def strings(self, name):
+        """解码字符串表为 Python 字符串列表（缺失值为 None）"""
+        return decode_string_table(self._arrays[f'{name}_blob'], self._arrays[f'{name}_missing'])
+
+    def close(self):
+        """释放数组视图并关闭当前进程对共享内存的映射"""
+        self._arrays = {}
+        self._shm.close()
+
+    def unlink(self):
+        """删除共享内存块（只应由创建它的进程调用，已附加的进程仍可继续读取）"""
+        if self.owner:
+            self._shm.unlink()
+            self.owner = False
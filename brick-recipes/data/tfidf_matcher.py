@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+字符 n-gram TF-IDF 食品描述匹配
+
+启发式匹配依赖子串和关键词规则，拼写错误的食材（如 "parmesean"、"tumeric"）常常
+落到类别默认匹配。本模块对 food_descriptions 构建一次字符 n-gram TF-IDF 矩阵
+（行已 L2 归一化），查询的余弦相似度即一次稀疏矩阵-向量乘积，批量查询为一次稀疏
+矩阵-矩阵乘积，再用 argpartition 选出前 k 个描述。
+
+为了不引入 scipy 依赖，稀疏矩阵以 NumPy 数组按列压缩存储（CSC: 每个 n-gram 对应的
+描述编号和权重），乘积只访问查询中出现的 n-gram 所在的列。
+"""
+
+import math
+
+import numpy as np
+
+# 默认的 n-gram 长度和最低相似度
+DEFAULT_NGRAM_SIZE = 3
+DEFAULT_MIN_SIMILARITY = 0.3
+
+
+def char_ngrams(text, n=DEFAULT_NGRAM_SIZE):
+    """
+    提取字符 n-gram 及其出现次数（每个单词前后补空格，使词首词尾的 n-gram 更突出）
+
+    参数:
+        text (str): 输入文本
+        n (int): n-gram 长度
+
+    返回:
+        dict: n-gram -> 出现次数
+    """
+    counts = {}
+    for word in text.lower().replace(',', ' ').split():
+        padded = f' {word} '
+        for i in range(max(len(padded) - n + 1, 1)):
+            gram = padded[i:i + n]
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+class TfidfFoodMatcher:
+    """
+    食品描述的字符 n-gram TF-IDF 矩阵
+    """
+
+    def __init__(self, descriptions, ngram_size=DEFAULT_NGRAM_SIZE):
+        """
+        参数:
+            descriptions (list): 食品描述列表
+            ngram_size (int): n-gram 长度
+        """
+        self.descriptions = descriptions
+        self.ngram_size = ngram_size
+
+        # 统计每个描述的 n-gram 和文档频率
+        vocabulary = {}
+        document_counts = []
+        for desc in descriptions:
+            counts = char_ngrams(desc, ngram_size) if isinstance(desc, str) else {}
+            document_counts.append(counts)
+            for gram in counts:
+                vocabulary.setdefault(gram, len(vocabulary))
+
+        document_frequency = np.zeros(len(vocabulary), dtype=np.int64)
+        for counts in document_counts:
+            for gram in counts:
+                document_frequency[vocabulary[gram]] += 1
+
+        # 平滑 IDF: log((1 + N) / (1 + df)) + 1
+        self.idf = np.log((1 + len(descriptions)) / (1 + document_frequency)) + 1
+        self.vocabulary = vocabulary
+
+        # 按行构建 (行, 列, 权重)，行内做 L2 归一化
+        rows, cols, values = [], [], []
+        for row, counts in enumerate(document_counts):
+            if not counts:
+                continue
+            row_cols = np.fromiter((vocabulary[gram] for gram in counts), dtype=np.int64, count=len(counts))
+            row_values = np.fromiter(counts.values(), dtype=np.float64, count=len(counts)) * self.idf[row_cols]
+            row_values /= np.linalg.norm(row_values)
+            rows.append(np.full(len(counts), row, dtype=np.int64))
+            cols.append(row_cols)
+            values.append(row_values)
+
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        values = np.concatenate(values) if values else np.zeros(0, dtype=np.float64)
+
+        # 转为按列压缩存储
+        order = np.argsort(cols, kind='stable')
+        self.col_rows = rows[order]
+        self.col_values = values[order]
+        self.col_indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=len(vocabulary)), out=self.col_indptr[1:])
+
+    @property
+    def nnz(self):
+        """矩阵中非零元素的数量"""
+        return len(self.col_values)
+
+    def query_vector(self, text):
+        """
+        把查询文本转换为稀疏 TF-IDF 向量（只保留词表中存在的 n-gram）
+
+        返回:
+            tuple: (列编号数组, 归一化权重数组)
+        """
+        counts = char_ngrams(text, self.ngram_size)
+        known = [(self.vocabulary[gram], count) for gram, count in counts.items() if gram in self.vocabulary]
+        if not known:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        cols = np.array([col for col, _ in known], dtype=np.int64)
+        values = np.array([count for _, count in known], dtype=np.float64) * self.idf[cols]
+        # 用全部 n-gram（包括词表外的）计算范数，未知 n-gram 会降低相似度
+        unknown_weight = math.log(1 + len(self.descriptions)) + 1
+        unknown = sum(count for gram, count in counts.items() if gram not in self.vocabulary)
+        norm = math.sqrt(float(values @ values) + (unknown * unknown_weight) ** 2)
+        return cols, values / norm
+
+    def similarities(self, text):
+        """
+        计算查询与全部描述的余弦相似度（稀疏矩阵-向量乘积）
+
+        返回:
+            numpy.ndarray: 每个描述的相似度
+        """
+        scores = np.zeros(len(self.descriptions), dtype=np.float64)
+        cols, weights = self.query_vector(text)
+        for col, weight in zip(cols.tolist(), weights.tolist()):
+            start, end = self.col_indptr[col], self.col_indptr[col + 1]
+            # 同一列中的描述编号互不相同，可以直接按索引累加
+            scores[self.col_rows[start:end]] += self.col_values[start:end] * weight
+        return scores
+
+    def batch_similarities(self, texts):
+        """
+        计算多个查询与全部描述的相似度（稀疏矩阵-矩阵乘积）
+
+        把查询矩阵的每个非零元素 (查询, n-gram, 权重) 展开为该 n-gram 列中的全部
+        (描述, 权重) 乘积，再用一次 bincount 按 (查询, 描述) 累加。
+
+        返回:
+            numpy.ndarray: (查询数, 描述数) 的相似度矩阵
+        """
+        description_count = len(self.descriptions)
+        query_ids, cols, weights = [], [], []
+        for query_id, text in enumerate(texts):
+            query_cols, query_weights = self.query_vector(text)
+            query_ids.append(np.full(len(query_cols), query_id, dtype=np.int64))
+            cols.append(query_cols)
+            weights.append(query_weights)
+        if not texts:
+            return np.zeros((0, description_count), dtype=np.float64)
+        query_ids = np.concatenate(query_ids)
+        cols = np.concatenate(cols)
+        weights = np.concatenate(weights)
+
+        # 每个查询非零元素对应的列区间，展开为列存储中的位置
+        starts = self.col_indptr[cols]
+        lengths = self.col_indptr[cols + 1] - starts
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + offsets
+
+        flat_index = np.repeat(query_ids, lengths) * description_count + self.col_rows[positions]
+        products = np.repeat(weights, lengths) * self.col_values[positions]
+        scores = np.bincount(flat_index, weights=products, minlength=len(texts) * description_count)
+        return scores.reshape(len(texts), description_count)
+
+    @staticmethod
+    def top_k(scores, k, min_similarity=DEFAULT_MIN_SIMILARITY):
+        """
+        选出相似度不低于 min_similarity 的前 k 个描述
+
+        返回:
+            list: [(描述编号, 相似度), ...]，按相似度降序，相同时编号小者优先
+        """
+        if k < len(scores):
+            # 先取出第 k 大的相似度，再保留所有不低于它的描述，避免并列时丢失编号更小者
+            threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            selected = np.flatnonzero(scores >= max(threshold, min_similarity))
+        else:
+            selected = np.flatnonzero(scores >= min_similarity)
+        order = np.lexsort((selected, -scores[selected]))[:k]
+        return [(int(selected[i]), float(scores[selected[i]])) for i in order]
+
+    def match(self, text, k=3, min_similarity=DEFAULT_MIN_SIMILARITY):
+        """返回与 text 最相似的前 k 个描述"""
+        return self.top_k(self.similarities(text), k, min_similarity)
+
+    def batch_match(self, texts, k=3, min_similarity=DEFAULT_MIN_SIMILARITY):
+        """批量返回每个查询最相似的前 k 个描述"""
+        scores = self.batch_similarities(texts)
+        if k >= scores.shape[1]:
+            return [self.top_k(row, k, min_similarity) for row in scores]
+
+        # 对所有查询一次做 argpartition 得到每行第 k 大的相似度，
+        # 再保留每行所有不低于它的描述（与 top_k 相同，并列时编号小者优先）
+        kth = np.argpartition(-scores, k - 1, axis=1)[:, k - 1]
+        thresholds = np.maximum(scores[np.arange(len(scores)), kth], min_similarity)
+        results = []
+        for row, threshold in zip(scores, thresholds):
+            row_ids = np.flatnonzero(row >= threshold)
+            order = np.lexsort((row_ids, -row[row_ids]))[:k]
+            results.append([(int(row_ids[i]), float(row[row_ids[i]])) for i in order])
+        return results
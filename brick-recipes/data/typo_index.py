@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+容忍拼写错误的字典键查找（对称删除索引）
+
+精确食材数据库、替换表等字典只有在食材名称拼写完全正确时才能命中。本模块为所有字典键
+预先生成删除最多 max_distance 个字符后的变体；查询时对输入做同样的删除，变体相同的键
+即为候选，再用有界编辑距离（支持相邻字符交换）校验，得到编辑距离不超过 k 的最近键。
+"""
+
+
+def max_typo_distance(term):
+    """
+    根据长度确定允许的编辑距离: 短名称只允许精确命中，越长的名称容忍越多错误
+
+    返回:
+        int: 最大编辑距离
+    """
+    if len(term) < 5:
+        return 0
+    if len(term) < 9:
+        return 1
+    return 2
+
+
+def deletion_variants(term, max_distance):
+    """
+    生成删除最多 max_distance 个字符后的全部变体（包括 term 本身）
+
+    返回:
+        set: 变体字符串
+    """
+    variants = {term}
+    frontier = {term}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for word in frontier:
+            if len(word) <= 1:
+                continue
+            for i in range(len(word)):
+                next_frontier.add(word[:i] + word[i + 1:])
+        next_frontier -= variants
+        variants |= next_frontier
+        frontier = next_frontier
+    return variants
+
+
+def edit_distance(a, b, limit):
+    """
+    计算带相邻字符交换的编辑距离（optimal string alignment），超过 limit 时返回 limit + 1
+
+    参数:
+        a (str): 字符串
+        b (str): 字符串
+        limit (int): 距离上限
+
+    返回:
+        int: 编辑距离
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class SymmetricDeleteIndex:
+    """
+    字典键的对称删除索引
+    """
+
+    def __init__(self, keys, max_distance=2):
+        """
+        参数:
+            keys (iterable): 字典键（按优先级排序，距离相同时排在前面的键优先）
+            max_distance (int): 支持的最大编辑距离
+        """
+        self.max_distance = max_distance
+        self.keys = []
+        self._variants = {}
+        seen = set()
+        for key in keys:
+            if key in seen:
+                continue
+            seen.add(key)
+            key_id = len(self.keys)
+            self.keys.append(key)
+            for variant in deletion_variants(key, max_distance):
+                self._variants.setdefault(variant, []).append(key_id)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def candidates(self, term, max_distance=None):
+        """
+        返回编辑距离不超过 max_distance 的全部键
+
+        参数:
+            term (str): 查询字符串
+            max_distance (int): 最大编辑距离，默认为索引支持的最大距离
+
+        返回:
+            list: [(键, 编辑距离), ...]，按距离升序，距离相同时按键的优先级
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        candidate_ids = set()
+        for variant in deletion_variants(term, max_distance):
+            candidate_ids.update(self._variants.get(variant, ()))
+
+        matches = []
+        for key_id in candidate_ids:
+            distance = edit_distance(term, self.keys[key_id], max_distance)
+            if distance <= max_distance:
+                matches.append((distance, key_id))
+        matches.sort()
+        return [(self.keys[key_id], distance) for distance, key_id in matches]
+
+    def lookup(self, term, max_distance=None):
+        """
+        查找编辑距离不超过 max_distance 的最近键
+
+        返回:
+            tuple: (键, 编辑距离)，没有找到时返回 None
+        """
+        matches = self.candidates(term, max_distance)
+        return matches[0] if matches else None